@@ -8,16 +8,21 @@ except Exception:
     PDF_VIEWER_AVAILABLE = False
 
 
-def show_pdf(file_bytes: bytes, width: int = 900, height: int = 800):
+def show_pdf(file_bytes: bytes, width: int = 900, height: int = 800, page: int = None):
+    # page: 1 tabanlı sayfa numarası (segment sonuçlarındaki start_page)
     if PDF_VIEWER_AVAILABLE:
-        pdf_viewer(file_bytes, width=width, height=height)
+        if page:
+            pdf_viewer(file_bytes, width=width, height=height, scroll_to_page=page)
+        else:
+            pdf_viewer(file_bytes, width=width, height=height)
         return
 
     b64 = base64.b64encode(file_bytes).decode("utf-8")
+    fragment = f"page={page}&view=FitH" if page else "view=FitH"
 
     html_code = f"""
     <iframe
-        src="data:application/pdf;base64,{b64}#view=FitH"
+        src="data:application/pdf;base64,{b64}#{fragment}"
         width="{width}"
         height="{height}"
         type="application/pdf"
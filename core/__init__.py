@@ -6,5 +6,7 @@ This package contains the main functional modules:
 - scoring: Rubric-based scoring using LLM
 - segmentation: Document segmentation into rubric sections
 - extraction: PDF/DOCX text extraction
+- dedup: Near-duplicate submission detection (MinHash/LSH)
+- llm: Shared Gemini infrastructure (rate limiting, response cache)
 """
 
@@ -0,0 +1,17 @@
+"""
+Deduplication Module
+
+Neredeyse aynı gönderimleri (yeniden denemeler, tekrar yüklemeler) MinHash/LSH
+ile bulur; segmentasyon ve skorların yeniden kullanılmasını sağlar.
+"""
+from .minhash import minhash_signature, estimate_jaccard, lsh_keys
+from .index import SubmissionIndex, content_sha256, DUPLICATE_THRESHOLD
+
+__all__ = [
+    'minhash_signature',
+    'estimate_jaccard',
+    'lsh_keys',
+    'SubmissionIndex',
+    'content_sha256',
+    'DUPLICATE_THRESHOLD'
+]
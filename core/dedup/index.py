@@ -0,0 +1,156 @@
+"""
+Submission Index
+
+Notlandırılmış gönderimlerin MinHash imzalarını, segmentasyon dosyalarını ve
+skorlarını saklar. Yeni bir gönderim daha önce notlandırılmış bir gönderimin
+neredeyse aynısıysa (aynı öğrencinin yeni denemesi, aynı raporun tekrar
+yüklenmesi) onun segmentasyonu ve değişmeyen bölümlerin skorları yeniden
+kullanılır; LLM yalnızca içeriği değişen bölümler için çağrılır.
+
+Skorlar, notlandırılan segment içeriğinin SHA-256 özeti ve puanlama
+ayarlarının özetiyle (fingerprint: prompt şablonu, model, generation config)
+saklanır; skor yalnızca ikisi de aynıysa geçerlidir. Prompt ya da model
+değişince aynı rapor yeniden notlandırılır.
+
+İndeks tek bir JSON dosyasıdır (varsayılan outputs/dedup_index.json,
+DEDUP_INDEX_PATH ile değiştirilebilir). LSH bantları yüklemede yeniden
+kurulur.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .minhash import NUM_PERM, estimate_jaccard, lsh_keys, minhash_signature
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_INDEX_PATH = PROJECT_ROOT / "outputs" / "dedup_index.json"
+
+# Bu tahmini Jaccard benzerliğinin üzerindeki gönderimler neredeyse aynı sayılır
+DUPLICATE_THRESHOLD = 0.85
+
+INDEX_VERSION = 1
+
+
+def content_sha256(text: str) -> str:
+    """Segment/metin içeriğinin özeti (baştaki/sondaki boşluk yok sayılır)"""
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+class SubmissionIndex:
+    """Notlandırılmış gönderimlerin MinHash/LSH indeksi"""
+
+    def __init__(self, index_path: str | Path = None, threshold: float = DUPLICATE_THRESHOLD):
+        index_path = index_path or os.getenv("DEDUP_INDEX_PATH") or DEFAULT_INDEX_PATH
+        self.index_path = Path(index_path)
+        self.threshold = threshold
+        self.entries: Dict[str, Dict] = {}
+        self._buckets: Dict[str, List[str]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("num_perm") != NUM_PERM:
+            return  # İmza parametreleri değişmiş: eski imzalar karşılaştırılamaz
+        for entry_id, entry in data.get("entries", {}).items():
+            self._insert(entry_id, entry)
+
+    def _insert(self, entry_id: str, entry: Dict) -> None:
+        self.entries[entry_id] = entry
+        for key in lsh_keys(entry["signature"]):
+            bucket = self._buckets.setdefault(key, [])
+            if entry_id not in bucket:
+                bucket.append(entry_id)
+
+    def save(self) -> None:
+        """İndeksi yarım dosya bırakmadan kaydeder"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.index_path.parent, prefix=".tmp_", suffix=".json")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "num_perm": NUM_PERM,
+                    "updated": datetime.now().isoformat(),
+                    "entries": self.entries
+                }, f, ensure_ascii=False)
+            os.replace(tmp_name, self.index_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def find_duplicate(self, text: str, scope: Optional[List[int]] = None) -> Optional[Tuple[Dict, float]]:
+        """
+        Metnin neredeyse aynısı olan en benzer gönderimi bulur.
+
+        Args:
+            text: Yeni gönderimin çıkarılmış metni
+            scope: Metnin çıkarıldığı sayfalar (front-matter profili); yalnızca
+                   aynı kapsamla indekslenmiş gönderimler karşılaştırılır
+
+        Returns:
+            (entry, similarity) ya da None
+        """
+        text_sha = content_sha256(text)
+        signature = minhash_signature(text)
+
+        candidates = set()
+        for key in lsh_keys(signature):
+            candidates.update(self._buckets.get(key, []))
+
+        best = None
+        for entry_id in candidates:
+            entry = self.entries[entry_id]
+            if entry.get("scope") != scope:
+                continue
+            similarity = 1.0 if entry.get("text_sha") == text_sha else estimate_jaccard(signature, entry["signature"])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (entry, similarity)
+        return best
+
+    def add(
+        self,
+        text: str,
+        student_id: str,
+        source_name: str,
+        segmentation_file: str | Path,
+        scores: Dict[str, Dict],
+        scope: Optional[List[int]] = None
+    ) -> Dict:
+        """
+        Notlandırılmış gönderimi indekse ekler (aynı metin varsa günceller).
+
+        Args:
+            text: Çıkarılmış metin
+            student_id: Öğrenci ID'si
+            source_name: Kaynak dosya adı
+            segmentation_file: Düzeltilmiş segmentasyon dosyası (.fixed.json)
+            scores: {kriter: {"content_sha": ..., "fingerprint": ..., "result": skor sonucu}}
+            scope: Metnin çıkarıldığı sayfalar (tüm rapor için None)
+
+        Returns:
+            Eklenen kayıt
+        """
+        text_sha = content_sha256(text)
+        entry_id = text_sha if scope is None else f"{text_sha}_p{scope[0]}-{scope[-1]}"
+        entry = {
+            "student_id": student_id,
+            "source_name": source_name,
+            "text_sha": text_sha,
+            "scope": scope,
+            "segmentation_file": str(segmentation_file),
+            "scores": scores,
+            "signature": minhash_signature(text),
+            "indexed_at": datetime.now().isoformat()
+        }
+        self._insert(entry_id, entry)
+        return entry
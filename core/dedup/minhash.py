@@ -0,0 +1,76 @@
+"""
+MinHash / LSH
+
+Metinlerin kelime shingle kümeleri üzerinden MinHash imzası ve bant tabanlı
+LSH anahtarları üretir. İki imzanın aynı konumdaki değerlerinin eşit olma
+oranı, shingle kümelerinin Jaccard benzerliğinin tahminidir.
+
+Ek paket gerektirmez; hash fonksiyonları sabit tohumla üretildiği için
+imzalar process'ler ve çalıştırmalar arasında karşılaştırılabilir (indekste
+saklanabilir).
+"""
+import hashlib
+import random
+import re
+from typing import List, Set
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5  # Kelime sayısı
+
+# 16 bant x 8 satır: Jaccard ~0.7 üzerindeki çiftler yüksek olasılıkla aday olur
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SEED = 1
+
+_rng = random.Random(_SEED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[bytes]:
+    """Küçük harfe çevrilmiş kelime n-gram'ları (boşluk/noktalama farkı yok sayılır)"""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {" ".join(words).encode("utf-8")} if words else set()
+    return {" ".join(words[i:i + size]).encode("utf-8") for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> List[int]:
+    """
+    Metnin MinHash imzası.
+
+    Returns:
+        NUM_PERM uzunluğunda int listesi; boş metinde tüm değerler _MAX_HASH
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle, digest_size=4).digest(), "little")
+        for shingle in shingles(text)
+    ]
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERM
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_jaccard(signature_a: List[int], signature_b: List[int]) -> float:
+    """İki imzanın tahmini Jaccard benzerliği (0-1)"""
+    if not signature_a or len(signature_a) != len(signature_b):
+        return 0.0
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / len(signature_a)
+
+
+def lsh_keys(signature: List[int]) -> List[str]:
+    """İmzanın bant anahtarları; en az bir anahtarı ortak olan imzalar adaydır"""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+    return keys
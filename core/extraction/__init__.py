@@ -3,7 +3,39 @@ Text Extraction Module
 
 PDF ve DOCX dosyalarından metin çıkarma.
 """
-from .pdf_extractor import extract_text_from_pdf, extract_text_from_docx
-
-__all__ = ['extract_text_from_pdf', 'extract_text_from_docx']
+from .pdf_extractor import (
+    extract_text,
+    extract_text_with_pages,
+    extractor_id,
+    extract_text_from_pdf,
+    extract_text_from_docx,
+    iter_pages,
+    iter_pdf_pages,
+    iter_docx_paragraphs,
+    iter_docx_headings
+)
+from .cache import ExtractionCache, file_sha256, bytes_sha256
+from .backends import ExtractorBackend, available_backends, get_backend, register_backend
+from .outline import read_pdf_outline
+from .triage import triage_document
 
+__all__ = [
+    'extract_text',
+    'extract_text_with_pages',
+    'extractor_id',
+    'extract_text_from_pdf',
+    'extract_text_from_docx',
+    'iter_pages',
+    'iter_pdf_pages',
+    'iter_docx_paragraphs',
+    'iter_docx_headings',
+    'ExtractionCache',
+    'file_sha256',
+    'bytes_sha256',
+    'ExtractorBackend',
+    'available_backends',
+    'get_backend',
+    'register_backend',
+    'read_pdf_outline',
+    'triage_document'
+]
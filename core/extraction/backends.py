@@ -0,0 +1,320 @@
+"""
+PDF Extractor Backends
+
+PDF metin çıkarma backend'lerinin kaydı (registry) ve backend seçimi.
+
+Her backend sayfa sayfa ham metin üreten bir fonksiyondur; isteğe bağlı
+`pages` argümanı verilirse yalnızca o sayfalar (0 tabanlı) çözülür. Kurulu olanlar
+arasından seçim şu sırayla yapılır:
+    1. PDF_EXTRACTOR_BACKEND ortam değişkeni
+    2. Benchmark sonucu (data/processed/extraction_benchmark.json):
+       FIDELITY_THRESHOLD'u geçen en hızlı backend
+    3. BACKENDS sözlüğündeki sıra (pdfplumber, PyPDF2, pypdfium2, PyMuPDF)
+
+Benchmark: python scripts/extraction/benchmark_backends.py
+"""
+import importlib.util
+import io
+import json
+import os
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+# Backend girdisi: dosya yolu ya da bellekteki PDF içeriği
+PdfSource = Union[Path, bytes]
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+BENCHMARK_FILE = PROJECT_ROOT / "data" / "processed" / "extraction_benchmark.json"
+
+# Referans backend'e göre minimum metin uzunluğu uyumu (0-1)
+FIDELITY_THRESHOLD = 0.95
+
+
+class ExtractorBackend:
+    """Sayfa sayfa metin üreten bir PDF backend'i"""
+
+    def __init__(self, name: str, module: str, dist: str, iter_pages: Callable[[PdfSource], Iterator[str]]):
+        self.name = name
+        self.module = module
+        self.dist = dist
+        self.iter_pages = iter_pages
+
+    def is_available(self) -> bool:
+        """Backend paketi kurulu mu"""
+        return importlib.util.find_spec(self.module) is not None
+
+    def version(self) -> str:
+        try:
+            return metadata.version(self.dist)
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    def backend_id(self) -> str:
+        """Cache anahtarı için ad ve sürüm"""
+        return f"{self.name}-{self.version()}"
+
+
+def _as_stream(pdf_source: PdfSource):
+    """bytes ise BytesIO'ya sarar; yol ise olduğu gibi döner"""
+    return io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else pdf_source
+
+
+def _select_pages(all_pages, pages: Optional[Sequence[int]]):
+    """
+    pages verilmişse yalnızca o indekslerdeki sayfaları döndürür.
+
+    pages artan sırada olmalıdır; belgenin sonunu aşan ilk numarada durulur,
+    bu yüzden açık uçlu aralıklar (range(n, sys.maxsize)) da verilebilir.
+    """
+    if pages is None:
+        yield from all_pages
+        return
+    page_count = len(all_pages)
+    for page_no in pages:
+        if page_no >= page_count:
+            break
+        yield all_pages[page_no]
+
+
+def _iter_pages_pdfplumber(pdf_source: PdfSource, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+    import pdfplumber  # type: ignore
+
+    with pdfplumber.open(_as_stream(pdf_source)) as pdf:
+        for page in _select_pages(pdf.pages, pages):
+            page_text = page.extract_text() or ""
+            # Sayfa önbelleğini bırak, uzun raporlarda bellek şişmesin
+            page.close()
+            yield page_text
+
+
+def _iter_pages_pypdf2(pdf_source: PdfSource, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+    import PyPDF2  # type: ignore
+
+    if isinstance(pdf_source, bytes):
+        for page in _select_pages(PyPDF2.PdfReader(io.BytesIO(pdf_source)).pages, pages):
+            yield page.extract_text() or ""
+        return
+
+    with open(pdf_source, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in _select_pages(pdf_reader.pages, pages):
+            yield page.extract_text() or ""
+
+
+def _iter_pages_pypdfium2(pdf_source: PdfSource, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+    import pypdfium2 as pdfium  # type: ignore
+
+    pdf = pdfium.PdfDocument(pdf_source if isinstance(pdf_source, bytes) else str(pdf_source))
+    try:
+        for page in _select_pages(pdf, pages):
+            text_page = page.get_textpage()
+            try:
+                yield text_page.get_text_range()
+            finally:
+                text_page.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _iter_pages_pymupdf(pdf_source: PdfSource, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+    try:
+        import pymupdf  # type: ignore
+    except ImportError:
+        import fitz as pymupdf  # type: ignore
+
+    if isinstance(pdf_source, bytes):
+        opened = pymupdf.open(stream=pdf_source, filetype="pdf")
+    else:
+        opened = pymupdf.open(str(pdf_source))
+
+    with opened as doc:
+        for page in _select_pages(doc, pages):
+            yield page.get_text()
+
+
+# Sıra = benchmark yokken varsayılan öncelik
+BACKENDS: Dict[str, ExtractorBackend] = {
+    "pdfplumber": ExtractorBackend("pdfplumber", "pdfplumber", "pdfplumber", _iter_pages_pdfplumber),
+    "pypdf2": ExtractorBackend("pypdf2", "PyPDF2", "PyPDF2", _iter_pages_pypdf2),
+    "pypdfium2": ExtractorBackend("pypdfium2", "pypdfium2", "pypdfium2", _iter_pages_pypdfium2),
+    "pymupdf": ExtractorBackend("pymupdf", "fitz", "PyMuPDF", _iter_pages_pymupdf),
+}
+
+_selected_backend: Optional[ExtractorBackend] = None
+
+
+def register_backend(backend: ExtractorBackend) -> None:
+    """Yeni bir backend ekler (aynı adlı varsa üzerine yazar)"""
+    global _selected_backend
+    BACKENDS[backend.name] = backend
+    _selected_backend = None
+
+
+def available_backends() -> List[ExtractorBackend]:
+    """Kurulu backend'ler, öncelik sırasıyla"""
+    return [backend for backend in BACKENDS.values() if backend.is_available()]
+
+
+def _fastest_from_benchmark(candidates: List[ExtractorBackend]) -> Optional[ExtractorBackend]:
+    """Benchmark dosyasından eşiği geçen en hızlı kurulu backend'i seçer"""
+    if not BENCHMARK_FILE.exists():
+        return None
+    try:
+        summary = json.loads(BENCHMARK_FILE.read_text(encoding='utf-8')).get("summary", {})
+    except (OSError, ValueError):
+        return None
+
+    by_name = {backend.name: backend for backend in candidates}
+    passing = [
+        (stats.get("pages_per_sec", 0.0), name)
+        for name, stats in summary.items()
+        if name in by_name and stats.get("min_agreement", 0.0) >= FIDELITY_THRESHOLD
+    ]
+    if not passing:
+        return None
+    return by_name[max(passing)[1]]
+
+
+def get_backend(name: str = None) -> ExtractorBackend:
+    """
+    Kullanılacak PDF backend'ini döndürür.
+
+    Args:
+        name: Backend adı (verilmezse otomatik seçim, bkz. modül açıklaması)
+
+    Raises:
+        RuntimeError: İstenen ya da hiçbir backend kurulu değil
+    """
+    global _selected_backend
+
+    name = name or os.getenv("PDF_EXTRACTOR_BACKEND")
+    if name:
+        backend = BACKENDS.get(name.lower())
+        if backend is None or not backend.is_available():
+            raise RuntimeError(
+                f"PDF backend'i kullanılamıyor: {name}\n"
+                f"Kurulu backend'ler: {', '.join(b.name for b in available_backends()) or '-'}"
+            )
+        return backend
+
+    if _selected_backend is not None:
+        return _selected_backend
+
+    candidates = available_backends()
+    if not candidates:
+        raise RuntimeError(
+            "PDF okuma için gerekli paketler yüklü değil.\n"
+            "Şu komutu çalıştırın: pip install pdfplumber\n"
+            "veya: pip install PyPDF2"
+        )
+
+    _selected_backend = _fastest_from_benchmark(candidates) or candidates[0]
+    return _selected_backend
+
+
+def _measure_file(backend_name: str, pdf_path: str) -> Dict:
+    """
+    Benchmark worker'ı: tek dosyayı ayrı bir process'te çıkarır.
+
+    Peak RSS process başına ölçüldüğü için her ölçüm yeni bir process'te yapılır.
+    """
+    import sys
+    import time
+    try:
+        import resource
+    except ImportError:  # Windows
+        resource = None
+
+    backend = BACKENDS[backend_name]
+    started = time.perf_counter()
+    page_lengths = [len((page_text or "").strip()) for page_text in backend.iter_pages(Path(pdf_path))]
+    elapsed = time.perf_counter() - started
+
+    # Linux'ta KB, macOS'ta byte; resource modülü olmayan platformda ölçülmez
+    peak_rss_mb = None
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            max_rss //= 1024
+        peak_rss_mb = max_rss / 1024
+
+    return {
+        "pages": len(page_lengths),
+        "chars": sum(page_lengths),
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+def benchmark_backends(pdf_files: List[Path], backend_names: List[str] = None, reference: str = "pdfplumber") -> Dict:
+    """
+    Kurulu backend'leri bir PDF korpusu üzerinde karşılaştırır.
+
+    Metin uyumu, her dosyada referans backend'in karakter sayısına göre
+    min(a, b) / max(a, b) olarak hesaplanır. Referans kurulu değilse
+    ilk kurulu backend referans alınır.
+
+    Args:
+        pdf_files: Ölçülecek PDF dosyaları
+        backend_names: Ölçülecek backend'ler (varsayılan: kurulu olanların hepsi)
+        reference: Uyum hesabında referans backend
+
+    Returns:
+        {"reference": str, "results": [...], "summary": {backend: {...}}}
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    backends = [b for b in available_backends() if not backend_names or b.name in backend_names]
+    if not backends:
+        raise RuntimeError("Ölçülecek kurulu PDF backend'i yok")
+    if reference not in [b.name for b in backends]:
+        reference = backends[0].name
+
+    results = []
+    for pdf_file in pdf_files:
+        per_backend = {}
+        for backend in backends:
+            # max_tasks_per_child=1: her ölçüm temiz bir process'te (RSS karışmasın)
+            with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+                try:
+                    stats = executor.submit(_measure_file, backend.name, str(pdf_file)).result()
+                except Exception as e:
+                    stats = {"error": str(e)}
+            per_backend[backend.name] = stats
+
+        reference_chars = per_backend.get(reference, {}).get("chars", 0)
+        for name, stats in per_backend.items():
+            if "error" in stats:
+                continue
+            chars = stats["chars"]
+            longest = max(chars, reference_chars)
+            stats["agreement"] = min(chars, reference_chars) / longest if longest else 1.0
+            results.append({"file": pdf_file.name, "backend": name, **stats})
+
+    summary = {}
+    for backend in backends:
+        rows = [r for r in results if r["backend"] == backend.name]
+        if not rows:
+            continue
+        total_seconds = sum(r["seconds"] for r in rows)
+        summary[backend.name] = {
+            "version": backend.version(),
+            "files": len(rows),
+            "pages_per_sec": sum(r["pages"] for r in rows) / total_seconds if total_seconds else 0.0,
+            "peak_rss_mb": max((r["peak_rss_mb"] for r in rows if r["peak_rss_mb"] is not None), default=None),
+            "mean_agreement": sum(r["agreement"] for r in rows) / len(rows),
+            "min_agreement": min(r["agreement"] for r in rows),
+        }
+
+    return {"reference": reference, "results": results, "summary": summary}
+
+
+def save_benchmark(benchmark: Dict, output_path: Path = BENCHMARK_FILE) -> Path:
+    """Benchmark sonucunu kaydeder; get_backend bir sonraki seçimde bunu kullanır"""
+    global _selected_backend
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(benchmark, ensure_ascii=False, indent=2), encoding='utf-8')
+    _selected_backend = None
+    return output_path
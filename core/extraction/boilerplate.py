@@ -0,0 +1,196 @@
+"""
+Boilerplate Stripping
+
+PDF'ten çıkarılan metinde her sayfada tekrar eden üst/alt bilgi satırlarını
+(rapor başlığı, öğrenci adı, "Page 3 of 47") ve sayfa numaralarını temizler.
+
+Bu satırlar LLM'e giden karakter/token sayısını şişirir ve segmentasyonda
+yalnızca sayfa numarasından oluşan bölümler üretir (merge_short_sections
+bunları sonradan temizlemek zorunda kalıyordu). Temizlenmiş metinle birlikte
+bir ofset haritası döner; LLM'in temiz metne göre verdiği ofsetler
+to_raw_offset / remap_sections ile ham metne (page_starts'ın ofsetlerine)
+geri çevrilir.
+
+Yalnızca sayfanın ilk ve son birkaç satırına bakılır; bir satır sayfaların
+en az yarısında aynı bölgede geçiyorsa tekrar eden üst/alt bilgi sayılır.
+Alt bilgide rakamlar yok sayılır (tarih, sayfa no); üst bilgide sayılmaz,
+çünkü "Day 1:", "Week 2" gibi sayfa başı başlıklar içeriktir.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, List, Set, Tuple
+
+# Sayfanın başından ve sonundan incelenecek dolu satır sayısı
+EDGE_LINES = 3
+
+# Bir satırın üst/alt bilgi sayılması için geçtiği sayfa oranı ve en az sayfa sayısı
+MIN_REPEAT_RATIO = 0.5
+MIN_REPEAT_PAGES = 3
+
+# "7", "- 7 -", "Page 7", "Sayfa 7 / 47", "7 of 47", "vii"
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^[-–—\s]*(?:(?:page|sayfa)\s*)?(?:\d{1,4}|[ivx]{1,6})"
+    r"(?:\s*(?:/|of|-)\s*\d{1,4})?[-–—\s]*$",
+    re.IGNORECASE
+)
+
+# LLM token tahmini için karakter/token oranı (Gemini için ~4)
+CHARS_PER_TOKEN = 4
+
+# (clean_start, raw_start) - temiz metindeki her parçanın ham metindeki yeri
+OffsetMap = List[Tuple[int, int]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin yaklaşık LLM token sayısı"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _line_key(line: str, footer: bool) -> str:
+    """Satırı karşılaştırma anahtarına çevirir (boşluk/büyük harf, alt bilgide rakam farkı yok sayılır)"""
+    key = " ".join(line.lower().split())
+    return ("foot:" + re.sub(r"\d+", "#", key)) if footer else ("head:" + key)
+
+
+def _page_lines(text: str, page_start: int, page_end: int) -> List[Tuple[int, int, str]]:
+    """Sayfanın dolu satırları: [(raw_start, raw_end, line), ...]"""
+    lines = []
+    pos = page_start
+    for line in text[page_start:page_end].split("\n"):
+        if line.strip():
+            lines.append((pos, pos + len(line), line))
+        pos += len(line) + 1
+    return lines
+
+
+def _edge_lines(lines: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str, str]]:
+    """Sayfanın ilk ve son EDGE_LINES dolu satırı, anahtarıyla (kısa sayfada tekrarsız)"""
+    half = (len(lines) + 1) // 2 if len(lines) <= 2 * EDGE_LINES else EDGE_LINES
+    edges = []
+    for i, (start, end, line) in enumerate(lines):
+        if i < half:
+            edges.append((start, end, line, _line_key(line, footer=False)))
+        elif i >= len(lines) - EDGE_LINES:
+            edges.append((start, end, line, _line_key(line, footer=True)))
+    return edges
+
+
+def find_repeated_lines(text: str, page_starts: List[int]) -> Set[str]:
+    """
+    Sayfaların üst/alt bölgesinde tekrar eden satırların anahtarlarını bulur.
+
+    Returns:
+        _line_key anahtarları kümesi
+    """
+    page_ends = page_starts[1:] + [len(text)]
+    pages_with_key: Dict[str, int] = {}
+    text_pages = 0
+    for page_start, page_end in zip(page_starts, page_ends):
+        lines = _page_lines(text, page_start, page_end)
+        if not lines:
+            continue
+        text_pages += 1
+        for key in {key for _, _, _, key in _edge_lines(lines)}:
+            pages_with_key[key] = pages_with_key.get(key, 0) + 1
+
+    threshold = max(MIN_REPEAT_PAGES, MIN_REPEAT_RATIO * text_pages)
+    return {key for key, count in pages_with_key.items() if count >= threshold}
+
+
+def strip_repeated_lines(text: str, page_starts: List[int]) -> Tuple[str, OffsetMap, int]:
+    """
+    Tekrar eden üst/alt bilgi satırlarını ve sayfa numaralarını çıkarır.
+
+    Args:
+        text: Ham metin (extract_text_with_pages çıktısı)
+        page_starts: Sayfa başlangıç ofsetleri
+
+    Returns:
+        (clean_text, offset_map, removed_lines) - offset_map to_raw_offset için
+    """
+    if len(page_starts) < MIN_REPEAT_PAGES:
+        return text, [(0, 0)], 0
+
+    repeated = find_repeated_lines(text, page_starts)
+    page_ends = page_starts[1:] + [len(text)]
+
+    removed: List[Tuple[int, int]] = []
+    for page_start, page_end in zip(page_starts, page_ends):
+        for line_start, line_end, line, key in _edge_lines(_page_lines(text, page_start, page_end)):
+            if key in repeated or PAGE_NUMBER_PATTERN.match(line.strip()):
+                # Satır sonunu da al (sayfanın son satırıysa öncekini)
+                if line_end < len(text) and text[line_end] == "\n":
+                    removed.append((line_start, line_end + 1))
+                elif line_start > 0 and text[line_start - 1] == "\n":
+                    removed.append((line_start - 1, line_end))
+                else:
+                    removed.append((line_start, line_end))
+
+    if not removed:
+        return text, [(0, 0)], 0
+
+    parts: List[str] = []
+    offset_map: OffsetMap = []
+    clean_pos = raw_pos = 0
+    for start, end in sorted(removed):
+        start = max(start, raw_pos)
+        if start > raw_pos:
+            offset_map.append((clean_pos, raw_pos))
+            parts.append(text[raw_pos:start])
+            clean_pos += start - raw_pos
+        raw_pos = max(raw_pos, end)
+    offset_map.append((clean_pos, raw_pos))
+    parts.append(text[raw_pos:])
+    return "".join(parts), offset_map, len(removed)
+
+
+def to_raw_offset(offset_map: OffsetMap, clean_offset: int) -> int:
+    """
+    Temiz metindeki ofseti ham metne çevirir.
+
+    Parça sınırındaki ofset bir sonraki parçanın başına gider; böylece
+    çıkarılan satırlar bir önceki bölümde kalır ve ardışık bölümler
+    boşluksuz kalmaya devam eder.
+    """
+    i = max(0, bisect_right(offset_map, (clean_offset, float("inf"))) - 1)
+    clean_start, raw_start = offset_map[i]
+    return raw_start + (clean_offset - clean_start)
+
+
+def to_clean_offset(offset_map: OffsetMap, raw_offset: int) -> int:
+    """
+    Ham metindeki ofseti temiz metne çevirir (to_raw_offset'in tersi).
+
+    Çıkarılmış bir satırın içine düşen ofset bir sonraki parçanın başına gider.
+    """
+    raw_starts = [raw_start for _, raw_start in offset_map]
+    i = max(0, bisect_right(raw_starts, raw_offset) - 1)
+    clean_start, raw_start = offset_map[i]
+    clean_offset = clean_start + max(0, raw_offset - raw_start)
+    if i + 1 < len(offset_map):
+        clean_offset = min(clean_offset, offset_map[i + 1][0])
+    return clean_offset
+
+
+def remap_sections(
+    sections: List[Dict],
+    offset_map: OffsetMap,
+    raw_text: str,
+    clean_length: int
+) -> List[Dict]:
+    """
+    Temiz metne göre üretilmiş bölümlerin start_idx/end_idx'ini ham metne
+    çevirir ve content'i ham metinden yeniden keser (yerinde günceller).
+    Temiz metnin sonunda biten bölüm ham metnin sonuna uzatılır.
+    """
+    def raw(offset: int) -> int:
+        if offset >= clean_length:
+            return len(raw_text)
+        return min(to_raw_offset(offset_map, offset), len(raw_text))
+
+    for sec in sections:
+        start = raw(sec.get("start_idx", 0))
+        end = raw(sec.get("end_idx", 0))
+        sec["start_idx"], sec["end_idx"] = start, max(start, end)
+        sec["content"] = raw_text[start:sec["end_idx"]]
+    return sections
@@ -0,0 +1,155 @@
+"""
+Extraction Cache
+
+Çıkarılmış metinleri dosya içeriğinin SHA-256 özetine göre diskte saklar.
+Aynı rapor tekrar işlendiğinde PDF/DOCX yeniden çözülmez.
+
+Anahtar: dosya baytlarının SHA-256'sı + extractor backend'i + sürüm.
+Her kayıt iki dosyadan oluşur:
+    <anahtar>.txt   - çıkarılmış metin
+    <anahtar>.json  - sayfa başlangıç ofsetleri ve kaynak bilgisi
+
+Boyut sınırı aşılınca en uzun süredir kullanılmayan kayıtlar silinir (LRU).
+Kullanım zamanı dosyanın mtime değeri ile takip edilir.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Varsayılanlar ortam değişkenleriyle değiştirilebilir
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "processed" / "extraction_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# Birleştirme kuralı veya sayfa metni üretimi değişirse artırılmalı
+EXTRACTOR_VERSION = 1
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path: str | Path) -> str:
+    """Dosya içeriğinin SHA-256 özetini parça parça okuyarak hesaplar"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def bytes_sha256(data: bytes) -> str:
+    """Bellekteki içerik için SHA-256 özeti"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractionCache:
+    """Boyut sınırlı, içerik adresli extraction cache"""
+
+    def __init__(self, cache_dir: str | Path = None, max_bytes: int = None):
+        cache_dir = cache_dir or os.getenv("EXTRACTION_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes or int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+    @staticmethod
+    def make_key(content_hash: str, backend: str) -> str:
+        """İçerik özeti, backend ve sürümden cache anahtarı üretir"""
+        safe_backend = "".join(c if c.isalnum() or c in "._" else "_" for c in backend)
+        return f"{content_hash}_{safe_backend}_v{EXTRACTOR_VERSION}"
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.txt", self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Kayıt varsa (metin, metadata) döndürür, yoksa None.
+
+        Okunan kaydın mtime'ı güncellenir (LRU için).
+        """
+        text_path, meta_path = self._paths(key)
+        try:
+            text = text_path.read_text(encoding='utf-8')
+            metadata = json.loads(meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+        now = time.time()
+        for path in (text_path, meta_path):
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        return text, metadata
+
+    def put(self, key: str, text: str, page_starts: List[int], source_name: str = None, backend: str = None) -> None:
+        """Metni ve sayfa ofsetlerini kaydeder, gerekirse eski kayıtları siler"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        text_path, meta_path = self._paths(key)
+
+        metadata = {
+            "key": key,
+            "source_name": source_name,
+            "backend": backend,
+            "extractor_version": EXTRACTOR_VERSION,
+            "char_count": len(text),
+            "page_count": len(page_starts),
+            "page_starts": page_starts,
+            "created": time.time(),
+        }
+
+        # Önce metin, sonra metadata: get() metadata olmadan kaydı görmez
+        self._atomic_write(text_path, text)
+        self._atomic_write(meta_path, json.dumps(metadata, ensure_ascii=False))
+        self.evict()
+
+    def _atomic_write(self, path: Path, content: str) -> None:
+        """Paralel process'ler yarım dosya görmesin diye temp + rename ile yazar"""
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp_", suffix=path.suffix)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def evict(self) -> int:
+        """
+        Toplam boyut max_bytes altına inene kadar en eski kayıtları siler.
+
+        Returns:
+            Silinen kayıt sayısı
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        entries = {}
+        for path in self.cache_dir.iterdir():
+            if path.name.startswith(".tmp_") or path.suffix not in (".txt", ".json"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            size, last_used = entries.get(path.stem, (0, 0.0))
+            entries[path.stem] = (size + stat.st_size, max(last_used, stat.st_mtime))
+
+        total = sum(size for size, _ in entries.values())
+        removed = 0
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,218 @@
+"""
+Streaming DOCX Extractor
+
+DOCX dosyasındaki `word/document.xml`'i zip içinden artımlı (iterparse)
+okuyarak paragrafları ve tablo hücrelerini belge sırasıyla döndürür.
+
+python-docx tüm nesne modelini belleğe yükler ve `doc.paragraphs` tablo
+içeriğini içermez; burada her üst seviye blok işlendikten sonra XML ağacı
+temizlendiği için bellek kullanımı belge boyutundan bağımsız kalır.
+
+Başlık seviyeleri paragraf stilinden (`w:pStyle`, styles.xml'deki
+"heading N" adı / `w:outlineLvl` ve `w:basedOn` zinciri) ya da paragrafın
+kendi `w:outlineLvl` değerinden okunur; LLM'siz segmentasyon bunu kullanır.
+"""
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+
+# Blok üretimi değişirse artırılmalı (extraction cache anahtarına girer)
+DOCX_EXTRACTOR_VERSION = 1
+
+# Transitional ve Strict OOXML ad alanları
+W_NAMESPACES = {
+    "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "http://purl.oclc.org/ooxml/wordprocessingml/main",
+}
+MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+BLOCK_PARAGRAPH = "paragraph"
+BLOCK_TABLE_CELL = "table_cell"
+
+# w:outlineLvl 9 = gövde metni (başlık değil)
+BODY_OUTLINE_LEVEL = 9
+
+HEADING_NAME_PATTERN = re.compile(r"^heading\s*(\d)$", re.IGNORECASE)
+
+
+def _split_tag(tag: str) -> Tuple[str, str]:
+    """'{ns}local' -> (ns, local)"""
+    if tag.startswith("{"):
+        namespace, local = tag[1:].split("}", 1)
+        return namespace, local
+    return "", tag
+
+
+def _w_attr(element: ET.Element, name: str) -> Optional[str]:
+    """w: ad alanındaki özniteliği okur (transitional/strict)"""
+    for namespace in W_NAMESPACES:
+        value = element.get(f"{{{namespace}}}{name}")
+        if value is not None:
+            return value
+    return None
+
+
+def _outline_level(value: Optional[str]) -> Optional[int]:
+    """w:outlineLvl değerini 1 tabanlı başlık seviyesine çevirir"""
+    try:
+        level = int(value)
+    except (TypeError, ValueError):
+        return None
+    return level + 1 if 0 <= level < BODY_OUTLINE_LEVEL else None
+
+
+def read_heading_styles(archive: zipfile.ZipFile) -> Dict[str, int]:
+    """
+    styles.xml'den başlık stillerini okur.
+
+    Stil adı "heading N" ise (Word yerelleştirilmiş arayüzde de stil adını
+    İngilizce saklar; stil ID'si ise "Balk1" gibi yerel olabilir) ya da
+    stilde outlineLvl tanımlıysa başlıktır. basedOn ile başlık stilinden
+    türetilen özel stiller de seviyeyi devralır.
+
+    Returns:
+        {style_id: level} - level 1 tabanlı
+    """
+    try:
+        styles_xml = archive.read(STYLES_PART)
+    except KeyError:
+        return {}
+
+    own_levels: Dict[str, Optional[int]] = {}
+    based_on: Dict[str, str] = {}
+    for style in ET.fromstring(styles_xml):
+        namespace, local = _split_tag(style.tag)
+        if namespace not in W_NAMESPACES or local != "style" or _w_attr(style, "type") != "paragraph":
+            continue
+        style_id = _w_attr(style, "styleId")
+        if not style_id:
+            continue
+
+        level = None
+        for child in style.iter():
+            child_local = _split_tag(child.tag)[1]
+            if child_local == "name":
+                match = HEADING_NAME_PATTERN.match((_w_attr(child, "val") or "").strip())
+                if match:
+                    level = int(match.group(1))
+            elif child_local == "outlineLvl" and level is None:
+                level = _outline_level(_w_attr(child, "val"))
+            elif child_local == "basedOn":
+                based_on[style_id] = _w_attr(child, "val") or ""
+        own_levels[style_id] = level
+
+    levels = {}
+    for style_id in own_levels:
+        # basedOn zincirinde seviyesi olan ilk stil (döngülere karşı sınırlı)
+        current, seen = style_id, set()
+        while current and current not in seen:
+            seen.add(current)
+            if own_levels.get(current):
+                levels[style_id] = own_levels[current]
+                break
+            current = based_on.get(current)
+    return levels
+
+
+def iter_docx_blocks(source: str | Path | BinaryIO) -> Iterator[Tuple[str, str]]:
+    """
+    DOCX gövdesindeki blokları belge sırasıyla döndürür.
+
+    Paragraflar tek tek, tablo hücreleri ise hücre içindeki paragraflar
+    satır sonu ile birleştirilerek tek blok olarak döner. İç içe tablolar
+    dıştaki hücrenin metnine eklenir. Alternatif içerikteki (mc:Fallback)
+    kopyalar atlanır, silinmiş değişiklikler (w:delText) alınmaz.
+
+    Args:
+        source: DOCX dosya yolu veya ikili dosya nesnesi
+
+    Yields:
+        (kind, text) - kind: "paragraph" veya "table_cell"
+    """
+    for kind, text, _ in iter_docx_blocks_with_levels(source):
+        yield kind, text
+
+
+def iter_docx_blocks_with_levels(source: str | Path | BinaryIO) -> Iterator[Tuple[str, str, Optional[int]]]:
+    """
+    iter_docx_blocks ile aynı bloklar, başlık seviyesiyle birlikte.
+
+    Yields:
+        (kind, text, heading_level) - heading_level 1 tabanlı; başlık
+        olmayan paragraflarda ve tablo hücrelerinde None
+    """
+    with zipfile.ZipFile(source) as archive:
+        heading_styles = read_heading_styles(archive)
+        with archive.open(DOCUMENT_PART) as document_xml:
+            yield from _iter_blocks_from_xml(document_xml, heading_styles)
+
+
+def _iter_blocks_from_xml(
+    document_xml: BinaryIO,
+    heading_styles: Dict[str, int]
+) -> Iterator[Tuple[str, str, Optional[int]]]:
+    element_stack: List[ET.Element] = []
+    paragraph_stack: List[List[str]] = []  # Açık paragrafların metin parçaları
+    level_stack: List[Optional[int]] = []  # Açık paragrafların başlık seviyesi
+    cell_stack: List[List[str]] = []  # Açık tablo hücrelerinin paragrafları
+    fallback_depth = 0  # mc:Fallback içinde miyiz (aynı içeriğin yedek kopyası)
+
+    for event, element in ET.iterparse(document_xml, events=("start", "end")):
+        namespace, local = _split_tag(element.tag)
+
+        if event == "start":
+            element_stack.append(element)
+            if namespace == MC_NAMESPACE and local == "Fallback":
+                fallback_depth += 1
+            elif namespace in W_NAMESPACES and not fallback_depth:
+                if local == "p":
+                    paragraph_stack.append([])
+                    level_stack.append(None)
+                elif local == "tc":
+                    cell_stack.append([])
+            continue
+
+        # event == "end"
+        element_stack.pop()
+        # w:tab / w:br yalnızca run içindeyse metindir (w:tabs altındaki tab durakları değil)
+        in_run = bool(element_stack) and _split_tag(element_stack[-1].tag)[1] == "r"
+
+        if namespace == MC_NAMESPACE and local == "Fallback":
+            fallback_depth -= 1
+        elif namespace in W_NAMESPACES and not fallback_depth:
+            if local == "t" and paragraph_stack:
+                paragraph_stack[-1].append(element.text or "")
+            elif local == "tab" and in_run and paragraph_stack:
+                paragraph_stack[-1].append("\t")
+            elif local in ("br", "cr") and in_run and paragraph_stack:
+                paragraph_stack[-1].append("\n")
+            elif local == "pStyle" and level_stack:
+                level_stack[-1] = heading_styles.get(_w_attr(element, "val") or "")
+            elif local == "outlineLvl" and level_stack:
+                # Paragrafın kendi outlineLvl'i stilin seviyesini ezer
+                level_stack[-1] = _outline_level(_w_attr(element, "val"))
+            elif local == "p" and paragraph_stack:
+                paragraph_text = "".join(paragraph_stack.pop())
+                heading_level = level_stack.pop()
+                if paragraph_stack:
+                    # Metin kutusu gibi paragraf içi paragraf: dıştakine ekle
+                    paragraph_stack[-1].append(paragraph_text)
+                elif cell_stack:
+                    cell_stack[-1].append(paragraph_text)
+                else:
+                    yield BLOCK_PARAGRAPH, paragraph_text, heading_level
+            elif local == "tc" and cell_stack:
+                cell_text = "\n".join(cell_stack.pop())
+                if cell_stack:
+                    cell_stack[-1].append(cell_text)
+                else:
+                    yield BLOCK_TABLE_CELL, cell_text, None
+
+        # Gövdenin doğrudan çocuğu bittiyse ağacı buda: bellek sabit kalsın
+        if len(element_stack) == 2 and _split_tag(element_stack[-1].tag)[1] == "body":
+            element_stack[-1].clear()
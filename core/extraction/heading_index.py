@@ -0,0 +1,303 @@
+"""
+Heading Index
+
+PDF'teki başlıkları yazı tipi ölçülerinden (boyut, kalınlık) çıkarır ve
+çıkarılmış metindeki ofsetlerine hizalar.
+
+Backend'lerin page.extract_text() çıktısı biçim bilgisini kaybeder; burada
+pdfplumber'ın karakter düzeyindeki fontname/size bilgisi kullanılır. Gövde
+yazı boyutu belgedeki en yaygın boyuttur; ondan belirgin büyük ya da gövde
+boyutunda ama tamamı kalın olan kısa satırlar başlık sayılır. Seviyeler
+boyut sırasından gelir (en büyük = 1). DOCX'te aynı indeks paragraf
+stillerinden üretilir (docx_heading_index).
+
+İndeks metin dosyasının yanında `<isim>.headings.json` olarak tutulur
+(bkz. page_index.py); chunk sınırları ve segmentasyon düzeltmeleri anahtar
+kelime taraması yerine bunu kullanabilir.
+"""
+import io
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .backends import _select_pages
+    from .isolation import iter_pages_isolated
+except ImportError:
+    from backends import _select_pages
+    from isolation import iter_pages_isolated
+
+HEADING_INDEX_SUFFIX = ".headings.json"
+
+# Gövdeden en az bu oranda büyük satırlar başlık adayıdır
+MIN_SIZE_RATIO = 1.15
+# Gövde boyutundaki kalın satırlar için
+MAX_BOLD_HEADING_CHARS = 80
+MAX_HEADING_CHARS = 120
+MAX_LEVEL = 3
+
+BOLD_MARKERS = ("bold", "black", "heavy", "semibold", "demi")
+
+# Bu kadar farklı sayfada aynı metinle geçen satırlar tablo başlığı / üst bilgidir
+MAX_REPEAT_PAGES = 3
+
+# "1.", "1.2", "a)", "iv." ile başlayan satır yeni başlıktır (öncekine eklenmez)
+ENUMERATOR_PATTERN = re.compile(r"^(?:\d+(?:\.\d+)*|[a-z]|[ivx]+)[.)]?\s", re.IGNORECASE)
+CONTINUATION_ENDINGS = (",", "&", "-", "–", ":", " and", " of", " the", " for", " in", " ve", " ile")
+
+
+def heading_index_path(text_path: str | Path) -> Path:
+    """Metin dosyasının yanındaki başlık indeksi dosyasının yolu"""
+    text_path = Path(text_path)
+    return text_path.with_name(text_path.stem + HEADING_INDEX_SUFFIX)
+
+
+def save_heading_index(text_path: str | Path, headings: List[Dict]) -> Path:
+    """
+    Başlık indeksini metin dosyasının yanına kaydeder.
+
+    Args:
+        text_path: Metin dosyasının yolu
+        headings: build_heading_index çıktısı
+
+    Returns:
+        Kaydedilen indeks dosyasının yolu
+    """
+    index_path = heading_index_path(text_path)
+    index_path.write_text(
+        json.dumps({
+            "heading_count": len(headings),
+            "headings": headings
+        }, ensure_ascii=False),
+        encoding='utf-8'
+    )
+    return index_path
+
+
+def load_heading_index(text_path: str | Path) -> Optional[List[Dict]]:
+    """Metin dosyasının başlık indeksini yükler; yoksa None döner"""
+    index_path = heading_index_path(text_path)
+    if not index_path.exists():
+        return None
+    try:
+        data = json.loads(index_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return data.get("headings")
+
+
+def _is_bold(fontname: str) -> bool:
+    return any(marker in (fontname or "").lower() for marker in BOLD_MARKERS)
+
+
+def _size_bucket(size: float) -> float:
+    """Yakın boyutları aynı gruba al (0.5 pt)"""
+    return round(size * 2) / 2
+
+
+def _page_font_lines(page) -> List[Tuple[int, str, Dict[float, int], bool]]:
+    """Sayfanın metin satırları: (satır no, metin, boyut sayımı, kalın mı)"""
+    lines = []
+    for line_no, line in enumerate(page.extract_text_lines(return_chars=True)):
+        chars = [c for c in line.get("chars", []) if c.get("text", "").strip()]
+        if not chars:
+            continue
+        sizes = Counter(_size_bucket(c.get("size", 0)) for c in chars)
+        bold_ratio = sum(_is_bold(c.get("fontname")) for c in chars) / len(chars)
+        lines.append((line_no, line["text"].strip(), dict(sizes), bold_ratio >= 0.8))
+    return lines
+
+
+def iter_font_lines(
+    pdf_source: Union[Path, bytes],
+    pages: Optional[Iterable[int]] = None
+) -> Iterator[List[Tuple[int, str, Dict[float, int], bool]]]:
+    """
+    Sayfa başına yazı tipi ölçülü satırlar (_page_font_lines).
+
+    Backend iter_pages imzasındadır; böylece isolation.iter_pages_isolated
+    içinde sayfa başına süre ve bellek sınırıyla çalıştırılabilir.
+    """
+    import pdfplumber  # type: ignore
+
+    opened = io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else pdf_source
+    with pdfplumber.open(opened) as pdf:
+        for page in _select_pages(pdf.pages, pages):
+            try:
+                yield _page_font_lines(page)
+            finally:
+                # Layout önbelleğini bırak, uzun raporlarda bellek şişmesin
+                page.close()
+
+
+def detect_font_headings(
+    pdf_source: Union[Path, bytes],
+    pages: Optional[Iterable[int]] = None,
+    isolated: bool = False
+) -> List[Dict]:
+    """
+    Başlık satırlarını yazı tipi ölçülerine göre bulur (ofsetsiz).
+
+    Aynı biçimdeki ardışık başlık satırları, ikinci satır devam gibi
+    görünüyorsa (küçük harfle başlıyor ya da önceki satır bağlaçla bitiyor)
+    birleştirilir. Seviyeler, birden fazla sayfada kullanılan başlık
+    boyutlarının sırasından gelir (yalnızca kapakta geçen büyük boyutlar
+    sıralamayı kaydırmasın diye).
+
+    isolated=True iken sayfalar ayrı bir worker'da, metin çıkarmayla aynı
+    sayfa başına süre ve bellek sınırıyla (PDF_PAGE_TIMEOUT,
+    PDF_WORKER_MAX_RSS_MB) okunur; takılan sayfa başlıksız sayılır.
+
+    Returns:
+        [{"level", "title", "page_no", "font_size", "bold"}, ...] - belge sırasıyla
+    """
+    pages = sorted(set(pages)) if pages is not None else None
+    if isolated:
+        page_lines = (
+            (page_no, font_lines or [])
+            for page_no, font_lines, _ in iter_pages_isolated(pdf_source, "pdfplumber", pages, page_iter=iter_font_lines)
+        )
+    else:
+        page_lines = zip(pages if pages is not None else count(), iter_font_lines(pdf_source, pages))
+
+    lines = []  # (page_no, line_no, text, size, bold)
+    size_counts: Counter = Counter()
+    for page_no, font_lines in page_lines:
+        for line_no, text, sizes, bold in font_lines:
+            sizes = Counter(sizes)
+            size_counts.update(sizes)
+            lines.append((page_no, line_no, text, sizes.most_common(1)[0][0], bold))
+
+    if not size_counts:
+        return []
+    body_size = size_counts.most_common(1)[0][0]
+
+    candidates = []
+    for page_no, line_no, text, size, bold in lines:
+        if not re.search(r"[^\W\d_]", text) or len(text) > MAX_HEADING_CHARS:
+            continue
+        if size >= body_size * MIN_SIZE_RATIO or (bold and size >= body_size and len(text) <= MAX_BOLD_HEADING_CHARS):
+            candidates.append((page_no, line_no, text, size, bold))
+
+    # Birçok sayfada tekrar eden satırlar (tablo başlıkları) başlık değildir
+    pages_per_text: Dict[str, set] = {}
+    for page_no, _, text, _, _ in candidates:
+        pages_per_text.setdefault(text.lower(), set()).add(page_no)
+    candidates = [c for c in candidates if len(pages_per_text[c[2].lower()]) < MAX_REPEAT_PAGES]
+
+    # Seviye = kendisinden büyük (birden fazla sayfada kullanılan) başlık boyutu sayısı + 1
+    pages_per_size: Dict[float, set] = {}
+    for page_no, _, _, size, _ in candidates:
+        if size >= body_size * MIN_SIZE_RATIO:
+            pages_per_size.setdefault(size, set()).add(page_no)
+    ranked_sizes = [size for size, size_pages in pages_per_size.items() if len(size_pages) > 1]
+
+    def level_for(size: float) -> int:
+        return min(1 + sum(1 for ranked in ranked_sizes if ranked > size), MAX_LEVEL)
+
+    headings: List[Dict] = []
+    previous = None
+    for page_no, line_no, text, size, bold in candidates:
+        continues = previous and previous[:2] == (page_no, line_no - 1) and previous[3:] == (size, bold)
+        if continues and not ENUMERATOR_PATTERN.match(text) and (
+            text[0].islower() or previous[2].lower().endswith(CONTINUATION_ENDINGS)
+        ):
+            headings[-1]["title"] += " " + text
+        else:
+            headings.append({
+                "level": level_for(size),
+                "title": text,
+                "page_no": page_no,
+                "font_size": size,
+                "bold": bold
+            })
+        previous = (page_no, line_no, text, size, bold)
+    return headings
+
+
+def _find_line(text: str, title: str, start: int, end: int) -> Optional[int]:
+    """Başlığı [start, end) içinde boşluk farkına toleranslı arar; satır başını tercih eder"""
+    words = title.split()
+    if not words:
+        return None
+    pattern = re.compile(r"\s*".join(re.escape(word) for word in words))
+    first = None
+    for match in pattern.finditer(text, start, end):
+        if match.start() == 0 or text[match.start() - 1] == "\n":
+            return match.start()
+        if first is None:
+            first = match.start()
+    return first
+
+
+def build_heading_index(
+    pdf_source: Union[Path, bytes],
+    text: str,
+    page_starts: List[int],
+    pages: Optional[Iterable[int]] = None,
+    isolated: bool = False
+) -> List[Dict]:
+    """
+    Yazı tipi başlıklarını çıkarılmış metne hizalar.
+
+    Metin hangi backend'le çıkarılmış olursa olsun, her başlık kendi
+    sayfasının penceresinde aranır; bulunamayan başlıklar atlanır.
+
+    Args:
+        pdf_source: PDF yolu veya içeriği
+        text: extract_text_with_pages metni
+        page_starts: Aynı çıkarmanın sayfa başlangıç ofsetleri
+        pages: text belirli sayfalardan çıkarıldıysa aynı sayfa seçimi
+        isolated: Yazı tipi ölçüleri izole worker'da, sayfa başına süre ve
+                  bellek sınırıyla okunur (bkz. detect_font_headings)
+
+    Returns:
+        [{"level", "title", "page_no", "char_start", "font_size", "bold"}, ...]
+    """
+    pages = sorted(set(pages)) if pages is not None else None
+    page_numbers = pages if pages is not None else list(range(len(page_starts)))
+    # Gerçek sayfa numarası -> page_starts sırası
+    unit_for_page = {page_no: unit_no for unit_no, page_no in enumerate(page_numbers[:len(page_starts)])}
+    page_ends = page_starts[1:] + [len(text)]
+
+    index = []
+    cursor = 0
+    for heading in detect_font_headings(pdf_source, pages, isolated=isolated):
+        unit_no = unit_for_page.get(heading["page_no"])
+        if unit_no is None:
+            continue
+        offset = _find_line(text, heading["title"], max(cursor, page_starts[unit_no]), page_ends[unit_no])
+        if offset is None:
+            continue
+        index.append({**heading, "char_start": offset})
+        cursor = offset + 1
+    return index
+
+
+def docx_heading_index(docx_source) -> List[Dict]:
+    """
+    DOCX başlık stillerinden (Heading 1, 2, ...) aynı biçimde indeks üretir.
+
+    Returns:
+        [{"level", "title", "page_no", "char_start", "font_size", "bold"}, ...] -
+        DOCX'te sayfa ve yazı tipi bilgisi olmadığından bu alanlar None
+    """
+    try:
+        from .pdf_extractor import iter_docx_headings
+    except ImportError:
+        from pdf_extractor import iter_docx_headings
+
+    return [
+        {
+            "level": min(level, MAX_LEVEL),
+            "title": title,
+            "page_no": None,
+            "char_start": char_start,
+            "font_size": None,
+            "bold": None
+        }
+        for level, title, char_start in iter_docx_headings(docx_source)
+    ]
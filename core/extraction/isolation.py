@@ -0,0 +1,275 @@
+"""
+Isolated Page Extraction
+
+PDF sayfalarını ayrı bir worker process'te çıkarır; ana process her sayfayı
+zaman aşımı ve bellek (RSS) sınırıyla izler.
+
+Bazı raporlar (örn. *_compressed*.pdf) pdfplumber'ın tek sayfada takılmasına
+ya da çok büyük layout önbelleği ayırmasına yol açıyor ve tüm batch'i
+durduruyor. Worker bir sayfada zaman aşımına uğrarsa, RSS sınırını aşarsa
+ya da çökerse öldürülür; o sayfa daha hafif bir backend'le (FALLBACK_BACKENDS)
+yine izole bir worker'da çıkarılır ve birincil backend kalan sayfalardan
+devam eder. Rapor düşmez, yalnızca o sayfanın metni farklı backend'den gelir.
+Geçilecek backend kalmadıysa ya da sayfa sayısı bilinmezken hiçbir sayfa
+çıkarılamadıysa RuntimeError fırlatılır; boş sayfa üretip beklemeye devam
+edilmez.
+
+Ayarlar (ortam değişkeni):
+    PDF_PAGE_TIMEOUT       - sayfa başına süre sınırı, saniye (varsayılan 60)
+    PDF_WORKER_MAX_RSS_MB  - worker RSS sınırı, MB (varsayılan 2048)
+
+RSS /proc üzerinden okunur; /proc olmayan sistemlerde yalnızca zaman aşımı
+ve MemoryError uygulanır.
+"""
+import multiprocessing
+import os
+import sys
+import time
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+
+try:
+    from .backends import BACKENDS, PdfSource
+except ImportError:
+    # pdf_extractor.py doğrudan script olarak çalıştırıldığında
+    from backends import BACKENDS, PdfSource
+
+DEFAULT_PAGE_TIMEOUT = 60.0
+DEFAULT_MAX_RSS_MB = 2048.0
+RSS_POLL_INTERVAL = 0.2  # Worker'ın RSS'i kaç saniyede bir kontrol edilsin
+
+# Takılan sayfa için denenecek backend'ler, hafiften ağıra (benchmark'a göre)
+FALLBACK_BACKENDS = ("pypdfium2", "pypdf2", "pymupdf")
+
+# Birincil backend art arda bu kadar sayfada hiç ilerleyemezse kalan sayfalar
+# doğrudan fallback backend'e verilir (her sayfada zaman aşımı beklenmesin)
+MAX_CONSECUTIVE_FAILURES = 2
+
+# Worker mesaj tipleri
+MSG_PAGE = "page"
+MSG_DONE = "done"
+MSG_ERROR = "error"
+MSG_TIMEOUT = "timeout"
+MSG_RSS = "rss"
+MSG_CRASH = "crash"
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Process'in resident set boyutu (MB); okunamazsa None"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _page_count(pdf_source: PdfSource) -> Optional[int]:
+    """
+    Sayfa sayısı (pypdfium2, yoksa PyPDF2); okunamazsa None.
+
+    İki kütüphane de belgeyi açarken yalnızca xref'i ve sayfa ağacını okur,
+    layout analizi yapmaz; bu yüzden ana process'te çağrılır.
+    """
+    try:
+        import pypdfium2 as pdfium  # type: ignore
+    except ImportError:
+        pdfium = None
+    try:
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(pdf_source if isinstance(pdf_source, bytes) else str(pdf_source))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        import io
+        import PyPDF2  # type: ignore
+        reader = PyPDF2.PdfReader(io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else str(pdf_source))
+        return len(reader.pages)
+    except Exception:
+        return None
+
+
+def _fallback_backend(backend_name: str) -> Optional[str]:
+    """Birincilden farklı, kurulu ilk fallback backend'i"""
+    for name in FALLBACK_BACKENDS:
+        backend = BACKENDS.get(name)
+        if name != backend_name and backend is not None and backend.is_available():
+            return name
+    return None
+
+
+def _page_worker(
+    conn,
+    backend_name: str,
+    pdf_source: PdfSource,
+    pages: Sequence[int],
+    page_iter: Optional[Callable] = None
+) -> None:
+    """Worker process: sayfaları çözüldükçe pipe'a yazar"""
+    try:
+        iterate = page_iter or BACKENDS[backend_name].iter_pages
+        for page_no, page_text in zip(pages, iterate(pdf_source, pages)):
+            conn.send((MSG_PAGE, page_no, page_text or ""))
+        conn.send((MSG_DONE, None))
+    except MemoryError:
+        conn.send((MSG_RSS, "MemoryError"))
+    except Exception as e:
+        conn.send((MSG_ERROR, f"PDF okuma hatası ({backend_name}): {e}"))
+    finally:
+        conn.close()
+
+
+def _run_worker(
+    backend_name: str,
+    pdf_source: PdfSource,
+    pages: Sequence[int],
+    page_timeout: float,
+    max_rss_mb: float,
+    page_iter: Optional[Callable] = None
+) -> Iterator[Tuple]:
+    """
+    Worker'ı başlatır ve mesajlarını iletir.
+
+    Son mesaj her zaman page dışındadır: done, error ya da worker
+    sınırları aştığında timeout / rss / crash. Worker çıkışta öldürülür.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_page_worker,
+        args=(sender, backend_name, pdf_source, pages, page_iter),
+        daemon=True
+    )
+    process.start()
+    sender.close()
+
+    try:
+        deadline = time.monotonic() + page_timeout
+        while True:
+            if receiver.poll(RSS_POLL_INTERVAL):
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    process.join(1)
+                    yield MSG_CRASH, f"worker sonlandı (exit code {process.exitcode})"
+                    return
+                yield message
+                if message[0] != MSG_PAGE:
+                    return
+                deadline = time.monotonic() + page_timeout
+                continue
+
+            if time.monotonic() > deadline:
+                yield MSG_TIMEOUT, f"{page_timeout:.0f} sn içinde bitmedi"
+                return
+            rss = _rss_mb(process.pid)
+            if rss is not None and rss > max_rss_mb:
+                yield MSG_RSS, f"RSS {rss:.0f} MB > {max_rss_mb:.0f} MB"
+                return
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+
+
+def iter_pages_isolated(
+    pdf_source: PdfSource,
+    backend_name: str,
+    pages: Optional[Sequence[int]] = None,
+    page_timeout: Optional[float] = None,
+    max_rss_mb: Optional[float] = None,
+    page_count: Optional[int] = None,
+    page_iter: Optional[Callable] = None
+) -> Iterator[Tuple[int, str, Optional[str]]]:
+    """
+    PDF sayfalarını izole worker'da, sayfa başına süre ve bellek sınırıyla çıkarır.
+
+    Args:
+        pdf_source: PDF yolu veya içeriği
+        backend_name: Birincil backend adı
+        pages: Yalnızca bu sayfalar (0 tabanlı, artan sırada); None ise tümü
+        page_timeout: Sayfa başına süre sınırı (varsayılan: PDF_PAGE_TIMEOUT)
+        max_rss_mb: Worker RSS sınırı (varsayılan: PDF_WORKER_MAX_RSS_MB)
+        page_count: Bilinen sayfa sayısı (örn. triage'dan); verilmezse
+                    pypdfium2/PyPDF2 ile okunur
+        page_iter: Backend'in iter_pages'i yerine çağrılacak modül düzeyinde
+                   fonksiyon (pdf_source, pages) -> sayfa başına sonuç; örn.
+                   başlık indeksinin yazı tipi ölçüleri. Verilirse fallback
+                   kullanılmaz, takılan sayfanın sonucu "" olur
+
+    Yields:
+        (page_no, text, backend_name) - backend_name metni üreten backend;
+        sayfa hiçbir backend'le çıkarılamadıysa metin "" ve backend None
+
+    Raises:
+        RuntimeError: PDF okunamadı (bozuk dosya vb.) ya da sayfa sayısı
+                      bilinmezken hiçbir backend belgeden sayfa çıkaramadı
+    """
+    page_timeout = page_timeout or float(os.getenv("PDF_PAGE_TIMEOUT", DEFAULT_PAGE_TIMEOUT))
+    max_rss_mb = max_rss_mb or float(os.getenv("PDF_WORKER_MAX_RSS_MB", DEFAULT_MAX_RSS_MB))
+
+    # Sayfa sayısı biliniyorsa istek belgeyle sınırlanır; bilinmiyorsa tüm
+    # belge açık uçlu aralıkla istenir ve sonu yalnızca bir backend'in
+    # "done" mesajıyla anlaşılır
+    if page_count is None:
+        page_count = _page_count(pdf_source)
+    if page_count is None:
+        remaining: Sequence[int] = pages if pages is not None else range(0, sys.maxsize)
+    elif pages is None:
+        remaining = range(0, page_count)
+    else:
+        remaining = [page_no for page_no in pages if page_no < page_count]
+    current, fallback = backend_name, None if page_iter else _fallback_backend(backend_name)
+    failures_in_row = 0
+
+    while len(remaining):
+        produced = 0
+        status, detail = MSG_DONE, None
+        for message in _run_worker(current, pdf_source, remaining, page_timeout, max_rss_mb, page_iter):
+            if message[0] == MSG_PAGE:
+                produced += 1
+                yield message[1], message[2], current
+            else:
+                status, detail = message
+
+        if status == MSG_DONE:
+            return
+        if status == MSG_ERROR:
+            raise RuntimeError(detail)
+
+        # remaining[produced] sayfasında takıldı: o sayfayı fallback ile dene
+        page_no = remaining[produced]
+        failures_in_row = failures_in_row + 1 if produced == 0 else 1
+
+        page_text, used_backend, document_ended = "", None, False
+        if fallback:
+            for message in _run_worker(fallback, pdf_source, [page_no], page_timeout, max_rss_mb):
+                if message[0] == MSG_PAGE:
+                    page_text, used_backend = message[2], fallback
+                elif message[0] == MSG_DONE and used_backend is None:
+                    document_ended = True  # Sayfa yok: belge açılırken takılmış
+        if document_ended:
+            return
+        if used_backend is None and produced == 0 and page_count is None:
+            # Belgenin bu sayfaya kadar sürdüğü doğrulanamıyor: boş sayfa
+            # üretmeye devam etmek batch'i sonsuza kadar bekletir
+            raise RuntimeError(
+                f"PDF okunamadı: {current} sayfa {page_no + 1}'de {detail}, "
+                "sayfa sayısı bilinmiyor ve fallback backend yok"
+            )
+
+        print(
+            f" Sayfa {page_no + 1}: {current} {detail}; "
+            + (f"{used_backend} ile çıkarıldı" if used_backend else "metin alınamadı")
+        )
+        yield page_no, page_text, used_backend
+
+        remaining = remaining[produced + 1:]
+        if failures_in_row >= MAX_CONSECUTIVE_FAILURES and len(remaining):
+            if not fallback:
+                # Geçilecek backend kalmadı: kalan her sayfada zaman aşımı beklenmesin
+                raise RuntimeError(
+                    f"PDF okunamadı: {current} art arda {failures_in_row} sayfada ilerleyemedi ({detail})"
+                )
+            current, fallback = fallback, None
+            failures_in_row = 0
@@ -0,0 +1,194 @@
+"""
+Selective OCR
+
+Taranmış sayfaları (metin katmanı olmayan ama görsel içeren sayfalar) yerel
+OCR motoruyla (tesseract) okur. Yalnızca metni boş çıkan sayfalar OCR'a
+gider; sayfalar sınırlı bir process pool'da, isolated=True iken metin
+çıkarmadaki gibi sayfa başına süre (PDF_PAGE_TIMEOUT) ve RSS
+(PDF_WORKER_MAX_RSS_MB) sınırlı izole worker'da işlenir. OCR varsayılan
+olarak kapalıdır (extract_text_with_pages(ocr=True) ile, örn. triage
+"ocr" yönlendirdiğinde açılır).
+
+Her sayfa işlenirken render edilen görüntünün SHA-256 özeti alınır ve OCR
+çıktısı extraction cache'inde bu özetle saklanır. Böylece aynı taranmış
+sayfa (aynı rapor tekrar yüklendiğinde, ya da başka bir belgede) OCR
+maliyetini yalnızca bir kez öder.
+
+Gereksinimler (isteğe bağlı): pytesseract + tesseract binary, pypdfium2.
+Kurulu değilse ocr_available() False döner ve sayfalar boş kalır.
+
+Ayarlar (ortam değişkeni):
+    PDF_OCR_LANG     - tesseract dil(ler)i (varsayılan "eng+tur")
+    PDF_OCR_DPI      - render çözünürlüğü (varsayılan 300)
+    PDF_OCR_WORKERS  - OCR process pool boyutu (varsayılan 2)
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .cache import ExtractionCache
+    from .isolation import iter_pages_isolated
+except ImportError:
+    # pdf_extractor.py doğrudan script olarak çalıştırıldığında
+    from cache import ExtractionCache
+    from isolation import iter_pages_isolated
+
+DEFAULT_OCR_LANG = "eng+tur"
+DEFAULT_OCR_DPI = 300
+DEFAULT_OCR_WORKERS = 2
+
+# OCR ön/son işleme değişirse artırılmalı (cache anahtarına girer)
+OCR_VERSION = 1
+
+
+def _ocr_settings() -> Tuple[str, int]:
+    return (
+        os.getenv("PDF_OCR_LANG", DEFAULT_OCR_LANG),
+        int(os.getenv("PDF_OCR_DPI", DEFAULT_OCR_DPI))
+    )
+
+
+@lru_cache(maxsize=1)
+def ocr_available() -> bool:
+    """pytesseract, tesseract binary ve pypdfium2 kurulu mu"""
+    try:
+        import pypdfium2  # type: ignore  # noqa: F401
+        import pytesseract  # type: ignore
+        pytesseract.get_tesseract_version()
+    except Exception:
+        return False
+    return True
+
+
+def ocr_engine_id() -> str:
+    """OCR motoru, dil, çözünürlük ve sürüm (cache anahtarı için)"""
+    lang, dpi = _ocr_settings()
+    return f"ocr-tesseract-{lang}-{dpi}dpi-{OCR_VERSION}"
+
+
+def _ocr_page(pdf_source: Union[Path, bytes], page_no: int) -> Tuple[int, str]:
+    """
+    Worker: sayfa görsel içeriyorsa render eder, cache'e bakar, yoksa OCR yapar.
+
+    Görsel içermeyen sayfa (gerçekten boş sayfa) için "" döner.
+    """
+    import pypdfium2 as pdfium  # type: ignore
+    import pypdfium2.raw as pdfium_c  # type: ignore
+    import pytesseract  # type: ignore
+
+    lang, dpi = _ocr_settings()
+    pdf = pdfium.PdfDocument(pdf_source if isinstance(pdf_source, bytes) else str(pdf_source))
+    try:
+        page = pdf[page_no]
+        if not any(True for _ in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,))):
+            return page_no, ""
+        image = page.render(scale=dpi / 72).to_pil()
+    finally:
+        pdf.close()
+
+    digest = hashlib.sha256(f"{image.mode}{image.size}".encode())
+    digest.update(image.tobytes())
+
+    cache = ExtractionCache()
+    key = cache.make_key(digest.hexdigest(), ocr_engine_id())
+    cached = cache.get(key)
+    if cached is not None:
+        return page_no, cached[0]
+
+    text = pytesseract.image_to_string(image, lang=lang).strip()
+    try:
+        cache.put(key, text, [0], backend=ocr_engine_id())
+    except OSError:
+        pass
+    return page_no, text
+
+
+def iter_ocr_pages(
+    pdf_source: Union[Path, bytes],
+    pages: Iterable[int]
+) -> Iterator[str]:
+    """
+    Sayfa başına OCR metni (_ocr_page); okunamayan sayfa için "".
+
+    Backend iter_pages imzasındadır; böylece isolation.iter_pages_isolated
+    içinde sayfa başına süre ve bellek sınırıyla çalıştırılabilir.
+    """
+    for page_no in pages:
+        try:
+            yield _ocr_page(pdf_source, page_no)[1]
+        except Exception as e:
+            print(f" Sayfa {page_no + 1}: OCR hatası ({e})")
+            yield ""
+
+
+def _ocr_pages_isolated(pdf_source: Union[Path, bytes], page_numbers: List[int]) -> Dict[int, str]:
+    """Sayfaları izole worker'da OCR'lar; takılan sayfa boş kalır"""
+    results: Dict[int, str] = {}
+    try:
+        for page_no, text, _ in iter_pages_isolated(
+            pdf_source, "ocr", page_numbers, page_iter=iter_ocr_pages
+        ):
+            if text:
+                results[page_no] = text
+    except RuntimeError as e:
+        # Art arda takılan sayfalar: kalanlar OCR'sız (boş) kalır
+        print(f" OCR durduruldu ({e})")
+    return results
+
+
+def ocr_pages(
+    pdf_source: Union[Path, bytes],
+    page_numbers: Iterable[int],
+    max_workers: Optional[int] = None,
+    isolated: bool = False
+) -> Dict[int, str]:
+    """
+    Verilen sayfaları OCR ile okur.
+
+    Args:
+        pdf_source: PDF yolu veya içeriği
+        page_numbers: Metni boş çıkan sayfalar (0 tabanlı)
+        max_workers: Pool boyutu (varsayılan: PDF_OCR_WORKERS)
+        isolated: Sayfalar pool yerine tek izole worker'da, sayfa başına
+                  süre/bellek sınırıyla işlenir (bkz. isolation.py)
+
+    Returns:
+        {page_no: text} - OCR kurulu değilse boş sözlük; okunamayan ya da
+        görsel içermeyen sayfalar dahil edilmez
+    """
+    page_numbers = list(page_numbers)
+    if not page_numbers or not ocr_available():
+        return {}
+    if isolated:
+        return _ocr_pages_isolated(pdf_source, page_numbers)
+
+    max_workers = max_workers or int(os.getenv("PDF_OCR_WORKERS", DEFAULT_OCR_WORKERS))
+    workers = max(1, min(max_workers, len(page_numbers)))
+
+    results: Dict[int, str] = {}
+    if workers == 1:
+        for page_no in page_numbers:
+            try:
+                _, text = _ocr_page(pdf_source, page_no)
+            except Exception as e:
+                print(f" Sayfa {page_no + 1}: OCR hatası ({e})")
+                continue
+            if text:
+                results[page_no] = text
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_ocr_page, pdf_source, page_no): page_no for page_no in page_numbers}
+        for future, page_no in futures.items():
+            try:
+                _, text = future.result()
+            except Exception as e:
+                print(f" Sayfa {page_no + 1}: OCR hatası ({e})")
+                continue
+            if text:
+                results[page_no] = text
+    return results
@@ -0,0 +1,100 @@
+"""
+PDF Outline
+
+PDF'in yer imlerini (outline / bookmarks) okur.
+
+Word'den dışa aktarılan raporlarda outline, başlıkların birebir metnini ve
+bulundukları sayfayı içerir; segmentasyonun hızlı yolu bunu kullanır
+(bkz. core/segmentation/outline_segmenter.py).
+"""
+import io
+from pathlib import Path
+from typing import List, Tuple, Union
+
+# (level, title, page_no) - level 1 tabanlı, page_no 0 tabanlı
+OutlineEntry = Tuple[int, str, int]
+
+
+def _outline_pdfplumber(pdf_source: Union[Path, bytes]) -> List[OutlineEntry]:
+    import pdfplumber  # type: ignore
+    from pdfminer.pdftypes import resolve1  # type: ignore
+    from pdfminer.psparser import PSLiteral  # type: ignore
+    from pdfminer.utils import decode_text  # type: ignore
+
+    opened = io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else pdf_source
+    entries = []
+    with pdfplumber.open(opened) as pdf:
+        page_numbers = {page.page_obj.pageid: page_no for page_no, page in enumerate(pdf.pages)}
+        doc = pdf.doc
+        for level, title, dest, action, _ in doc.get_outlines():
+            # Hedef ya doğrudan dest'te ya da GoTo action'ının /D alanında
+            if dest is None and action is not None:
+                action = resolve1(action)
+                dest = action.get("D") if isinstance(action, dict) else None
+            dest = resolve1(dest)
+            if isinstance(dest, (bytes, str, PSLiteral)):
+                dest = resolve1(doc.get_dest(dest.name if isinstance(dest, PSLiteral) else dest))
+            if isinstance(dest, dict):
+                dest = resolve1(dest.get("D"))
+            if not isinstance(dest, (list, tuple)) or not dest:
+                continue
+
+            page_no = page_numbers.get(getattr(dest[0], "objid", None))
+            if page_no is None:
+                continue
+            if isinstance(title, bytes):
+                title = decode_text(title)
+            entries.append((level, title or "", page_no))
+    return entries
+
+
+def _outline_pypdf2(pdf_source: Union[Path, bytes]) -> List[OutlineEntry]:
+    import PyPDF2  # type: ignore
+
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else str(pdf_source))
+    entries = []
+
+    def walk(items, level: int) -> None:
+        for item in items:
+            # İç içe liste bir önceki öğenin çocuklarıdır
+            if isinstance(item, list):
+                walk(item, level + 1)
+                continue
+            page_no = reader.get_destination_page_number(item)
+            if page_no is not None and page_no >= 0:
+                entries.append((level, item.title or "", page_no))
+
+    walk(reader.outline, 1)
+    return entries
+
+
+OUTLINE_READERS = (
+    ("pdfplumber", _outline_pdfplumber),
+    ("PyPDF2", _outline_pypdf2),
+)
+
+
+def read_pdf_outline(pdf_source: Union[str, Path, bytes]) -> List[OutlineEntry]:
+    """
+    PDF outline'ını belge sırasıyla döndürür.
+
+    Kurulu ilk okuyucu kullanılır; outline yoksa ya da okunamazsa boş liste
+    döner (hata fırlatmaz, çağıran LLM segmentasyonuna döner).
+
+    Args:
+        pdf_source: PDF yolu veya içeriği
+
+    Returns:
+        [(level, title, page_no), ...] - level 1 tabanlı, page_no 0 tabanlı
+    """
+    if isinstance(pdf_source, str):
+        pdf_source = Path(pdf_source)
+
+    for _, reader in OUTLINE_READERS:
+        try:
+            return reader(pdf_source)
+        except ImportError:
+            continue
+        except Exception:
+            return []
+    return []
@@ -0,0 +1,102 @@
+"""
+Page Index
+
+Çıkarılmış metindeki sayfa başlangıç ofsetlerini (page_starts) saklar ve
+karakter ofsetlerini sayfa numarasına çevirir.
+
+page_starts[i], i. sayfanın (0 tabanlı) birleşik metindeki başlangıç ofsetidir;
+dizi artan sıradadır, bu yüzden ofset -> sayfa dönüşümü ikili arama ile yapılır.
+İndeks metin dosyasının yanında `<isim>.pages.json` olarak tutulur:
+
+    data/processed/texts/report_001.txt
+    data/processed/texts/report_001.pages.json
+"""
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PAGE_INDEX_SUFFIX = ".pages.json"
+
+
+def page_index_path(text_path: str | Path) -> Path:
+    """Metin dosyasının yanındaki sayfa indeksi dosyasının yolu"""
+    text_path = Path(text_path)
+    return text_path.with_name(text_path.stem + PAGE_INDEX_SUFFIX)
+
+
+def save_page_index(text_path: str | Path, page_starts: List[int], total_length: int) -> Path:
+    """
+    Sayfa indeksini metin dosyasının yanına kaydeder.
+
+    Args:
+        text_path: Metin dosyasının yolu
+        page_starts: Sayfa başlangıç ofsetleri
+        total_length: Metnin toplam uzunluğu (son sayfanın bitişi)
+
+    Returns:
+        Kaydedilen indeks dosyasının yolu
+    """
+    index_path = page_index_path(text_path)
+    index_path.write_text(
+        json.dumps({
+            "page_count": len(page_starts),
+            "total_length": total_length,
+            "page_starts": page_starts
+        }),
+        encoding='utf-8'
+    )
+    return index_path
+
+
+def load_page_index(text_path: str | Path) -> Optional[List[int]]:
+    """Metin dosyasının sayfa indeksini yükler; yoksa None döner"""
+    index_path = page_index_path(text_path)
+    if not index_path.exists():
+        return None
+    try:
+        data = json.loads(index_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return data.get("page_starts")
+
+
+def page_for_offset(page_starts: List[int], offset: int) -> int:
+    """
+    Karakter ofsetinin düştüğü sayfayı (0 tabanlı) döndürür.
+
+    Metinsiz sayfalar sıfır uzunlukludur ve bir önceki sayfanın bitiş
+    ofsetinden başlar (baştaki boş sayfalar 0'dan). Aynı ofsetteki sayfalardan
+    sonuncusu seçildiği için önceki sayfanın bitişi ile ardından gelen ayraç
+    karakterleri boş sayfaya düşer; sonraki sayfanın metni kendi sayfasına.
+    """
+    if not page_starts:
+        return 0
+    return max(0, bisect_right(page_starts, offset) - 1)
+
+
+def page_range_for_span(page_starts: List[int], start_idx: int, end_idx: int) -> Tuple[int, int]:
+    """[start_idx, end_idx) aralığının kapsadığı ilk ve son sayfa (0 tabanlı)"""
+    first_page = page_for_offset(page_starts, start_idx)
+    last_page = page_for_offset(page_starts, max(start_idx, end_idx - 1))
+    return first_page, last_page
+
+
+def annotate_sections_with_pages(sections: List[Dict], page_starts: List[int]) -> List[Dict]:
+    """
+    Section'lara start_idx/end_idx'ten hesaplanan start_page/end_page ekler.
+
+    Sayfa numaraları kullanıcıya gösterim için 1 tabanlıdır.
+    """
+    if not page_starts:
+        return sections
+
+    for section in sections:
+        first_page, last_page = page_range_for_span(
+            page_starts,
+            section.get('start_idx', 0),
+            section.get('end_idx', 0)
+        )
+        section['start_page'] = first_page + 1
+        section['end_page'] = last_page + 1
+    return sections
@@ -4,15 +4,298 @@ Text Extraction Module
 PDF ve DOCX dosyalarından metin çıkarma.
 """
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+import io
+import os
 import sys
+import zipfile
+import xml.etree.ElementTree as ET
 
+try:
+    from .backends import get_backend
+    from .cache import ExtractionCache, bytes_sha256, file_sha256
+    from .docx_stream import DOCX_EXTRACTOR_VERSION, iter_docx_blocks, iter_docx_blocks_with_levels
+    from .isolation import iter_pages_isolated
+    from .ocr import ocr_available, ocr_engine_id, ocr_pages
+except ImportError:
+    # Doğrudan script olarak çalıştırıldığında (python pdf_extractor.py ...)
+    from backends import get_backend
+    from cache import ExtractionCache, bytes_sha256, file_sha256
+    from docx_stream import DOCX_EXTRACTOR_VERSION, iter_docx_blocks, iter_docx_blocks_with_levels
+    from isolation import iter_pages_isolated
+    from ocr import ocr_available, ocr_engine_id, ocr_pages
 
-def extract_text_from_pdf(pdf_path: str | Path) -> str:
+# Dosya yolu ya da bellekteki içerik (bytes, memoryview, ikili dosya nesnesi)
+Source = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+# Birleşik metinde sayfa ve paragraf ayraçları
+PAGE_SEPARATOR = "\n\n"
+PARAGRAPH_SEPARATOR = "\n"
+
+# Paralel çıkarma parametreleri
+PARALLEL_MIN_PAGES = 16  # Bu sayfa sayısının altında process başlatma maliyeti kazancı yiyor
+MIN_PAGES_PER_TASK = 4  # Bir worker'a verilecek en küçük sayfa aralığı
+
+
+def _resolve_source(source: Source, label: str = "Dosya") -> Union[Path, bytes]:
+    """
+    Girdiyi Path ya da bytes'a çevirir.
+    
+    Dosya nesnesi bulunduğu konumdan sonuna kadar okunur; memoryview ve
+    bytearray bytes'a kopyalanır. Bellekteki içerik hiçbir zaman diske yazılmaz.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if not path.exists():
+            raise FileNotFoundError(f"{label} dosyası bulunamadı: {path}")
+        return path
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        return bytes(source.read())
+    raise TypeError(f"Desteklenmeyen girdi tipi: {type(source).__name__}")
+
+
+def _source_suffix(source: Union[Path, bytes], filename: Optional[str] = None) -> str:
+    """Dosya tipini uzantıdan, yoksa içeriğin ilk baytlarından belirler"""
+    if isinstance(source, Path):
+        return source.suffix.lower()
+    if filename:
+        return Path(filename).suffix.lower()
+    if b"%PDF" in source[:1024]:
+        return '.pdf'
+    if source.startswith(b"PK\x03\x04"):
+        return '.docx'
+    return ''
+
+
+def _normalize_pages(pages: Optional[Iterable[int]]) -> Optional[List[int]]:
+    """Sayfa seçimini sıralı, tekrarsız 0 tabanlı listeye çevirir (None = tüm sayfalar)"""
+    if pages is None:
+        return None
+    page_list = sorted({int(page_no) for page_no in pages})
+    if page_list and page_list[0] < 0:
+        raise ValueError(f"Sayfa numarası negatif olamaz: {page_list[0]}")
+    return page_list
+
+
+def _pages_tag(pages: Optional[List[int]]) -> str:
+    """Cache anahtarı için sayfa seçimi etiketi (tüm belge için boş)"""
+    if pages is None:
+        return ""
+    if pages and pages == list(range(pages[0], pages[-1] + 1)):
+        return f"_p{pages[0]}-{pages[-1] + 1}"
+    return "_p" + "-".join(str(page_no) for page_no in pages)
+
+
+def _unsupported_format(suffix: str) -> ValueError:
+    return ValueError(
+        f"Desteklenmeyen dosya formatı: {suffix or '(bilinmiyor)'}\n"
+        "Desteklenen formatlar: .pdf, .docx, .txt"
+    )
+
+
+def _read_plain_text(source: Union[Path, bytes]) -> str:
+    if isinstance(source, Path):
+        return source.read_text(encoding='utf-8')
+    return source.decode('utf-8')
+
+
+def _with_offsets(
+    units: Iterable[Optional[str]],
+    separator: str,
+    keep_empty: bool = False
+) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    Metin birimlerine (sayfa/paragraf) birleşik metindeki konumlarını ekler.
+    
+    Birleşik metin şu kurala göre tanımlıdır: her birim strip edilir, birimler
+    `separator` ile birleştirilir, baştaki ve sondaki boş birimler atılır.
+    keep_empty=False ise aradaki boş birimler de atılır (PDF sayfaları),
+    True ise aradaki boş birimler ayraç olarak korunur (DOCX boş paragrafları).
+    
+    Boş birimler de (char_start == char_end) yield edilir; böylece numaralar
+    kesintisiz kalır.
+    
+    Yields:
+        (unit_no, char_start, char_end, text) - unit_no 0 tabanlıdır
+    """
+    pos = 0
+    emitted = False
+    pending: List[int] = []  # Yeri henüz belli olmayan boş birimler
+    
+    for unit_no, unit in enumerate(units):
+        unit = (unit or "").strip()
+        
+        if not unit:
+            if keep_empty and emitted:
+                pending.append(unit_no)
+            else:
+                yield unit_no, pos, pos, ""
+            continue
+        
+        if emitted:
+            pos += len(separator)
+        for empty_no in pending:
+            yield empty_no, pos, pos, ""
+            pos += len(separator)
+        pending = []
+        
+        yield unit_no, pos, pos + len(unit), unit
+        pos += len(unit)
+        emitted = True
+    
+    # Sondaki boş birimler metne dahil değil
+    for empty_no in pending:
+        yield empty_no, pos, pos, ""
+
+
+def _join_units(units: Iterable[Tuple[int, int, int, str]], separator: str) -> str:
+    """_with_offsets çıktısından birleşik metni geri kurar"""
+    parts = []
+    cursor = 0
+    for _, char_start, char_end, text in units:
+        if char_start > cursor:
+            parts.append(separator * ((char_start - cursor) // len(separator)))
+        parts.append(text)
+        cursor = max(cursor, char_end)
+    return "".join(parts)
+
+
+def _split_page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """
+    Sayfaları worker'lar arasında ardışık [start, end) aralıklarına böler.
+    
+    Her worker PDF'i kendisi açtığı için aralıklar ardışık tutulur;
+    böylece pdfplumber aynı sayfa kaynaklarını tekrar tekrar çözmez.
+    """
+    if page_count <= 0:
+        return []
+    
+    task_count = max(1, min(workers, page_count // MIN_PAGES_PER_TASK))
+    size, remainder = divmod(page_count, task_count)
+    
+    ranges = []
+    start = 0
+    for i in range(task_count):
+        end = start + size + (1 if i < remainder else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _extract_page_range_pdfplumber(pdf_source: str | bytes, start: int, end: int) -> List[str]:
+    """Worker process: [start, end) aralığındaki sayfaların metnini döndürür"""
+    import pdfplumber  # type: ignore
+    
+    if isinstance(pdf_source, bytes):
+        pdf_source = io.BytesIO(pdf_source)
+    
+    page_texts = []
+    with pdfplumber.open(pdf_source) as pdf:
+        for page in pdf.pages[start:end]:
+            page_texts.append(page.extract_text() or "")
+            # Sayfa önbelleğini bırak, uzun aralıklarda bellek şişmesin
+            page.close()
+    return page_texts
+
+
+def _extract_pages_parallel(pdf_source: Union[Path, bytes], page_count: int, max_workers: Optional[int] = None) -> List[str]:
+    """
+    Sayfa aralıklarını process pool'a dağıtır ve sonuçları sayfa sırasıyla birleştirir.
+    
+    Bellekteki PDF'ler her worker'a bytes olarak gönderilir.
+    """
+    worker_source = str(pdf_source) if isinstance(pdf_source, Path) else pdf_source
+    workers = max_workers or os.cpu_count() or 1
+    ranges = _split_page_ranges(page_count, workers)
+    
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [
+            executor.submit(_extract_page_range_pdfplumber, worker_source, start, end)
+            for start, end in ranges
+        ]
+        # future listesi aralık sırasında; result() ile sırayı koruyarak topla
+        page_texts = []
+        for future in futures:
+            page_texts.extend(future.result())
+    return page_texts
+
+
+def iter_pdf_pages(
+    pdf_path: Source,
+    backend: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None,
+    isolated: bool = False
+) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    PDF sayfalarını çözüldükçe tek tek döndürür.
+    
+    Ofsetler extract_text_from_pdf'in döndüreceği metne göredir; yani
+    text[char_start:char_end] == sayfa metni. Metinsiz sayfalar da
+    char_start == char_end ile döner.
+    
+    Args:
+        pdf_path: PDF dosyasının yolu, içeriği (bytes/memoryview) veya ikili dosya nesnesi
+        backend: Backend adı (verilmezse otomatik seçim, bkz. backends.py)
+        pages: Yalnızca bu sayfalar çözülür (0 tabanlı, örn. range(0, 5));
+               belgede olmayan sayfalar atlanır
+        isolated: Sayfalar ayrı bir worker'da, sayfa başına süre ve bellek
+                  sınırıyla çıkarılır; takılan sayfa daha hafif bir backend'e
+                  düşer (bkz. isolation.py)
+    
+    Yields:
+        (page_no, char_start, char_end, text) - page_no 0 tabanlıdır
+    
+    Raises:
+        FileNotFoundError: PDF dosyası bulunamadı
+        RuntimeError: PDF okunamadı
+    """
+    pdf_source = _resolve_source(pdf_path, "PDF")
+    pages = _normalize_pages(pages)
+    
+    pdf_backend = get_backend(backend)
+    if isolated:
+        page_texts = (text for _, text, _ in iter_pages_isolated(pdf_source, pdf_backend.name, pages))
+    elif pages is None:
+        page_texts = pdf_backend.iter_pages(pdf_source)
+    else:
+        page_texts = pdf_backend.iter_pages(pdf_source, pages)
+    
+    try:
+        if pages is None:
+            yield from _with_offsets(page_texts, PAGE_SEPARATOR)
+            return
+        # Birim sırası -> gerçek sayfa numarası
+        units = _with_offsets(page_texts, PAGE_SEPARATOR)
+        for unit_no, char_start, char_end, text in units:
+            yield pages[unit_no], char_start, char_end, text
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"PDF okuma hatası ({pdf_backend.name}): {e}")
+
+
+def extract_text_from_pdf(
+    pdf_path: Source,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    backend: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None,
+    isolated: bool = False
+) -> str:
     """
     PDF dosyasından metin çıkarır.
     
     Args:
-        pdf_path: PDF dosyasının yolu
+        pdf_path: PDF dosyasının yolu, içeriği (bytes/memoryview) veya ikili dosya nesnesi
+        parallel: True ise sayfa aralıkları process pool'a dağıtılır
+                  (yalnızca pdfplumber ile ve PARALLEL_MIN_PAGES üzeri sayfada)
+        max_workers: Paralel modda en fazla worker sayısı (varsayılan: CPU sayısı)
+        backend: Backend adı (verilmezse otomatik seçim, bkz. backends.py)
+        pages: Yalnızca bu sayfalar çözülür (0 tabanlı, örn. range(0, 5))
+        isolated: Sayfa başına süre/bellek sınırlı izole worker (bkz. isolation.py)
     
     Returns:
         Çıkarılmış metin (string)
@@ -21,116 +304,339 @@ def extract_text_from_pdf(pdf_path: str | Path) -> str:
         FileNotFoundError: PDF dosyası bulunamadı
         RuntimeError: PDF okunamadı
     """
-    pdf_path = Path(pdf_path)
-    
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF dosyası bulunamadı: {pdf_path}")
+    pdf_source = _resolve_source(pdf_path, "PDF")
+    units = _iter_pdf_units(pdf_source, parallel, max_workers, backend, _normalize_pages(pages), isolated)
+    return _join_units(units, PAGE_SEPARATOR)
+
+
+def _iter_pdf_units(
+    pdf_source: Union[Path, bytes],
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    backend: Optional[str] = None,
+    pages: Optional[List[int]] = None,
+    isolated: bool = False
+) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    Seri (akış), paralel ya da izole yoldan ofsetli sayfa birimleri üretir.
     
-    # Önce pdfplumber'ı dene (daha iyi)
-    try:
-        import pdfplumber  # type: ignore
-        text = ""
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
-        return text.strip()
-    
-    except ImportError:
-        # pdfplumber yoksa PyPDF2'yi dene
+    Paralel yol yalnızca pdfplumber ve tüm belge içindir; diğer backend'ler
+    zaten sayfa başına çok daha hızlı, sayfa seçimi ise genelde birkaç sayfa
+    olduğundan seri çalışır. İzole modda paralel yol kullanılmaz.
+    """
+    if parallel and not isolated and pages is None and get_backend(backend).name == "pdfplumber":
         try:
-            import PyPDF2  # type: ignore
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text += page.extract_text() + "\n\n"
-            return text.strip()
-        
-        except ImportError:
-            # Her ikisi de yoksa
-            raise RuntimeError(
-                "PDF okuma için gerekli paketler yüklü değil.\n"
-                "Şu komutu çalıştırın: pip install pdfplumber\n"
-                "veya: pip install PyPDF2"
-            )
+            import pdfplumber  # type: ignore
+            opened = io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else pdf_source
+            with pdfplumber.open(opened) as pdf:
+                page_count = len(pdf.pages)
+            if page_count >= PARALLEL_MIN_PAGES:
+                page_texts = _extract_pages_parallel(pdf_source, page_count, max_workers)
+                return _with_offsets(page_texts, PAGE_SEPARATOR)
         except Exception as e:
-            raise RuntimeError(f"PDF okuma hatası (PyPDF2): {e}")
+            raise RuntimeError(f"PDF okuma hatası (pdfplumber): {e}")
     
-    except Exception as e:
-        raise RuntimeError(f"PDF okuma hatası (pdfplumber): {e}")
+    return iter_pdf_pages(pdf_source, backend, pages, isolated)
+
+
+def iter_docx_paragraphs(docx_path: Source) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    DOCX paragraflarını ve tablo hücrelerini belge sırasıyla döndürür.
+    
+    DOCX'te sayfa kavramı olmadığı için birim paragraftır; tablo hücreleri
+    de ayrı birim olarak gelir. word/document.xml zip içinden artımlı
+    okunur (bkz. docx_stream.py), bellek kullanımı belge boyutundan
+    bağımsızdır. Ofsetler extract_text_from_docx'in döndüreceği metne göredir.
+    
+    Args:
+        docx_path: DOCX dosyasının yolu, içeriği (bytes/memoryview) veya ikili dosya nesnesi
+    
+    Yields:
+        (paragraph_no, char_start, char_end, text) - paragraph_no 0 tabanlıdır
+    """
+    docx_source = _resolve_source(docx_path, "DOCX")
+    if isinstance(docx_source, bytes):
+        docx_source = io.BytesIO(docx_source)
+    
+    try:
+        blocks = (text for _, text in iter_docx_blocks(docx_source))
+        yield from _with_offsets(blocks, PARAGRAPH_SEPARATOR, keep_empty=True)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise RuntimeError(f"DOCX okuma hatası: {e}")
 
 
-def extract_text_from_docx(docx_path: str | Path) -> str:
+def iter_docx_headings(docx_path: Source) -> Iterator[Tuple[int, str, int]]:
+    """
+    DOCX başlıklarını (Heading 1, Heading 2, ... stilleri) belge sırasıyla döndürür.
+    
+    Seviyeler paragraf stilinden ya da outlineLvl'den okunur (bkz.
+    docx_stream.read_heading_styles). Ofsetler extract_text_from_docx'in
+    döndüreceği metne göredir; çıktı doğrudan
+    core.segmentation.segment_from_headings'e verilebilir.
+    
+    Args:
+        docx_path: DOCX dosyasının yolu, içeriği (bytes/memoryview) veya ikili dosya nesnesi
+    
+    Yields:
+        (level, title, char_start) - level 1 tabanlıdır; boş başlıklar atlanır
+    """
+    docx_source = _resolve_source(docx_path, "DOCX")
+    if isinstance(docx_source, bytes):
+        docx_source = io.BytesIO(docx_source)
+    
+    # _with_offsets birimi ancak tükettikten sonra verdiği için seviye önceden kaydedilmiş olur
+    heading_levels = {}
+    
+    def blocks() -> Iterator[str]:
+        for block_no, (_, text, level) in enumerate(iter_docx_blocks_with_levels(docx_source)):
+            if level:
+                heading_levels[block_no] = level
+            yield text
+    
+    try:
+        for block_no, char_start, _, text in _with_offsets(blocks(), PARAGRAPH_SEPARATOR, keep_empty=True):
+            level = heading_levels.pop(block_no, None)
+            if level and text.strip():
+                yield level, " ".join(text.split()), char_start
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise RuntimeError(f"DOCX okuma hatası: {e}")
+
+
+def extract_text_from_docx(docx_path: Source) -> str:
     """
     DOCX dosyasından metin çıkarır.
     
     Args:
-        docx_path: DOCX dosyasının yolu
+        docx_path: DOCX dosyasının yolu, içeriği (bytes/memoryview) veya ikili dosya nesnesi
     
     Returns:
         Çıkarılmış metin (string)
     """
-    docx_path = Path(docx_path)
+    return _join_units(iter_docx_paragraphs(docx_path), PARAGRAPH_SEPARATOR)
+
+
+def extractor_id(suffix: str, backend: Optional[str] = None) -> str:
+    """Dosya tipi için kullanılacak extractor'ın adı ve sürümü (cache anahtarı için)"""
+    if suffix == '.pdf':
+        return get_backend(backend).backend_id()
+    return f"docx-stream-{DOCX_EXTRACTOR_VERSION}"
+
+
+def _ocr_empty_pages(
+    source: Union[Path, bytes],
+    units: List[Tuple[int, int, int, str]],
+    isolated: bool = False
+) -> List[Tuple[int, int, int, str]]:
+    """Metni boş çıkan (taranmış) sayfaları OCR ile doldurur, ofsetleri yeniden hesaplar"""
+    empty_pages = [page_no for page_no, _, _, text in units if not text]
+    ocr_texts = ocr_pages(source, empty_pages, isolated=isolated)
+    if not ocr_texts:
+        return units
+    
+    print(f" {len(ocr_texts)} taranmış sayfa OCR ile okundu")
+    page_numbers = [page_no for page_no, _, _, _ in units]
+    page_texts = [ocr_texts.get(page_no, text) for page_no, _, _, text in units]
+    return [
+        (page_numbers[unit_no], char_start, char_end, text)
+        for unit_no, char_start, char_end, text in _with_offsets(page_texts, PAGE_SEPARATOR)
+    ]
+
+
+def _extract_units(
+    source: Union[Path, bytes],
+    suffix: str,
+    parallel: bool = False,
+    backend: Optional[str] = None,
+    pages: Optional[List[int]] = None,
+    isolated: bool = False,
+    ocr: bool = False
+) -> Tuple[str, List[int]]:
+    """Metni ve birim (sayfa/paragraf) başlangıç ofsetlerini çıkarır"""
+    if suffix == '.pdf':
+        units = list(_iter_pdf_units(source, parallel, backend=backend, pages=pages, isolated=isolated))
+        if ocr:
+            units = _ocr_empty_pages(source, units, isolated)
+        separator = PAGE_SEPARATOR
+    else:
+        units = list(iter_docx_paragraphs(source))
+        separator = PARAGRAPH_SEPARATOR
+    
+    return _join_units(units, separator), [char_start for _, char_start, _, _ in units]
+
+
+def extract_text_with_pages(
+    file_path: Source,
+    parallel: bool = False,
+    use_cache: bool = True,
+    backend: Optional[str] = None,
+    filename: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None,
+    isolated: bool = False,
+    ocr: bool = False
+) -> Tuple[str, List[int]]:
+    """
+    Metni, sayfa başlangıç ofsetleriyle birlikte çıkarır.
+    
+    use_cache=True iken sonuç içeriğin SHA-256 özeti, backend ve extractor
+    sürümüyle anahtarlanarak diskte saklanır (bkz. cache.py); aynı dosya
+    tekrar geldiğinde PDF/DOCX yeniden çözülmez. Anahtar içerikten
+    hesaplandığı için yol ve bytes girdileri aynı kaydı paylaşır.
+    
+    pages verilirse PDF'in yalnızca o sayfaları çözülür (ön kısım skorlaması
+    için örn. range(0, 5)); sayfa seçimi cache anahtarına girer. DOCX ve
+    TXT'de sayfa kavramı olmadığından pages yok sayılır.
+    
+    isolated=True iken PDF sayfaları ayrı bir worker'da, sayfa başına süre
+    ve bellek sınırıyla çıkarılır (bkz. isolation.py). Takılan sayfanın
+    fallback backend'den gelen metni de aynı anahtarla cache'lenir; böylece
+    sorunlu dosya her seferinde yeniden zaman aşımı beklemez.
+    
+    ocr=True iken metni boş çıkan ama görsel içeren (taranmış) PDF sayfaları
+    OCR ile okunur (bkz. ocr.py); OCR motoru kurulu değilse sayfalar boş kalır.
+    Sayfalar 300 DPI render edildiğinden varsayılan kapalıdır; triage belgeyi
+    "ocr"a yönlendirdiğinde açılması beklenir. isolated=True iken OCR da
+    sayfa başına süre/bellek sınırlı worker'da çalışır. OCR motoru cache
+    anahtarına girer.
+    
+    Args:
+        file_path: Dosya yolu, içeriği (bytes/memoryview) veya ikili dosya nesnesi
+        parallel: PDF için paralel sayfa çıkarma
+        use_cache: Extraction cache kullanılsın mı
+        backend: PDF backend adı (verilmezse otomatik seçim, bkz. backends.py)
+        filename: Bellekteki içerik için dosya adı (tip tespiti; verilmezse
+                  içeriğin ilk baytlarına bakılır)
+        pages: PDF'te yalnızca bu sayfalar çözülür (0 tabanlı)
+        isolated: PDF için sayfa başına süre/bellek sınırlı izole worker
+        ocr: PDF'te taranmış sayfalar OCR ile okunsun mu
+    
+    Returns:
+        (metin, page_starts) - page_starts[i], i. sayfanın (DOCX'te paragrafın)
+        metindeki başlangıç ofseti; pages verildiyse i. seçili sayfanınki
+    """
+    source = _resolve_source(file_path)
+    suffix = _source_suffix(source, filename)
+    pages = _normalize_pages(pages) if suffix == '.pdf' else None
+    ocr = ocr and suffix == '.pdf' and ocr_available()
     
-    if not docx_path.exists():
-        raise FileNotFoundError(f"DOCX dosyası bulunamadı: {docx_path}")
+    if suffix == '.txt':
+        return _read_plain_text(source), [0]
+    if suffix not in ('.pdf', '.docx'):
+        raise _unsupported_format(suffix)
     
+    if not use_cache:
+        return _extract_units(source, suffix, parallel, backend, pages, isolated, ocr)
+    
+    cache = ExtractionCache()
+    backend_id = extractor_id(suffix, backend)
+    if ocr:
+        backend_id += "+" + ocr_engine_id()
+    if isinstance(source, Path):
+        content_hash = file_sha256(source)
+        source_name = source.name
+    else:
+        content_hash = bytes_sha256(source)
+        source_name = filename
+    key = cache.make_key(content_hash, backend_id + _pages_tag(pages))
+    
+    cached = cache.get(key)
+    if cached is not None:
+        text, metadata = cached
+        return text, metadata.get("page_starts", [0])
+    
+    text, page_starts = _extract_units(source, suffix, parallel, backend, pages, isolated, ocr)
     try:
-        from docx import Document  # type: ignore
-        doc = Document(docx_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text.strip()
-    
-    except ImportError:
-        raise RuntimeError(
-            "DOCX okuma için python-docx paketi gerekli.\n"
-            "Şu komutu çalıştırın: pip install python-docx"
-        )
-    except Exception as e:
-        raise RuntimeError(f"DOCX okuma hatası: {e}")
+        cache.put(key, text, page_starts, source_name=source_name, backend=backend_id)
+    except OSError:
+        pass  # Cache yazılamıyorsa çıkarma sonucu yine de döner
+    return text, page_starts
 
 
-def extract_text(file_path: str | Path) -> str:
+def extract_text(
+    file_path: Source,
+    parallel: bool = False,
+    use_cache: bool = True,
+    backend: Optional[str] = None,
+    filename: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None,
+    isolated: bool = False,
+    ocr: bool = False
+) -> str:
     """
     Dosya tipine göre otomatik olarak metin çıkarır.
     PDF, DOCX desteklenir.
     
     Args:
-        file_path: Dosya yolu
+        file_path: Dosya yolu, içeriği (bytes/memoryview) veya ikili dosya nesnesi
+        parallel: PDF için paralel sayfa çıkarma (bkz. extract_text_from_pdf)
+        use_cache: Extraction cache kullanılsın mı (bkz. extract_text_with_pages)
+        backend: PDF backend adı (verilmezse otomatik seçim, bkz. backends.py)
+        filename: Bellekteki içerik için dosya adı (tip tespiti)
+        pages: PDF'te yalnızca bu sayfalar çözülür (0 tabanlı, örn. range(0, 5))
+        isolated: PDF için sayfa başına süre/bellek sınırlı izole worker
+        ocr: PDF'te taranmış sayfalar OCR ile okunsun mu (bkz. ocr.py)
     
     Returns:
         Çıkarılmış metin
     """
-    file_path = Path(file_path)
-    suffix = file_path.suffix.lower()
+    text, _ = extract_text_with_pages(
+        file_path,
+        parallel=parallel,
+        use_cache=use_cache,
+        backend=backend,
+        filename=filename,
+        pages=pages,
+        isolated=isolated,
+        ocr=ocr
+    )
+    return text
+
+
+def iter_pages(
+    file_path: Source,
+    filename: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None
+) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    extract_text'in akış (generator) karşılığı.
+    
+    Her birim çözüldüğü anda döner; sonraki aşamalar tüm belge yüklenmeden
+    başlayabilir. PDF'te birim sayfa, DOCX'te paragraf, TXT'de dosyanın
+    tamamıdır. Ofsetler extract_text'in döndüreceği metne göredir.
+    
+    Args:
+        file_path: Dosya yolu, içeriği (bytes/memoryview) veya ikili dosya nesnesi
+        filename: Bellekteki içerik için dosya adı (tip tespiti)
+        pages: PDF'te yalnızca bu sayfalar çözülür (0 tabanlı); DOCX/TXT'de yok sayılır
+    
+    Yields:
+        (page_no, char_start, char_end, text)
+    """
+    source = _resolve_source(file_path)
+    suffix = _source_suffix(source, filename)
     
     if suffix == '.pdf':
-        return extract_text_from_pdf(file_path)
+        yield from iter_pdf_pages(source, pages=pages)
     elif suffix == '.docx':
-        return extract_text_from_docx(file_path)
+        yield from iter_docx_paragraphs(source)
     elif suffix == '.txt':
-        return file_path.read_text(encoding='utf-8')
+        text = _read_plain_text(source)
+        yield 0, 0, len(text), text
     else:
-        raise ValueError(
-            f"Desteklenmeyen dosya formatı: {suffix}\n"
-            "Desteklenen formatlar: .pdf, .docx, .txt"
-        )
+        raise _unsupported_format(suffix)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Kullanım: python pdf_extractor.py <dosya_yolu>")
+    args = [a for a in sys.argv[1:] if a != "--parallel"]
+    if len(args) < 1:
+        print("Kullanım: python pdf_extractor.py <dosya_yolu> [--parallel]")
         print("Örnek: python pdf_extractor.py rapor.pdf")
         sys.exit(1)
     
-    file_path = sys.argv[1]
+    file_path = args[0]
     
     try:
         print(f" Dosya okunuyor: {file_path}")
-        text = extract_text(file_path)
+        text = extract_text(file_path, parallel="--parallel" in sys.argv)
         
         print(f" Metin çıkarıldı!")
         print(f"   Uzunluk: {len(text)} karakter")
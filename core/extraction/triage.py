@@ -0,0 +1,299 @@
+"""
+Pre-flight Triage
+
+Pahalı pipeline'dan (çıkarma, OCR, LLM segmentasyonu) önce belgeyi
+milisaniyeler içinde değerlendirir: boyut, sayfa sayısı, şifreleme, metin
+katmanı ve tahmini token maliyeti.
+
+PDF'te yalnızca dosyanın sonu (trailer, startxref) ve xref'in gösterdiği
+sözlük okunur (trailer bulunamazsa karar belgeyi açmayı deneyen örneklemeye
+kalır); sayfa sayısı sayfa ağacının kökünden (/Count) gelir, içerik
+akışları çözülmez. Metin katmanı birkaç örnek sayfanın karakter sayısıyla
+kontrol edilir (pypdfium2; yoksa PyPDF2 ile yalnızca sayfa sayısı).
+DOCX'te zip merkez dizini okunur; document.xml açılmaz.
+
+Karar (route):
+    pipeline - normal işlenir
+    ocr      - metin katmanı yok ama görsel var; OCR gerekir (bkz. ocr.py)
+    reject   - şifreli, boş, çok büyük ya da token bütçesini aşıyor
+
+Sınırlar (ortam değişkeni):
+    TRIAGE_MAX_BYTES   - varsayılan 50 MB
+    TRIAGE_MAX_PAGES   - varsayılan 200
+    TRIAGE_MAX_TOKENS  - varsayılan 150000 (tahmini LLM girdi token'ı)
+"""
+import io
+import os
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    from .boilerplate import CHARS_PER_TOKEN
+    from .ocr import ocr_available
+except ImportError:
+    # pdf_extractor.py doğrudan script olarak çalıştırıldığında
+    from boilerplate import CHARS_PER_TOKEN
+    from ocr import ocr_available
+
+ROUTE_PIPELINE = "pipeline"
+ROUTE_OCR = "ocr"
+ROUTE_REJECT = "reject"
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_PAGES = 200
+DEFAULT_MAX_TOKENS = 150_000
+
+HEADER_WINDOW = 1024  # %PDF başlığının aranacağı ilk bayt sayısı (okuyucular gibi)
+TAIL_BYTES = 4096  # Trailer ve startxref için okunan son bayt sayısı
+# %%EOF sonrasında uzun kuyruk/çöp varsa startxref bu kadar geriye kadar aranır
+MAX_TAIL_BYTES = 1024 * 1024
+XREF_DICT_BYTES = 2048  # xref stream sözlüğü için startxref'ten okunan bayt
+TEXT_SAMPLE_PAGES = 5  # Metin katmanı için örneklenen sayfa sayısı
+MIN_PAGE_CHARS = 20  # Bundan az karakterli sayfa "metinsiz" sayılır
+
+# document.xml'in (sıkıştırılmamış) ne kadarı düz metin: işaretleme payı
+DOCX_TEXT_RATIO = 0.2
+DOCX_DOCUMENT_PART = "word/document.xml"
+
+
+def _limits() -> Dict[str, int]:
+    return {
+        "max_bytes": int(os.getenv("TRIAGE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        "max_pages": int(os.getenv("TRIAGE_MAX_PAGES", DEFAULT_MAX_PAGES)),
+        "max_tokens": int(os.getenv("TRIAGE_MAX_TOKENS", DEFAULT_MAX_TOKENS)),
+    }
+
+
+def _read_range(source: Union[Path, bytes], start: int, length: int) -> bytes:
+    if isinstance(source, bytes):
+        return source[max(0, start):max(0, start) + length]
+    with open(source, 'rb') as f:
+        f.seek(max(0, start))
+        return f.read(length)
+
+
+def read_pdf_trailer(source: Union[Path, bytes], size: int) -> Dict:
+    """
+    PDF'in son trailer'ını okur (klasik trailer ya da xref stream sözlüğü).
+
+    %PDF başlığı ilk HEADER_WINDOW bayt içinde herhangi bir yerde olabilir;
+    startxref önce son TAIL_BYTES'ta, bulunamazsa MAX_TAIL_BYTES'a kadar
+    genişletilerek aranır.
+
+    Returns:
+        {"valid", "startxref", "encrypted", "xref_stream"} - başlık ya da
+        startxref bulunamazsa valid False
+    """
+    invalid = {"valid": False, "startxref": None, "encrypted": False, "xref_stream": False}
+    if b"%PDF" not in _read_range(source, 0, HEADER_WINDOW):
+        return invalid
+    window = TAIL_BYTES
+    while True:
+        tail = _read_range(source, size - window, window)
+        matches = list(re.finditer(rb"startxref\s+(\d+)", tail))
+        if matches or window >= min(size, MAX_TAIL_BYTES):
+            break
+        window *= 16
+    if not matches:
+        return invalid
+
+    startxref = int(matches[-1].group(1))
+    trailer = tail[:matches[-1].start()]
+    trailer_start = trailer.rfind(b"trailer")
+    xref_stream = trailer_start == -1
+    if xref_stream:
+        # PDF 1.5+: trailer alanları xref stream nesnesinin sözlüğünde
+        trailer = _read_range(source, startxref, XREF_DICT_BYTES)
+        trailer = trailer[:trailer.find(b"stream")] if b"stream" in trailer else trailer
+    else:
+        trailer = trailer[trailer_start:]
+
+    return {
+        "valid": True,
+        "startxref": startxref,
+        "encrypted": re.search(rb"/Encrypt\b", trailer) is not None,
+        "xref_stream": xref_stream
+    }
+
+
+def _sample_pdf(source: Union[Path, bytes]) -> Dict:
+    """
+    Sayfa sayısı ve örnek sayfalarda metin/görsel varlığı.
+
+    pypdfium2 belgeyi açarken yalnızca xref'i ve sayfa ağacını okur; örnek
+    sayfaların metin katmanı (layout analizi yapılmadan) sayılır.
+    """
+    try:
+        import pypdfium2 as pdfium  # type: ignore
+        import pypdfium2.raw as pdfium_c  # type: ignore
+    except ImportError:
+        pdfium = None
+
+    if pdfium is None:
+        import PyPDF2  # type: ignore
+        reader = PyPDF2.PdfReader(io.BytesIO(source) if isinstance(source, bytes) else str(source))
+        if reader.is_encrypted:
+            return {"page_count": None, "open_error": "şifreli"}
+        return {"page_count": len(reader.pages), "sampled_pages": 0, "text_chars": None, "image_pages": None}
+
+    try:
+        pdf = pdfium.PdfDocument(source if isinstance(source, bytes) else str(source))
+    except pdfium.PdfiumError as e:
+        return {"page_count": None, "open_error": str(e)}
+
+    try:
+        page_count = len(pdf)
+        step = max(1, page_count // TEXT_SAMPLE_PAGES)
+        samples = list(range(0, page_count, step))[:TEXT_SAMPLE_PAGES]
+        text_chars, text_pages, image_pages = 0, 0, 0
+        for page_no in samples:
+            page = pdf[page_no]
+            text_page = page.get_textpage()
+            try:
+                chars = text_page.count_chars()
+            finally:
+                text_page.close()
+            text_chars += chars
+            if chars >= MIN_PAGE_CHARS:
+                text_pages += 1
+            elif any(True for _ in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,))):
+                image_pages += 1
+            page.close()
+    finally:
+        pdf.close()
+
+    return {
+        "page_count": page_count,
+        "sampled_pages": len(samples),
+        "text_pages": text_pages,
+        "text_chars": text_chars,
+        "image_pages": image_pages
+    }
+
+
+def _triage_pdf(source: Union[Path, bytes], report: Dict, limits: Dict[str, int]) -> None:
+    trailer = read_pdf_trailer(source, report["size_bytes"])
+    if trailer["valid"]:
+        report["encrypted"] = trailer["encrypted"]
+
+    # Trailer okunamasa da karar belgeyi açmayı deneyen örneklemeye kalır:
+    # okuyucular xref'i onarabildiği için ucuz kontrol tek başına reddetmez
+    try:
+        sample = _sample_pdf(source)
+    except Exception as e:
+        sample = {"page_count": None, "open_error": str(e)}
+    report["page_count"] = sample.get("page_count")
+    if sample.get("open_error"):
+        if trailer["encrypted"]:
+            reason = "şifreli (parola gerekiyor)"
+        elif not trailer["valid"]:
+            reason = "PDF açılamadı, trailer/startxref bulunamadı (bozuk ya da yarım dosya)"
+        else:
+            reason = "PDF açılamadı"
+        report["reasons"].append(f"{reason}: {sample['open_error']}")
+        return
+
+    page_count = report["page_count"] or 0
+    if page_count == 0:
+        report["reasons"].append("sayfa yok")
+        return
+    if page_count > limits["max_pages"]:
+        report["reasons"].append(f"{page_count} sayfa > {limits['max_pages']}")
+
+    if sample.get("text_chars") is None:
+        return  # pypdfium2 yok: metin katmanı ve token bilinmiyor
+    chars_per_page = sample["text_chars"] / max(1, sample["sampled_pages"])
+    report["has_text_layer"] = sample["text_pages"] > 0
+    report["estimated_tokens"] = int(chars_per_page * page_count / CHARS_PER_TOKEN)
+    if report["estimated_tokens"] > limits["max_tokens"]:
+        report["reasons"].append(f"~{report['estimated_tokens']:,} token > {limits['max_tokens']:,}")
+
+    if not report["has_text_layer"]:
+        if sample["image_pages"] and ocr_available():
+            report["route"] = ROUTE_OCR
+        elif sample["image_pages"]:
+            report["reasons"].append("metin katmanı yok (taranmış) ve OCR kurulu değil")
+        else:
+            report["reasons"].append("metin katmanı ve görsel yok (boş belge)")
+
+
+def _triage_docx(source: Union[Path, bytes], report: Dict, limits: Dict[str, int]) -> None:
+    try:
+        with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as archive:
+            info = archive.getinfo(DOCX_DOCUMENT_PART)
+            report["encrypted"] = bool(info.flag_bits & 0x1)
+    except (zipfile.BadZipFile, KeyError) as e:
+        # Parolalı Office belgeleri zip değil, OLE kapsayıcısıdır
+        if _read_range(source, 0, 4) == b"\xd0\xcf\x11\xe0":
+            report["encrypted"] = True
+            report["reasons"].append("şifreli (parola korumalı Office belgesi)")
+        else:
+            report["reasons"].append(f"DOCX okunamadı: {e}")
+        return
+
+    estimated_chars = info.file_size * DOCX_TEXT_RATIO
+    report["has_text_layer"] = estimated_chars >= MIN_PAGE_CHARS
+    report["estimated_tokens"] = int(estimated_chars / CHARS_PER_TOKEN)
+    if not report["has_text_layer"]:
+        report["reasons"].append("belge boş")
+    elif report["estimated_tokens"] > limits["max_tokens"]:
+        report["reasons"].append(f"~{report['estimated_tokens']:,} token > {limits['max_tokens']:,}")
+
+
+def triage_document(file_path: Union[str, Path, bytes], filename: Optional[str] = None) -> Dict:
+    """
+    Belgeyi pahalı pipeline'dan önce hızlıca değerlendirir.
+
+    Args:
+        file_path: Dosya yolu veya içeriği
+        filename: Bellekteki içerik için dosya adı (tip tespiti)
+
+    Returns:
+        {
+            "route": "pipeline" | "ocr" | "reject",
+            "reasons": [ret nedenleri],
+            "suffix", "size_bytes", "page_count", "encrypted",
+            "has_text_layer", "estimated_tokens"
+        }
+        Bilinmeyen alanlar None'dır.
+    """
+    source = Path(file_path) if isinstance(file_path, str) else file_path
+    if isinstance(source, Path):
+        size = source.stat().st_size
+        suffix = source.suffix.lower()
+    else:
+        source = bytes(source)
+        size = len(source)
+        suffix = Path(filename).suffix.lower() if filename else ""
+        if not suffix:
+            head = source[:HEADER_WINDOW]
+            suffix = '.pdf' if b"%PDF" in head else '.docx' if head.startswith(b"PK\x03\x04") else ""
+
+    limits = _limits()
+    report = {
+        "route": ROUTE_PIPELINE,
+        "reasons": [],
+        "suffix": suffix,
+        "size_bytes": size,
+        "page_count": None,
+        "encrypted": None,
+        "has_text_layer": None,
+        "estimated_tokens": None
+    }
+
+    if size == 0:
+        report["reasons"].append("dosya boş")
+    elif size > limits["max_bytes"]:
+        report["reasons"].append(f"{size / (1024 * 1024):.1f} MB > {limits['max_bytes'] / (1024 * 1024):.0f} MB")
+    elif suffix == '.pdf':
+        _triage_pdf(source, report, limits)
+    elif suffix == '.docx':
+        _triage_docx(source, report, limits)
+    elif suffix != '.txt':
+        report["reasons"].append(f"desteklenmeyen format: {suffix or 'bilinmiyor'}")
+
+    if report["reasons"]:
+        report["route"] = ROUTE_REJECT
+    return report
@@ -0,0 +1,16 @@
+"""
+LLM Module
+
+Segmentasyon ve puanlamanın ortak kullandığı Gemini altyapısı.
+"""
+from .rate_limiter import RateLimiter, get_rate_limiter, estimate_prompt_tokens
+from .response_cache import ResponseCache, get_response_cache, response_cache_key
+
+__all__ = [
+    'RateLimiter',
+    'get_rate_limiter',
+    'estimate_prompt_tokens',
+    'ResponseCache',
+    'get_response_cache',
+    'response_cache_key'
+]
@@ -0,0 +1,242 @@
+"""
+Rate Limiter
+
+Gemini kotasını (istek/dakika ve token/dakika) thread'ler ve process'ler
+arasında paylaşılan bir token bucket ile uygular.
+
+Kova durumu küçük bir JSON dosyasındadır ve dosya kilidiyle (POSIX'te
+fcntl.flock, Windows'ta msvcrt.locking) güncellenir; aynı makinedeki tüm
+batch worker'ları aynı bütçeden harcar. İstek öncesi acquire() bütçe
+yetene kadar bekler; 429 alınırsa backoff() tüm process'leri ortak bir
+"blocked_until" zamanına kadar durdurur ve jitter'lı üstel bekleme süresi
+döndürür. Böylece paralel çalıştırmalar 429 fırtınası ile boşta bekleme
+arasında gidip gelmez.
+
+Varsayılan olarak sınır yoktur (limiter kapalı); anahtarın kotası
+ortam değişkenleriyle verilir (örn. ücretsiz katman için GEMINI_RPM=15,
+GEMINI_TPM=1000000). Limiter kapalıyken backoff() yalnızca çağıranı
+bekletir; ortak "blocked_until" acquire() tarafından okunmaz.
+
+Ayarlar (ortam değişkeni):
+    GEMINI_RPM        - istek/dakika (varsayılan 0 = sınırsız)
+    GEMINI_TPM        - girdi token'ı/dakika (varsayılan 0 = sınırsız)
+    RATE_LIMIT_DIR    - kova dosyalarının klasörü (varsayılan outputs/rate_limits)
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_STATE_DIR = PROJECT_ROOT / "outputs" / "rate_limits"
+
+# 0 = sınırsız; kota anahtara göre değiştiğinden operatör ayarlar
+DEFAULT_RPM = 0
+DEFAULT_TPM = 0
+
+CHARS_PER_TOKEN = 4
+
+# 429 sonrası bekleme: min(BACKOFF_CAP, BACKOFF_BASE * 2^attempt), "full jitter"
+BACKOFF_BASE = 2.0
+BACKOFF_CAP = 60.0
+
+# Bütçe beklerken en fazla bu kadar uyunur (diğer process'lerin güncellemesini görmek için)
+MAX_POLL_SECONDS = 5.0
+
+
+def estimate_prompt_tokens(prompt: str) -> int:
+    """Prompt'un kaba token tahmini (~4 karakter/token)"""
+    return (len(prompt or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class _FileLock:
+    """Process'ler arası özel kilit (kova dosyasının kendisi üzerinde)"""
+
+    def __init__(self, handle):
+        self.handle = handle
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+        else:
+            self.handle.seek(0)
+            msvcrt.locking(self.handle.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        else:
+            self.handle.seek(0)
+            msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class RateLimiter:
+    """İstek/dakika ve token/dakika için paylaşılan token bucket"""
+
+    def __init__(
+        self,
+        name: str = "gemini",
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        state_dir: str | Path = None
+    ):
+        self.requests_per_minute = int(
+            requests_per_minute if requests_per_minute is not None else os.getenv("GEMINI_RPM", DEFAULT_RPM)
+        )
+        self.tokens_per_minute = int(
+            tokens_per_minute if tokens_per_minute is not None else os.getenv("GEMINI_TPM", DEFAULT_TPM)
+        )
+        state_dir = Path(state_dir or os.getenv("RATE_LIMIT_DIR") or DEFAULT_STATE_DIR)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = state_dir / f"{name}.json"
+        self._thread_lock = threading.Lock()
+
+    def _refill(self, state: Dict, now: float) -> Dict:
+        """Son güncellemeden bu yana dolan bütçeyi ekler (kapasite = dakikalık bütçe)"""
+        if not state or state.get("rpm") != self.requests_per_minute or state.get("tpm") != self.tokens_per_minute:
+            # İlk kullanım ya da sınırlar değişmiş: kova dolu başlar
+            return {
+                "rpm": self.requests_per_minute,
+                "tpm": self.tokens_per_minute,
+                "requests": float(self.requests_per_minute),
+                "tokens": float(self.tokens_per_minute),
+                "updated": now,
+                "blocked_until": state.get("blocked_until", 0.0) if state else 0.0
+            }
+        elapsed = max(0.0, now - state["updated"])
+        state["requests"] = min(self.requests_per_minute, state["requests"] + elapsed * self.requests_per_minute / 60)
+        state["tokens"] = min(self.tokens_per_minute, state["tokens"] + elapsed * self.tokens_per_minute / 60)
+        state["updated"] = now
+        return state
+
+    def _update(self, change) -> float:
+        """
+        Kova durumunu kilit altında okuyup change(state, now) ile günceller.
+
+        Returns:
+            change'in döndürdüğü bekleme süresi (saniye)
+        """
+        with self._thread_lock, open(self.state_path, 'a+', encoding='utf-8') as handle, _FileLock(handle):
+            handle.seek(0)
+            try:
+                state = json.loads(handle.read() or "{}")
+            except ValueError:
+                state = {}
+            now = time.time()
+            state = self._refill(state, now)
+            wait = change(state, now)
+            handle.seek(0)
+            handle.truncate()
+            handle.write(json.dumps(state))
+            handle.flush()
+        return wait
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Bütçe yetiyorsa harcar ve 0 döner; yetmiyorsa beklenecek süreyi döner"""
+        def change(state: Dict, now: float) -> float:
+            if state["blocked_until"] > now:
+                return state["blocked_until"] - now
+            need_requests = 1 if self.requests_per_minute > 0 else 0
+            need_tokens = min(tokens, self.tokens_per_minute) if self.tokens_per_minute > 0 else 0
+            waits = []
+            if state["requests"] < need_requests:
+                waits.append((need_requests - state["requests"]) * 60 / self.requests_per_minute)
+            if state["tokens"] < need_tokens:
+                waits.append((need_tokens - state["tokens"]) * 60 / self.tokens_per_minute)
+            if waits:
+                return max(waits)
+            state["requests"] -= need_requests
+            state["tokens"] -= need_tokens
+            return 0.0
+
+        return self._update(change)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        İstek ve token bütçesi açılana kadar bekler, sonra harcar.
+
+        Args:
+            tokens: İsteğin tahmini girdi token'ı (estimate_prompt_tokens)
+
+        Returns:
+            Toplam bekleme süresi (saniye)
+        """
+        if self.requests_per_minute <= 0 and self.tokens_per_minute <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return waited
+            # Küçük jitter: aynı anda uyanan worker'lar kilitte yığılmasın
+            wait = min(wait, MAX_POLL_SECONDS) + random.uniform(0, 0.1)
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """
+        acquire'ın event loop'u bloklamayan sürümü.
+
+        Dosya kilidi ve kova dosyası I/O'su thread'de yapılır; kilit
+        çekişmesinde diğer coroutine'ler beklemez.
+        """
+        if self.requests_per_minute <= 0 and self.tokens_per_minute <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self._try_acquire, tokens)
+            if wait <= 0:
+                return waited
+            wait = min(wait, MAX_POLL_SECONDS) + random.uniform(0, 0.1)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def backoff(self, attempt: int) -> float:
+        """
+        429 sonrası tüm process'ler için ortak bekleme.
+
+        Jitter'lı üstel süre hesaplanır, kovadaki "blocked_until" ileri
+        alınır ve istek bütçesi boşaltılır; sonraki acquire() çağrıları
+        (diğer process'lerde de) bu süre dolana kadar bekler.
+
+        Args:
+            attempt: 0'dan başlayan deneme sayısı
+
+        Returns:
+            Çağıranın uyuması gereken süre (saniye)
+        """
+        delay = random.uniform(BACKOFF_BASE, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt + 1)))
+
+        def change(state: Dict, now: float) -> float:
+            state["blocked_until"] = max(state["blocked_until"], now + delay)
+            state["requests"] = 0.0
+            return state["blocked_until"] - now
+
+        return self._update(change)
+
+    async def backoff_async(self, attempt: int) -> float:
+        """backoff'un event loop'u bloklamayan sürümü (kilit ve I/O thread'de)"""
+        return await asyncio.to_thread(self.backoff, attempt)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str = "gemini") -> RateLimiter:
+    """Process içinde paylaşılan limiter (kova dosyası process'ler arasında ortak)"""
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = RateLimiter(name)
+        return _limiters[name]
@@ -0,0 +1,215 @@
+"""
+LLM Response Cache
+
+Aynı model, aynı generation_config ve aynı prompt ile yapılan çağrıların
+yanıtını SQLite'ta saklar. Aynı rapor yeniden işlendiğinde (çöken bir batch
+tekrar başlatıldığında, yalnızca puanlama değiştiğinde) segmentasyon
+istekleri Gemini'ye gitmez.
+
+Anahtar: SHA-256(model adı + sıralı generation_config JSON'u + prompt).
+Yalnızca çağıranın doğruladığı (parse edilebilen) yanıtlar saklanır; bozuk
+bir yanıt tekrar denemelerde geri dönmez.
+
+Eviction: LLM_CACHE_MAX_AGE_DAYS'ten uzun süredir kullanılmayan kayıtlar
+silinir; toplam boyut LLM_CACHE_MAX_BYTES'ı aşarsa en uzun süredir
+kullanılmayanlar (LRU) silinir.
+
+Ayarlar (ortam değişkeni):
+    LLM_CACHE_PATH          - varsayılan data/processed/llm_cache.sqlite3
+    LLM_CACHE_MAX_BYTES     - varsayılan 256 MB
+    LLM_CACHE_MAX_AGE_DAYS  - varsayılan 30
+    LLM_CACHE_DISABLED=1    - cache'i kapatır
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "data" / "processed" / "llm_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Her bu kadar yazmada bir eviction çalışır
+EVICT_EVERY = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used);
+"""
+
+
+def response_cache_key(model_name: str, generation_config: Dict, prompt: str) -> str:
+    """Model + generation_config + prompt özeti"""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(json.dumps(generation_config or {}, sort_keys=True).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite tabanlı LLM yanıt cache'i (thread ve process güvenli)"""
+
+    def __init__(
+        self,
+        cache_path: str | Path = None,
+        max_bytes: Optional[int] = None,
+        max_age_days: Optional[float] = None
+    ):
+        self.cache_path = Path(cache_path or os.getenv("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.max_bytes = int(max_bytes if max_bytes is not None else os.getenv("LLM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.max_age_days = float(
+            max_age_days if max_age_days is not None else os.getenv("LLM_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)
+        )
+        self.enabled = os.getenv("LLM_CACHE_DISABLED", "") not in ("1", "true", "yes")
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        if self.enabled:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connection() as conn:
+                conn.executescript(SCHEMA)
+            self.evict()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Thread başına bir bağlantı (sqlite3 bağlantıları thread'ler arası paylaşılmaz)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.cache_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Yanıtı döndürür ve kullanım zamanını günceller; yoksa None"""
+        if not self.enabled:
+            return None
+        with self._connection() as conn:
+            row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return row[0] if row is not None else None
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """get'in event loop'u bloklamayan sürümü (SQLite okuması thread'de)"""
+        return await asyncio.to_thread(self.get, key)
+
+    def put(
+        self,
+        key: str,
+        model_name: str,
+        response: str,
+        validate: Optional[Callable[[str], object]] = None
+    ) -> bool:
+        """
+        Yanıtı saklar.
+
+        Args:
+            validate: Verilirse yanıtla çağrılır; hata fırlatırsa yanıt saklanmaz
+
+        Returns:
+            Saklandıysa True
+        """
+        if not self.enabled or not response:
+            return False
+        if validate is not None:
+            try:
+                validate(response)
+            except Exception:
+                return False
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, response, size, now, now)
+            )
+        with self._stats_lock:
+            self._puts += 1
+            evict = self._puts % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+        return True
+
+    async def put_async(
+        self,
+        key: str,
+        model_name: str,
+        response: str,
+        validate: Optional[Callable[[str], object]] = None
+    ) -> bool:
+        """put'un event loop'u bloklamayan sürümü (SQLite yazması thread'de)"""
+        return await asyncio.to_thread(self.put, key, model_name, response, validate)
+
+    def evict(self) -> int:
+        """
+        Eski kayıtları ve boyut sınırını aşan LRU kayıtlarını siler.
+
+        Returns:
+            Silinen kayıt sayısı
+        """
+        if not self.enabled:
+            return 0
+        removed = 0
+        with self._connection() as conn:
+            if self.max_age_days > 0:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += conn.execute("DELETE FROM responses WHERE last_used < ?", (cutoff,)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                # En eski kullanılandan başlayarak sınırın altına inene kadar sil
+                doomed = []
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                removed += len(doomed)
+        return removed
+
+    def stats(self) -> Dict:
+        """Bu process'teki isabet/ıskalama sayıları ve cache boyutu"""
+        entries, size = 0, 0
+        if self.enabled:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "size_bytes": size}
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process içinde paylaşılan yanıt cache'i"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
@@ -8,8 +8,11 @@ from .segment_scoring import (
     find_executive_summary_segment,
     score_cover_segment,
     score_executive_summary,
+    score_cover_segment_async,
+    score_executive_summary_async,
     load_cover_prompt,
-    load_executive_prompt
+    load_executive_prompt,
+    scoring_fingerprint
 )
 
 __all__ = [
@@ -17,7 +20,10 @@ __all__ = [
     'find_executive_summary_segment',
     'score_cover_segment',
     'score_executive_summary',
+    'score_cover_segment_async',
+    'score_executive_summary_async',
     'load_cover_prompt',
-    'load_executive_prompt'
+    'load_executive_prompt',
+    'scoring_fingerprint'
 ]
 
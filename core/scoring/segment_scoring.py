@@ -4,8 +4,10 @@ Cover ve Executive Summary segmentleri için LLM tabanlı puanlama sistemi.
 Rubrik kriterlerine göre puanlama yapar.
 """
 
+import asyncio
 import os
 import json
+import time
 import csv
 import math
 from pathlib import Path
@@ -13,7 +15,16 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import google.generativeai as genai
 
+try:
+    from ..llm import estimate_prompt_tokens, get_rate_limiter, get_response_cache, response_cache_key
+except ImportError:
+    from core.llm import estimate_prompt_tokens, get_rate_limiter, get_response_cache, response_cache_key
+
 MODEL_NAME = "gemini-2.0-flash"
+GENERATION_CONFIG = {
+    "temperature": 0.3,
+    "response_mime_type": "application/json"
+}
 
 
 def load_cover_prompt() -> str:
@@ -38,6 +49,17 @@ def load_executive_prompt() -> str:
     return prompt_path.read_text(encoding="utf-8")
 
 
+def scoring_fingerprint(prompt_template: str) -> str:
+    """
+    Puanlama ayarlarının özeti: prompt şablonu + MODEL_NAME + GENERATION_CONFIG.
+
+    Saklanan bir skor (bkz. core/dedup) yalnızca aynı fingerprint'le
+    üretildiyse yeniden kullanılır; prompt, model ya da generation config
+    değişince eski skorlar geçersiz olur.
+    """
+    return response_cache_key(MODEL_NAME, GENERATION_CONFIG, prompt_template)
+
+
 def find_cover_segment(segmentation_json: Dict) -> Optional[Dict]:
     """
     Segmentasyon JSON'dan cover segmentini bul.
@@ -116,38 +138,74 @@ def find_executive_summary_segment(segmentation_json: Dict) -> Optional[Dict]:
     return None
 
 
-def _call_llm_for_scoring(prompt_template: str, segment: Dict, api_key: str = None) -> Dict:
-    """
-    LLM'i çağırarak segment puanlaması yap (ortak fonksiyon).
-    
-    Args:
-        prompt_template: Prompt şablonu
-        segment: Segment dict'i
-        api_key: Gemini API key (opsiyonel)
-        
-    Returns:
-        Puanlama sonucu dict'i
-    """
+def _scoring_model(api_key: str = None):
+    """Puanlama için yapılandırılmış Gemini modeli"""
     api_key = api_key or os.getenv("GEMINI_API_KEY", "")
     if not api_key:
         raise RuntimeError("GEMINI_API_KEY is not set")
     
     genai.configure(api_key=api_key)
     
-    model = genai.GenerativeModel(
+    return genai.GenerativeModel(
         MODEL_NAME,
-        generation_config={
-            "temperature": 0.3,
-            "response_mime_type": "application/json"
-        },
+        generation_config=GENERATION_CONFIG,
         safety_settings={}
     )
-    
-    # Prompt'u formatla
-    prompt = prompt_template.format(
+
+
+def _scoring_prompt(prompt_template: str, segment: Dict) -> str:
+    return prompt_template.format(
         SECTION_NAME=segment.get("section_name", ""),
         CONTENT=segment.get("content", "")
     )
+
+
+def _parse_scoring_output(output_text: str) -> Dict:
+    """Puanlama çıktısını JSON'a çevir (markdown bloğu temizlenir)"""
+    if "```json" in output_text:
+        start = output_text.find("```json") + 7
+        end = output_text.find("```", start)
+        if end != -1:
+            output_text = output_text[start:end].strip()
+    elif "```" in output_text:
+        start = output_text.find("```") + 3
+        end = output_text.find("```", start)
+        if end != -1:
+            output_text = output_text[start:end].strip()
+    
+    result = json.loads(output_text)
+    
+    # En azından score alanı olmalı
+    if "score" not in result:
+        raise ValueError("LLM çıktısında 'score' alanı bulunamadı")
+    
+    return result
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    return "429" in str(error) or "Resource exhausted" in str(error)
+
+
+def _cached_response(prompt: str) -> Tuple[str, Optional[str]]:
+    """Prompt'un cache anahtarı ve (varsa) cache'lenmiş yanıtı"""
+    key = response_cache_key(MODEL_NAME, GENERATION_CONFIG, prompt)
+    return key, get_response_cache().get(key)
+
+
+def _call_llm_for_scoring(prompt_template: str, segment: Dict, api_key: str = None) -> Dict:
+    """
+    LLM'i çağırarak segment puanlaması yap (ortak fonksiyon).
+    
+    Args:
+        prompt_template: Prompt şablonu
+        segment: Segment dict'i
+        api_key: Gemini API key (opsiyonel)
+        
+    Returns:
+        Puanlama sonucu dict'i
+    """
+    model = _scoring_model(api_key)
+    prompt = _scoring_prompt(prompt_template, segment)
     
     # LLM'den puanlama al
     max_retries = 3
@@ -155,43 +213,25 @@ def _call_llm_for_scoring(prompt_template: str, segment: Dict, api_key: str = No
     
     for attempt in range(max_retries):
         try:
+            key, output_text = _cached_response(prompt)
+            if output_text is not None:
+                return _parse_scoring_output(output_text)
+            get_rate_limiter().acquire(estimate_prompt_tokens(prompt))
             resp = model.generate_content(prompt)
             output_text = _extract_text(resp).strip()
-            
-            # JSON temizleme
-            if "```json" in output_text:
-                start = output_text.find("```json") + 7
-                end = output_text.find("```", start)
-                if end != -1:
-                    output_text = output_text[start:end].strip()
-            elif "```" in output_text:
-                start = output_text.find("```") + 3
-                end = output_text.find("```", start)
-                if end != -1:
-                    output_text = output_text[start:end].strip()
-            
-            # JSON parse
-            result = json.loads(output_text)
-            
-            # En azından score alanı olmalı
-            if "score" not in result:
-                raise ValueError("LLM çıktısında 'score' alanı bulunamadı")
-            
+            result = _parse_scoring_output(output_text)
+            get_response_cache().put(key, MODEL_NAME, output_text)
             return result
-            
         except json.JSONDecodeError as e:
             if attempt < max_retries - 1:
-                import time
                 time.sleep(retry_delay)
                 continue
             raise RuntimeError(f"JSON parse hatası: {e}\nÇıktı: {output_text[:500]}")
         except Exception as e:
-            error_str = str(e)
-            if "429" in error_str or "Resource exhausted" in error_str:
+            if _is_rate_limit(e):
                 if attempt < max_retries - 1:
-                    import time
-                    wait_time = retry_delay * (attempt + 1)
-                    print(f"⚠️  Rate limit hatası. {wait_time} saniye bekleniyor...")
+                    wait_time = get_rate_limiter().backoff(attempt)
+                    print(f"⚠️  Rate limit hatası. {wait_time:.1f} saniye bekleniyor...")
                     time.sleep(wait_time)
                     continue
                 else:
@@ -201,29 +241,47 @@ def _call_llm_for_scoring(prompt_template: str, segment: Dict, api_key: str = No
     raise RuntimeError("LLM'den geçerli çıktı alınamadı.")
 
 
-def score_cover_segment(segment: Dict, api_key: str = None) -> Dict:
-    """
-    Cover segmentini rubrik kriterlerine göre puanla.
+async def _call_llm_for_scoring_async(prompt_template: str, segment: Dict, api_key: str = None) -> Dict:
+    """_call_llm_for_scoring'in asyncio sürümü (Gemini async istemcisi)"""
+    model = _scoring_model(api_key)
+    prompt = _scoring_prompt(prompt_template, segment)
     
-    Args:
-        segment: Segment dict'i (section_id, section_name, content, vb.)
-        api_key: Gemini API key (opsiyonel, env'den alınır)
-        
-    Returns:
-        {
-            "score": int,  # Toplam puan (0-5, küsürat aşağı yuvarlanır)
-            "feedback": str,  # Detaylı geri bildirim
-            "criteria": {
-                "title_accuracy": int,  # Başlık doğruluğu (0-5)
-                "format": int,          # Biçim (0-5)
-                "completeness": int,    # Bilgi tamlığı (0-5)
-                "date_name_presence": int  # Tarih/isim varlığı (0-5)
-            }
-        }
-    """
-    prompt_template = load_cover_prompt()
-    raw_result = _call_llm_for_scoring(prompt_template, segment, api_key)
+    max_retries = 3
+    retry_delay = 5
     
+    for attempt in range(max_retries):
+        try:
+            key = response_cache_key(MODEL_NAME, GENERATION_CONFIG, prompt)
+            output_text = await get_response_cache().get_async(key)
+            if output_text is not None:
+                return _parse_scoring_output(output_text)
+            await get_rate_limiter().acquire_async(estimate_prompt_tokens(prompt))
+            resp = await model.generate_content_async(prompt)
+            output_text = _extract_text(resp).strip()
+            result = _parse_scoring_output(output_text)
+            await get_response_cache().put_async(key, MODEL_NAME, output_text)
+            return result
+        except json.JSONDecodeError as e:
+            if attempt < max_retries - 1:
+                await asyncio.sleep(retry_delay)
+                continue
+            raise RuntimeError(f"JSON parse hatası: {e}\nÇıktı: {output_text[:500]}")
+        except Exception as e:
+            if _is_rate_limit(e):
+                if attempt < max_retries - 1:
+                    wait_time = await get_rate_limiter().backoff_async(attempt)
+                    print(f"⚠️  Rate limit hatası. {wait_time:.1f} saniye bekleniyor...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    raise RuntimeError("API rate limit aşıldı. Lütfen birkaç dakika bekleyip tekrar deneyin.")
+            raise
+    
+    raise RuntimeError("LLM'den geçerli çıktı alınamadı.")
+
+
+def _cover_result(raw_result: Dict) -> Dict:
+    """Ham cover puanını (0-10) 5 üzerinden sisteme çevir"""
     # Cover scoring 0-10 üzerinden geliyor, 5 üzerinden sisteme çevir (küsürat aşağı yuvarlanır)
     score_0_10 = float(raw_result.get("score", 0.0))
     score_0_5 = math.floor(score_0_10 / 2.0)
@@ -250,6 +308,58 @@ def score_cover_segment(segment: Dict, api_key: str = None) -> Dict:
     return result
 
 
+def _executive_result(raw_result: Dict) -> Dict:
+    """Ham rubrik puanını (0-100) 5 üzerinden sisteme çevir"""
+    rubric_score = int(raw_result.get("score", 0))
+    # Rubrik puanını (0-100) 5 üzerinden puanlama sistemine çevir
+    # 0→0, 20→1, 40→2, 60→3, 80→4, 100→5
+    score_0_5 = rubric_score // 20
+    rationale = raw_result.get("rationale", "")
+    fine = raw_result.get("fine", {})
+    evidence_specificity = raw_result.get("evidence_specificity")
+    
+    result = {
+        "score": score_0_5,
+        "rubric_score": rubric_score,
+        "rationale": rationale,
+        "fine": fine,
+        "evidence_specificity": evidence_specificity,
+        "feedback": rationale,
+        "criteria": {
+            "executive_summary_b1": score_0_5
+        }
+    }
+    return result
+
+
+def score_cover_segment(segment: Dict, api_key: str = None) -> Dict:
+    """
+    Cover segmentini rubrik kriterlerine göre puanla.
+    
+    Args:
+        segment: Segment dict'i (section_id, section_name, content, vb.)
+        api_key: Gemini API key (opsiyonel, env'den alınır)
+        
+    Returns:
+        {
+            "score": int,  # Toplam puan (0-5, küsürat aşağı yuvarlanır)
+            "feedback": str,  # Detaylı geri bildirim
+            "criteria": {
+                "title_accuracy": int,  # Başlık doğruluğu (0-5)
+                "format": int,          # Biçim (0-5)
+                "completeness": int,    # Bilgi tamlığı (0-5)
+                "date_name_presence": int  # Tarih/isim varlığı (0-5)
+            }
+        }
+    """
+    return _cover_result(_call_llm_for_scoring(load_cover_prompt(), segment, api_key))
+
+
+async def score_cover_segment_async(segment: Dict, api_key: str = None) -> Dict:
+    """score_cover_segment'in asyncio sürümü"""
+    return _cover_result(await _call_llm_for_scoring_async(load_cover_prompt(), segment, api_key))
+
+
 def score_executive_summary(segment: Dict, api_key: str = None) -> Dict:
     """
     Executive Summary segmentini rubrik kriterlerine göre puanla.
@@ -270,29 +380,17 @@ def score_executive_summary(segment: Dict, api_key: str = None) -> Dict:
             }
         }
     """
-    prompt_template = load_executive_prompt()
-    raw_result = _call_llm_for_scoring(prompt_template, segment, api_key)
-    
-    rubric_score = int(raw_result.get("score", 0))
-    # Rubrik puanını (0-100) 5 üzerinden puanlama sistemine çevir
-    # 0→0, 20→1, 40→2, 60→3, 80→4, 100→5
-    score_0_5 = rubric_score // 20
-    rationale = raw_result.get("rationale", "")
-    fine = raw_result.get("fine", {})
-    evidence_specificity = raw_result.get("evidence_specificity")
+    return _executive_result(_call_llm_for_scoring(load_executive_prompt(), segment, api_key))
+
+
+async def score_executive_summary_async(segment: Dict, api_key: str = None) -> Dict:
+    """
+    score_executive_summary'nin asyncio sürümü.
     
-    result = {
-        "score": score_0_5,
-        "rubric_score": rubric_score,
-        "rationale": rationale,
-        "fine": fine,
-        "evidence_specificity": evidence_specificity,
-        "feedback": rationale,
-        "criteria": {
-            "executive_summary_b1": score_0_5
-        }
-    }
-    return result
+    Yüzlerce puanlama isteği tek event loop'ta asyncio.gather ile
+    bekletilebilir; yeniden denemeler asyncio.sleep ile yapılır.
+    """
+    return _executive_result(await _call_llm_for_scoring_async(load_executive_prompt(), segment, api_key))
 
 
 # Geriye dönük uyumluluk için eski fonksiyon adları
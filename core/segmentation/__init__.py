@@ -3,8 +3,9 @@ Segmentation Module
 
 Raporları rubrik bölümlerine ayırır.
 """
-from .segmenter import segment_text_chunked
+from .segmenter import segment_text_chunked, segment_text_chunked_async, chunk_strategy
 from .fix_segmentation import fix_segmentation
+from .outline_segmenter import segment_from_headings, segment_from_outline, segment_from_reference
 
-__all__ = ['segment_text_chunked', 'fix_segmentation']
+__all__ = ['segment_text_chunked', 'segment_text_chunked_async', 'chunk_strategy', 'fix_segmentation', 'segment_from_outline', 'segment_from_headings', 'segment_from_reference']
 
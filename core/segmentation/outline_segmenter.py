@@ -0,0 +1,322 @@
+"""
+Outline tabanlı segmentasyon (hızlı yol)
+
+Word'den dışa aktarılan raporlardaki PDF outline'ı (yer imleri) başlıkların
+tam metnini ve sayfasını verir. Her başlık, sayfa indeksiyle daraltılmış
+pencerede çıkarılmış metne hizalanır ve segment_text_chunked ile aynı
+`segmentation.sections` şeması üretilir.
+
+DOCX raporlarda aynı yapı paragraf stillerinden (Heading 1, Heading 2, ...)
+gelir ve başlık ofsetleri zaten kesindir (segment_from_headings).
+
+Neredeyse aynı bir gönderim daha önce segment edildiyse onun bölümleri yeni
+metne hizalanır (segment_from_reference, bkz. core/dedup).
+
+Outline istenen rubrik kriterlerini kapsıyorsa Gemini çağrısı hiç yapılmaz;
+kapsamıyorsa None döner ve çağıran LLM segmentasyonuna devam eder.
+"""
+import json
+import re
+import unicodedata
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .fix_segmentation import apply_rubric_hierarchy_fixes, summarize_rubric_coverage
+
+# Varsayılan: tüm rubrik kriterleri (B1-B9) outline'da bulunmalı
+ALL_RUBRIC_CRITERIA = ("B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8", "B9")
+
+# Outline girdilerinin en az bu oranı metne hizalanamazsa outline güvenilmez sayılır
+MIN_ALIGNED_RATIO = 0.8
+
+MAX_LEVEL = 3  # Şemadaki en derin seviye
+
+# Referans bölüm, eski ofsetinin (o ana kadarki kaymayla) bu kadar ilerisine kadar aranır
+REFERENCE_SEARCH_WINDOW = 2000
+
+# Rubrik başlıkları için LLM çıktısıyla aynı section_id önekleri
+SECTION_ID_PREFIXES = [
+    (("executive summary",), "executive_summary"),
+    (("company and sector",), "company_sector"),
+    (("activity analysis", "summer practice description"), "activity_analysis"),
+    (("conclusion",), "conclusion"),
+    (("table of contents", "contents", "içindekiler"), "contents"),
+    (("reference", "bibliography"), "references"),
+    (("appendix",), "appendix"),
+]
+
+
+def _section_id_prefix(name: str, level: int) -> str:
+    """Başlıktan snake_case section_id öneki"""
+    normalized = " ".join(name.lower().split())
+    if level == 1:
+        for keywords, prefix in SECTION_ID_PREFIXES:
+            if any(keyword in normalized for keyword in keywords):
+                return prefix
+    # "a. Impact (minimum one page)" -> "impact"
+    normalized = re.sub(r"^(?:\d+|[a-z])[.)]\s*", "", normalized)
+    normalized = re.sub(r"\(.*?\)", "", normalized)
+    ascii_name = unicodedata.normalize("NFKD", normalized).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"[^a-z0-9]+", "_", ascii_name).strip("_")
+    return slug[:40].rstrip("_") or "section"
+
+
+def _title_pattern(title: str) -> Optional[re.Pattern]:
+    """Başlık kelimelerini, aradaki boşluk/satır sonu farkına toleranslı arar"""
+    words = title.split()
+    if not words:
+        return None
+    return re.compile(r"\s*".join(re.escape(word) for word in words), re.IGNORECASE)
+
+
+def _find_heading(text: str, pattern: re.Pattern, start: int, end: int) -> Optional[int]:
+    """[start, end) içinde başlığı arar; satır başındaki eşleşmeyi tercih eder"""
+    first = None
+    for match in pattern.finditer(text, start, end):
+        if match.start() == 0 or text[match.start() - 1] == "\n":
+            return match.start()
+        if first is None:
+            first = match.start()
+    return first
+
+
+def align_outline(
+    outline: List[Tuple[int, str, int]],
+    text: str,
+    page_starts: List[int]
+) -> List[Tuple[int, str, int]]:
+    """
+    Outline girdilerini metindeki başlık ofsetlerine hizalar.
+
+    Her başlık önce kendi sayfasında, bulunamazsa bir sonraki sayfanın
+    sonuna kadar aranır (içindekiler sayfasındaki kopyaya takılmamak için
+    sayfa penceresi kullanılır). Ofsetler artan sırada olmalıdır; önceki
+    başlıktan geride kalan eşleşmeler atılır.
+
+    Returns:
+        [(level, title, char_offset), ...] - yalnızca hizalananlar
+    """
+    def page_start(page_no: int) -> int:
+        if page_no >= len(page_starts):
+            return len(text)
+        return page_starts[page_no]
+
+    aligned = []
+    cursor = 0
+    for level, title, page_no in outline:
+        title = " ".join(title.split())
+        pattern = _title_pattern(title)
+        if pattern is None or page_no >= len(page_starts):
+            continue
+
+        window_start = max(cursor, page_start(page_no))
+        window_end = page_start(page_no + 2)
+        offset = _find_heading(text, pattern, window_start, window_end)
+        if offset is None:
+            continue
+        aligned.append((level, title, offset))
+        cursor = offset + 1
+    return aligned
+
+
+def build_sections(aligned: List[Tuple[int, str, int]], text: str) -> List[Dict]:
+    """
+    Hizalanmış başlıklardan ardışık, boşluksuz bölümler üretir.
+
+    İlk başlıktan önceki metin Cover bölümü olur. Bölümler bir sonraki
+    başlığa (seviyesi ne olursa olsun) kadar uzanır; LLM şemasındaki gibi
+    üst bölüm yalnızca ilk alt başlığa kadar olan metni içerir.
+    """
+    headings = list(aligned)
+    if not headings or text[:headings[0][2]].strip():
+        headings.insert(0, (1, "Cover", 0))
+
+    sections = []
+    id_counts: Dict[str, int] = {}
+    parents: List[Tuple[int, str]] = []  # (level, section_id) yığını
+    previous_level = 0
+
+    for i, (level, title, start) in enumerate(headings):
+        end = headings[i + 1][2] if i + 1 < len(headings) else len(text)
+        if end <= start:
+            continue
+
+        # Seviye atlamalarını düzelt (1 -> 3 gibi) ve şema sınırında tut
+        level = max(1, min(level, previous_level + 1, MAX_LEVEL))
+        previous_level = level
+
+        prefix = _section_id_prefix(title, level)
+        id_counts[prefix] = id_counts.get(prefix, 0) + 1
+        section_id = f"{prefix}_{id_counts[prefix]}"
+
+        while parents and parents[-1][0] >= level:
+            parents.pop()
+        parent_id = parents[-1][1] if parents else None
+        parents.append((level, section_id))
+
+        sections.append({
+            "section_id": section_id,
+            "section_name": title,
+            "content": text[start:end],
+            "start_idx": start,
+            "end_idx": end,
+            "level": level,
+            "parent_id": parent_id
+        })
+    return sections
+
+
+def segment_from_outline(
+    outline: List[Tuple[int, str, int]],
+    text: str,
+    page_starts: List[int],
+    required_criteria: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    """
+    PDF outline'ından segmentasyon JSON'u üretir.
+
+    Args:
+        outline: read_pdf_outline çıktısı [(level, title, page_no), ...]
+        text: Çıkarılmış metin
+        page_starts: Sayfa başlangıç ofsetleri (text ile aynı çıkarmadan)
+        required_criteria: Outline'ın kapsaması gereken rubrik kriterleri
+                           (örn. ["B1"]); varsayılan B1-B9 hepsi
+
+    Returns:
+        segment_text_chunked ile aynı formatta JSON string; outline yoksa,
+        hizalanamıyorsa ya da kriterleri kapsamıyorsa None
+    """
+    if not outline or not text:
+        return None
+
+    # Sayfa aralığıyla çıkarılmış metinde sonraki sayfalardaki girdiler sayılmaz
+    in_range = [entry for entry in outline if entry[2] < len(page_starts)]
+    aligned = align_outline(in_range, text, page_starts)
+    if not aligned or len(aligned) < MIN_ALIGNED_RATIO * len(in_range):
+        return None
+
+    return _segmentation_json(aligned, text, required_criteria, {
+        "method": "pdf_outline",
+        "outline_entries": len(in_range),
+        "aligned_entries": len(aligned)
+    })
+
+
+def segment_from_headings(
+    headings: Iterable[Tuple[int, str, int]],
+    text: str,
+    required_criteria: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    """
+    DOCX başlık stillerinden segmentasyon JSON'u üretir.
+
+    Args:
+        headings: core.extraction.iter_docx_headings çıktısı
+                  [(level, title, char_start), ...]
+        text: extract_text_from_docx metni (ofsetler buna göre)
+        required_criteria: Başlıkların kapsaması gereken rubrik kriterleri;
+                           varsayılan B1-B9 hepsi
+
+    Returns:
+        segment_text_chunked ile aynı formatta JSON string; başlık stili
+        kullanılmamışsa ya da kriterleri kapsamıyorsa None
+    """
+    if not text:
+        return None
+
+    # Ofsetler metinle aynı çıkarmadan geldiği için hizalama gerekmez;
+    # yalnızca artan sıra ve metin sınırı korunur
+    aligned = []
+    cursor = -1
+    for level, title, offset in headings:
+        if cursor < offset < len(text):
+            aligned.append((level, title, offset))
+            cursor = offset
+    if not aligned:
+        return None
+
+    return _segmentation_json(aligned, text, required_criteria, {
+        "method": "docx_styles",
+        "heading_entries": len(aligned)
+    })
+
+
+def segment_from_reference(
+    reference_sections: List[Dict],
+    text: str,
+    required_criteria: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    """
+    Neredeyse aynı bir gönderimin segmentasyonunu yeni metne taşır.
+
+    Her referans bölümün ilk dolu satırı yeni metinde, bir önceki bölümden
+    sonra ve eski ofsetinin (o ana kadarki kaymayla) REFERENCE_SEARCH_WINDOW
+    ilerisine kadar aranır; bulunamayan bölümlerin metni bir öncekine katılır.
+
+    Args:
+        reference_sections: Referans gönderimin (düzeltilmiş) bölümleri
+        text: Yeni gönderimin çıkarılmış metni
+        required_criteria: Bölümlerin kapsaması gereken rubrik kriterleri;
+                           varsayılan B1-B9 hepsi
+
+    Returns:
+        segment_text_chunked ile aynı formatta JSON string; bölümlerin en az
+        MIN_ALIGNED_RATIO'su hizalanamazsa ya da kriterler kapsanmıyorsa None
+    """
+    if not reference_sections or not text:
+        return None
+
+    aligned = []
+    cursor = drift = 0
+    ordered = sorted(reference_sections, key=lambda sec: sec.get("start_idx", 0))
+    for sec in ordered:
+        anchor = next((line for line in (sec.get("content") or "").split("\n") if line.strip()), "")
+        pattern = _title_pattern(anchor[:120])
+        if pattern is None:
+            continue
+        old_start = sec.get("start_idx", 0)
+        window_end = min(len(text), max(cursor, old_start + drift) + REFERENCE_SEARCH_WINDOW)
+        offset = _find_heading(text, pattern, cursor, window_end)
+        if offset is None:
+            continue
+        aligned.append((sec.get("level", 1), sec.get("section_name") or anchor.strip(), offset))
+        cursor, drift = offset + 1, offset - old_start
+
+    if not aligned or len(aligned) < MIN_ALIGNED_RATIO * len(ordered):
+        return None
+
+    return _segmentation_json(aligned, text, required_criteria, {
+        "method": "reference",
+        "reference_sections": len(ordered),
+        "aligned_entries": len(aligned)
+    })
+
+
+def _segmentation_json(
+    aligned: List[Tuple[int, str, int]],
+    text: str,
+    required_criteria: Optional[Iterable[str]],
+    method_metadata: Dict
+) -> Optional[str]:
+    """Başlıklardan bölümleri kurar, kriter kapsamını kontrol eder ve JSON'a çevirir"""
+    # parent_id'ler başlık seviyelerinden geldiği için geçerli; yalnızca
+    # rubrik hiyerarşisi kuralları uygulanır (merge_segmentations ile aynı)
+    sections = apply_rubric_hierarchy_fixes(build_sections(aligned, text))
+
+    coverage = summarize_rubric_coverage(sections)
+    required = ALL_RUBRIC_CRITERIA if required_criteria is None else tuple(required_criteria)
+    if not all(coverage.get(rubric_id) for rubric_id in required):
+        return None
+
+    result = {
+        "segmentation": {
+            "sections": sections
+        },
+        "source_metadata": {
+            "total_length": len(text),
+            "extraction_timestamp": datetime.now().isoformat(),
+            "chunked": False,
+            **method_metadata
+        }
+    }
+    return json.dumps(result, ensure_ascii=False, indent=2)
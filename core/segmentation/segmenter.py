@@ -1,25 +1,59 @@
 """
 Chunking destekli segmentasyon - Uzun metinler için
 """
+import asyncio
+import bisect
 import os
 import sys
 import json
 import time
 import unicodedata
 import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import google.generativeai as genai
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    from ..llm import estimate_prompt_tokens, get_rate_limiter, get_response_cache, response_cache_key
+except ImportError:
+    from core.llm import estimate_prompt_tokens, get_rate_limiter, get_response_cache, response_cache_key
+
 # Model ve prompt yükleme
 MODEL_NAME = "gemini-2.0-flash"
+GENERATION_CONFIG = {
+    "temperature": 0,
+    "response_mime_type": "application/json"
+}
+
+# Çıktı modu: "content" modelin her bölümün content'ini aynen yazdığı
+# varsayılandır; "offsets" modelden yalnızca bölüm sınırlarını ve başlık
+# satırını ister, içerik yerelde orijinal metinden kesilir (çıktı token'ı
+# ~içerik kadar azalır). Gerçek yanıtlarla ölçülene kadar varsayılan değil
+SEGMENT_OUTPUT_MODES = ("offsets", "content")
+DEFAULT_OUTPUT_MODE = "content"
+PROMPT_FILES = {
+    "offsets": "segmentation_offsets.json.txt",
+    "content": "segmentation.json.txt"
+}
+
+# Başlık çapası model ofsetinden en fazla bu kadar uzakta aranır
+ANCHOR_WINDOW = 2000
+
 
-def load_prompt() -> str:
-    """Segmentation prompt şablonunu yükle"""
+def output_mode() -> str:
+    """Segmentasyon çıktı modu (SEGMENT_OUTPUT_MODE ile değiştirilebilir)"""
+    mode = os.getenv("SEGMENT_OUTPUT_MODE", DEFAULT_OUTPUT_MODE)
+    return mode if mode in SEGMENT_OUTPUT_MODES else DEFAULT_OUTPUT_MODE
+
+
+def load_prompt(mode: str = None) -> str:
+    """Segmentation prompt şablonunu yükle (varsayılan: output_mode())"""
     project_root = Path(__file__).resolve().parents[2]
-    prompt_path = project_root / "core" / "prompts" / "segmentation.json.txt"
+    prompt_path = project_root / "core" / "prompts" / PROMPT_FILES[mode or output_mode()]
     
     if not prompt_path.exists():
         raise FileNotFoundError(f"Prompt dosyası bulunamadı: {prompt_path}")
@@ -68,49 +102,159 @@ def _repair_json(json_str: str) -> str:
     return json_str
 
 
-def segment_text(text: str, api_key: str = None) -> str:
-    """Tek chunk için segmentasyon yap (chunked olmayan kısa metinler için)"""
+def _segmentation_model(api_key: str = None):
+    """Segmentasyon için yapılandırılmış Gemini modeli"""
     api_key = api_key or os.getenv("GEMINI_API_KEY", "")
     if not api_key:
         raise RuntimeError("GEMINI_API_KEY is not set")
     
     genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(
-        MODEL_NAME,
-        generation_config={
-            "temperature": 0,
-            "response_mime_type": "application/json"
-        },
+    return genai.GenerativeModel(MODEL_NAME, generation_config=GENERATION_CONFIG)
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    return "429" in str(error) or "Resource exhausted" in str(error)
+
+
+def _generate(model, prompt: str, validate=None) -> str:
+    """
+    Prompt'un yanıt metni.
+    
+    Önce yanıt cache'ine bakılır; yoksa paylaşılan istek/token bütçesi
+    açılınca istek gönderilir. validate hatasız geçen yanıtlar cache'lenir.
+    """
+    cache = get_response_cache()
+    key = response_cache_key(MODEL_NAME, GENERATION_CONFIG, prompt)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    get_rate_limiter().acquire(estimate_prompt_tokens(prompt))
+    output = _extract_text(model.generate_content(prompt)).strip()
+    cache.put(key, MODEL_NAME, output, validate=validate)
+    return output
+
+
+async def _generate_async(model, prompt: str, validate=None) -> str:
+    """_generate'in asyncio sürümü (cache ve kova I/O'su event loop dışında)"""
+    cache = get_response_cache()
+    key = response_cache_key(MODEL_NAME, GENERATION_CONFIG, prompt)
+    cached = await cache.get_async(key)
+    if cached is not None:
+        return cached
+    await get_rate_limiter().acquire_async(estimate_prompt_tokens(prompt))
+    output = _extract_text(await model.generate_content_async(prompt)).strip()
+    await cache.put_async(key, MODEL_NAME, output, validate=validate)
+    return output
+
+
+def _segmentation_json(output: str) -> str:
+    """Tek istek çıktısını temizleyip biçimli JSON string'e çevir"""
+    if not output:
+        raise RuntimeError("Boş yanıt döndü")
+    
+    # Model çıktısını temizle
+    output = clean_model_output(output)
+    
+    # JSON parse et
+    try:
+        data = json.loads(output)
+    except json.JSONDecodeError:
+        # Repair dene
+        repaired = _repair_json(output)
+        data = json.loads(repaired)
+    
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def _anchor_start(text: str, heading: str, start: int, lower: int) -> int:
+    """
+    Bölüm başlık satırının metindeki konumu.
+    
+    Başlık (boşluk farkları ve büyük/küçük harf göz ardı edilerek) model
+    ofsetinin ANCHOR_WINDOW çevresinde, yalnızca satır başlarında aranır ve
+    ofsete en yakın eşleşme seçilir; gövde metnindeki anılmalar eşleşmez.
+    Bulunamazsa model ofseti kullanılır.
+    """
+    words = (heading or "").split()
+    if not words:
+        return start
+    pattern = re.compile(
+        r"^[ \t]*(" + r"\s+".join(re.escape(word) for word in words) + ")",
+        re.IGNORECASE | re.MULTILINE
     )
+    window_start = max(lower, start - ANCHOR_WINDOW)
+    matches = [m.start(1) for m in pattern.finditer(text, window_start, min(len(text), start + ANCHOR_WINDOW))]
+    return min(matches, key=lambda pos: abs(pos - start)) if matches else start
+
+
+def _offset(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def fill_section_content(sections: list, text: str) -> list:
+    """
+    Ofset modunda bölümlerin content'ini yerelde metinden keser.
     
+    start_idx'ler (0 hariç) modelin verdiği başlık satırına çapalanır;
+    end_idx modelinki olarak kalır (yalnızca metin sınırına kırpılır), böylece
+    bölüm yapısı modelin verdiği gibi korunur. end_idx geçersizse bölüm, aynı
+    ya da üst seviyedeki sonraki bölümün başında biter. content =
+    text[start_idx:end_idx]; ofsetler her zaman verilen metne (chunk) göredir.
+    """
+    text_len = len(text)
+    sections = sorted(sections, key=lambda s: _offset(s.get('start_idx'), 0))
+    previous = 0
+    for section in sections:
+        start = min(max(_offset(section.get('start_idx'), previous), previous), text_len)
+        if start > 0:
+            # 0'da başlayan bölüm önceki chunk'tan devam ediyor olabilir; çapalanmaz
+            start = _anchor_start(text, section.get('heading'), start, previous)
+        section['start_idx'] = previous = start
+    
+    for i, section in enumerate(sections):
+        end = min(_offset(section.get('end_idx'), 0), text_len)
+        if end <= section['start_idx']:
+            level = section.get('level') or 1
+            end = next(
+                (other['start_idx'] for other in sections[i + 1:]
+                 if (other.get('level') or 1) <= level and other['start_idx'] > section['start_idx']),
+                text_len
+            )
+        section['end_idx'] = end
+        section['content'] = text[section['start_idx']:end]
+        section.pop('heading', None)
+    
+    return [section for section in sections if section['end_idx'] > section['start_idx']]
+
+
+def _single_result(output: str, text: str) -> str:
+    """Tek istek yanıtını JSON string'e çevir (ofset modunda content'i doldurur)"""
+    result = _segmentation_json(output)
+    if output_mode() != "offsets":
+        return result
+    data = json.loads(result)
+    segmentation = data.setdefault('segmentation', {})
+    segmentation['sections'] = fill_section_content(segmentation.get('sections', []), text)
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def segment_text(text: str, api_key: str = None) -> str:
+    """Tek chunk için segmentasyon yap (chunked olmayan kısa metinler için)"""
+    model = _segmentation_model(api_key)
     prompt = load_prompt().format(TEXT=text, SOURCE_LEN=len(text))
     
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            resp = model.generate_content(prompt)
-            output = _extract_text(resp).strip()
-            
-            if not output:
-                raise RuntimeError("Boş yanıt döndü")
-            
-            # Model çıktısını temizle
-            output = clean_model_output(output)
-            
-            # JSON parse et
-            try:
-                data = json.loads(output)
-            except json.JSONDecodeError:
-                # Repair dene
-                repaired = _repair_json(output)
-                data = json.loads(repaired)
-            
-            return json.dumps(data, ensure_ascii=False, indent=2)
-            
+            output = _generate(model, prompt, validate=_segmentation_json)
+            return _single_result(output, text)
         except Exception as e:
-            if "429" in str(e) or "Resource exhausted" in str(e):
+            if _is_rate_limit(e):
                 if attempt < max_retries - 1:
-                    time.sleep(5 * (attempt + 1))
+                    time.sleep(get_rate_limiter().backoff(attempt))
                     continue
                 else:
                     raise RuntimeError(f"Rate limit hatası: {e}")
@@ -121,10 +265,65 @@ def segment_text(text: str, api_key: str = None) -> str:
                 raise
 
 
+async def segment_text_async(text: str, api_key: str = None) -> str:
+    """segment_text'in asyncio sürümü (bekleme sırasında event loop'u bloklamaz)"""
+    model = _segmentation_model(api_key)
+    prompt = load_prompt().format(TEXT=text, SOURCE_LEN=len(text))
+    
+    max_retries = 3
+    for attempt in range(max_retries):
+        try:
+            output = await _generate_async(model, prompt, validate=_segmentation_json)
+            return _single_result(output, text)
+        except Exception as e:
+            if _is_rate_limit(e):
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(await get_rate_limiter().backoff_async(attempt))
+                    continue
+                else:
+                    raise RuntimeError(f"Rate limit hatası: {e}")
+            else:
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2)
+                    continue
+                raise
+
+
 # Chunking parametreleri
 MAX_CHUNK_SIZE = 15000  # karakter
 CHUNK_OVERLAP = 800  # Chunk'lar arası overlap (başlık kaybını önlemek için) - artırıldı
 MIN_FILL_RATIO = 0.65  # Minimum chunk doluluk oranı (%65)
+DEFAULT_CONCURRENCY = 4  # Aynı anda gönderilen chunk isteği
+BOUNDARY_CONTEXT = 64  # Kesme noktası özetine giren, noktadan önceki karakter sayısı
+
+
+def chunk_concurrency() -> int:
+    """Paralel chunk isteği sınırı (SEGMENT_CONCURRENCY ile değiştirilebilir)"""
+    try:
+        return max(1, int(os.getenv("SEGMENT_CONCURRENCY", DEFAULT_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+
+def _content_break(text: str, separator: str, low: int, high: int) -> int:
+    """
+    low'dan sonra başlayıp high'a kadar biten ayraçlardan, içerik özeti en
+    küçük olanın sonu; uygun ayraç yoksa -1.
+    
+    Özet yalnızca ayraç ve ondan önceki BOUNDARY_CONTEXT karakterden
+    hesaplanır, chunk'ın başlangıcından bağımsızdır. Metnin bir yerinde
+    yapılan düzeltme yalnızca yakınındaki kesme noktalarını değiştirir;
+    sonraki chunk'lar yine aynı noktalardan kesilir ve prompt'ları
+    (dolayısıyla yanıt cache anahtarları) değişmez.
+    """
+    best, best_rank = -1, None
+    pos = text.find(separator, low + 1, high)
+    while pos != -1 and pos + len(separator) <= high:
+        rank = zlib.crc32(text[max(0, pos - BOUNDARY_CONTEXT):pos + len(separator)].encode('utf-8'))
+        if best_rank is None or rank < best_rank:
+            best, best_rank = pos + len(separator), rank
+        pos = text.find(separator, pos + 1, high)
+    return best
 
 
 def split_text_into_chunks(text: str, chunk_size: int = MAX_CHUNK_SIZE, overlap: int = CHUNK_OVERLAP, min_fill_ratio: float = MIN_FILL_RATIO) -> list:
@@ -134,6 +333,10 @@ def split_text_into_chunks(text: str, chunk_size: int = MAX_CHUNK_SIZE, overlap:
     - Minimum doluluk eşiği (%65)
     - Geriye düşmeyi engelleme
     - Çift satır sonu (\n\n) → tek satır sonu (\n) sırasıyla yumuşak kes
+    - Kesme noktası, doluluk eşiği ile chunk sonu arasındaki ayraçlardan
+      içeriğe göre seçilir (_content_break); düzeltilmiş raporda değişen
+      paragrafı içeren chunk (overlap'teyse komşusu da) yeniden gönderilir,
+      diğerleri yanıt cache'inden gelir
     """
     chunks = []
     text_len = len(text)
@@ -149,16 +352,14 @@ def split_text_into_chunks(text: str, chunk_size: int = MAX_CHUNK_SIZE, overlap:
         
         # Eğer son chunk değilse, satır sonu veya paragraf sonu bul
         if end < text_len:
-            # Önce çift satır sonu (\n\n) ara
-            newline_pos = text.rfind('\n\n', start, end)
-            if newline_pos > start + min_chunk_size:  # Minimum doluluk eşiğini koru
-                end = newline_pos + 2
-            else:
-                # Tek satır sonu (\n) ara
-                newline_pos = text.rfind('\n', start, end)
-                if newline_pos > start + min_chunk_size:
-                    end = newline_pos + 1
-                # Eğer minimum doluluk eşiği sağlanamazsa, orijinal end'i kullan
+            # Önce çift satır sonu (\n\n), sonra tek satır sonu (\n);
+            # minimum doluluk eşiğini koru
+            break_end = _content_break(text, '\n\n', start + min_chunk_size, end)
+            if break_end == -1:
+                break_end = _content_break(text, '\n', start + min_chunk_size, end)
+            if break_end != -1:
+                end = break_end
+            # Eğer minimum doluluk eşiği sağlanamazsa, orijinal end'i kullan
         
         # Minimum doluluk kontrolü
         chunk_length = end - start
@@ -198,6 +399,124 @@ def split_text_into_chunks(text: str, chunk_size: int = MAX_CHUNK_SIZE, overlap:
     return chunks
 
 
+# Başlık hizalı chunk'lama: sınırlar başlık satırlarının hemen önüne konur,
+# böylece bölüm ortadan bölünmez ve overlap gerekmez. Segmentasyon kalitesi
+# değerlendirilene kadar varsayılan "paragraph" (son paragraf sonu +
+# CHUNK_OVERLAP); "headings" SEGMENT_CHUNK_STRATEGY ile seçilir
+CHUNK_STRATEGIES = ("headings", "paragraph")
+DEFAULT_CHUNK_STRATEGY = "paragraph"
+MAX_HEADING_LINE = 80
+
+# "1.", "2.3", "IV." ile başlayan ve büyük harfle devam eden kısa satırlar
+NUMBERED_HEADING_PATTERN = re.compile(r"^(?:\d+(?:\.\d+)*\.?|[IVX]+\.)\s+[^\W\d_]", re.UNICODE)
+RUBRIC_HEADING_NAMES = (
+    "executive summary", "introduction", "company", "description of the company",
+    "activity analysis", "summer practice", "project overview", "daily activities", "day ",
+    "impact", "team work", "teamwork", "self-directed", "self directed",
+    "professional and ethical", "conclusion", "references", "bibliography", "appendix",
+    "table of contents", "contents", "içindekiler"
+)
+
+
+def chunk_strategy() -> str:
+    """Chunk'lama stratejisi (SEGMENT_CHUNK_STRATEGY ile değiştirilebilir)"""
+    strategy = os.getenv("SEGMENT_CHUNK_STRATEGY", DEFAULT_CHUNK_STRATEGY)
+    return strategy if strategy in CHUNK_STRATEGIES else DEFAULT_CHUNK_STRATEGY
+
+
+def _is_heading_line(line: str) -> bool:
+    line = line.strip()
+    if not line or len(line) > MAX_HEADING_LINE or line.endswith((",", ";")):
+        return False
+    if NUMBERED_HEADING_PATTERN.match(line) and not line.endswith("."):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    if len(letters) >= 4 and sum(c.isupper() for c in letters) >= 0.8 * len(letters):
+        return True
+    lowered = line.lower()
+    return line[0].isupper() and any(lowered.startswith(name) for name in RUBRIC_HEADING_NAMES)
+
+
+def find_heading_offsets(text: str) -> list:
+    """
+    Başlık gibi görünen satırların başlangıç ofsetleri.
+    
+    Numaralı başlıklar ("2.1 Company Overview"), büyük harfli satırlar ve
+    rubrik bölüm adlarıyla başlayan kısa satırlar.
+    """
+    offsets = []
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        if pos > 0 and _is_heading_line(line):
+            offsets.append(pos)
+        pos += len(line)
+    return offsets
+
+
+def split_text_at_headings(
+    text: str,
+    chunk_size: int = MAX_CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+    min_fill_ratio: float = MIN_FILL_RATIO,
+    heading_offsets: list = None
+) -> list:
+    """Metni başlık satırlarının önünden chunk'lara böl
+    
+    Her chunk, doluluk eşiğinden (%65) sonraki son başlığın hemen önünde
+    biter; sonraki chunk o başlıkla başlar ve overlap eklenmez. Pencerede
+    başlık yoksa o chunk için split_text_into_chunks'ın paragraf/overlap
+    kuralı kullanılır.
+    
+    Args:
+        heading_offsets: Hazır başlık ofsetleri (örn. başlık indeksi);
+                         verilmezse find_heading_offsets ile bulunur
+    """
+    text_len = len(text)
+    if text_len <= chunk_size:
+        return [(0, text_len, text)]
+    
+    headings = sorted(heading_offsets if heading_offsets is not None else find_heading_offsets(text))
+    min_chunk_size = int(chunk_size * min_fill_ratio)
+    chunks = []
+    start = 0
+    while start < text_len:
+        limit = start + chunk_size
+        if limit >= text_len:
+            chunks.append((start, text_len, text[start:]))
+            break
+        
+        # Doluluk eşiği ile chunk sonu arasındaki son başlık
+        index = bisect.bisect_right(headings, limit) - 1
+        if index >= 0 and headings[index] > start + min_chunk_size:
+            end = headings[index]
+            chunks.append((start, end, text[start:end]))
+            start = end
+            continue
+        
+        # Başlık yok: paragraf sınırı ve overlap (ilk iki chunk yeterli)
+        window = split_text_into_chunks(text[start:limit + chunk_size], chunk_size, overlap, min_fill_ratio)
+        end = start + window[0][1]
+        chunks.append((start, end, text[start:end]))
+        start = start + window[1][0] if len(window) > 1 else end
+    
+    return chunks
+
+
+def split_chunks(text: str, strategy: str = None, heading_offsets: list = None) -> list:
+    """
+    Seçili stratejiyle chunk'la (varsayılan: chunk_strategy()).
+    
+    Args:
+        heading_offsets: "headings" stratejisinde kullanılacak başlık
+                         ofsetleri (örn. yazı tipi başlık indeksinden,
+                         core/extraction/heading_index.py); boşsa
+                         find_heading_offsets'in tahminleri kullanılır
+    """
+    if (strategy or chunk_strategy()) == "paragraph":
+        return split_text_into_chunks(text)
+    return split_text_at_headings(text, heading_offsets=heading_offsets or None)
+
+
 def calculate_iou(start1: int, end1: int, start2: int, end2: int) -> float:
     """İki aralık arasındaki Intersection over Union (IoU) hesapla"""
     intersection_start = max(start1, start2)
@@ -475,141 +794,140 @@ def merge_segmentations(chunk_results: list, original_text: str) -> dict:
     }
 
 
-def segment_text_chunked(text: str, api_key: str = None) -> str:
-    """Uzun metinleri chunk'lara bölerek işle"""
-    api_key = api_key or os.getenv("GEMINI_API_KEY", "")
-    if not api_key:
-        raise RuntimeError("GEMINI_API_KEY is not set")
-    
-    # Chunk'lara böl
-    chunks = split_text_into_chunks(text)
+def _parse_sections(output: str) -> list:
+    """Model çıktısından bölüm listesini çıkar (gerekirse repair ile)"""
+    try:
+        data = json.loads(output)
+    except json.JSONDecodeError:
+        data = json.loads(_repair_json(output))
+    return data.get('segmentation', {}).get('sections', [])
+
+
+JSON_RETRY_INSTRUCTION = "\n\nCRITICAL: Output MUST be valid JSON. All strings must be properly escaped. No markdown, ONLY valid JSON."
+
+
+def _chunk_sections(output: str) -> list:
+    """Ham chunk yanıtının bölüm listesi (cache doğrulaması için)"""
+    return _parse_sections(clean_model_output(output))
+
+
+def _chunk_result(output: str, i: int, chunk_start: int, chunk_text: str, logs: list, retried: bool = False):
+    """
+    Chunk çıktısını parse et (ofset modunda content chunk metninden kesilir).
     
-    if len(chunks) == 1:
-        # Tek chunk, normal segmentasyon
-        return segment_text(text, api_key=api_key)
+    Returns:
+        {'chunk_start', 'sections'} ya da parse edilemezse None
+    """
+    try:
+        sections = _chunk_sections(output)
+    except (json.JSONDecodeError, AttributeError) as e:
+        if retried:
+            logs.append(f"    Chunk {i} tamamen başarısız, atlanıyor...")
+            logs.append(f"     Bu chunk'daki bölümler eksik kalacak!")
+        else:
+            logs.append(f"    Chunk {i} repair ile de parse edilemedi: {e}")
+            logs.append(f"    Retry ile tekrar deneniyor...")
+        return None
+    if output_mode() == "offsets":
+        sections = fill_section_content(sections, chunk_text)
+    logs.append(f"    {len(sections)} bölüm çıkarıldı" + (" (retry ile)" if retried else ""))
+    return {'chunk_start': chunk_start, 'sections': sections}
+
+
+def _segment_chunk(model, i: int, chunk_start: int, chunk_text: str) -> tuple:
+    """
+    Tek bir chunk'ı segment et (JSON hatasında bir kez daha dener).
     
-    print(f" Metin {len(chunks)} chunk'a bölündü (her chunk ~{MAX_CHUNK_SIZE:,} karakter)")
-    print()
+    Paralel çalıştığı için çıktıyı doğrudan yazdırmaz; log satırlarını
+    döndürür, çağıran chunk sırasıyla yazdırır. Prompt yalnızca şablon ve
+    chunk metninden oluştuğundan, içeriği değişmemiş chunk'lar (düzeltilmiş
+    rapor) yanıt cache'inden gelir ve LLM'e gönderilmez.
     
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(
-        MODEL_NAME,
-        generation_config={
-            "temperature": 0,
-            "response_mime_type": "application/json"
-        },
-    )
+    Returns:
+        (chunk_result | None, log satırları)
+    """
+    logs = []
+    prompt = load_prompt().format(TEXT=chunk_text, SOURCE_LEN=len(chunk_text))
     
-    chunk_results = []
+    # Chunk'ı işle
+    max_retries = 3
+    output = None
     
-    # Her chunk'ı işle
-    for i, (chunk_start, chunk_end, chunk_text) in enumerate(chunks, 1):
-        print(f" Chunk {i}/{len(chunks)} işleniyor... (pozisyon {chunk_start:,}-{chunk_end:,})")
-        
-        prompt = load_prompt().format(TEXT=chunk_text, SOURCE_LEN=len(chunk_text))
-        
-        # Chunk'ı işle
-        max_retries = 3
-        output = None
-        
-        for attempt in range(max_retries):
-            try:
-                resp = model.generate_content(prompt)
-                output = _extract_text(resp).strip()
-                break
-            except Exception as e:
-                if "429" in str(e) or "Resource exhausted" in str(e):
-                    if attempt < max_retries - 1:
-                        time.sleep(5 * (attempt + 1))
-                        continue
-                    else:
-                        raise RuntimeError(f"Rate limit hatası (chunk {i})")
+    for attempt in range(max_retries):
+        try:
+            output = _generate(model, prompt, validate=_chunk_sections)
+            break
+        except Exception as e:
+            if _is_rate_limit(e):
+                if attempt < max_retries - 1:
+                    time.sleep(get_rate_limiter().backoff(attempt))
+                    continue
                 else:
-                    raise
-        
-        if not output:
-            print(f"  Chunk {i} boş yanıt döndü, atlanıyor...")
-            continue
-        
-        # Model çıktısını temizle
-        output = clean_model_output(output)
-        
-        # JSON parse et
+                    raise RuntimeError(f"Rate limit hatası (chunk {i})")
+            else:
+                raise
+    
+    if not output:
+        logs.append(f"  Chunk {i} boş yanıt döndü, atlanıyor...")
+        return None, logs
+    
+    chunk_result = _chunk_result(output, i, chunk_start, chunk_text, logs)
+    if chunk_result is not None:
+        return chunk_result, logs
+    
+    # Retry ile tekrar dene
+    time.sleep(2)
+    try:
+        output2 = _generate(model, prompt + JSON_RETRY_INSTRUCTION, validate=_chunk_sections)
+        return _chunk_result(output2, i, chunk_start, chunk_text, logs, retried=True), logs
+    except Exception as retry_error:
+        logs.append(f"    Retry hatası: {retry_error}")
+        logs.append(f"    Chunk {i} atlanıyor - bu chunk'daki bölümler eksik kalacak!")
+    return None, logs
+
+
+async def _segment_chunk_async(model, i: int, chunk_start: int, chunk_text: str) -> tuple:
+    """_segment_chunk'ın asyncio sürümü"""
+    logs = []
+    prompt = load_prompt().format(TEXT=chunk_text, SOURCE_LEN=len(chunk_text))
+    
+    max_retries = 3
+    output = None
+    
+    for attempt in range(max_retries):
         try:
-            data = json.loads(output)
-            sections = data.get('segmentation', {}).get('sections', [])
-            chunk_results.append({
-                'chunk_start': chunk_start,
-                'sections': sections
-            })
-            print(f"    {len(sections)} bölüm çıkarıldı")
-        except json.JSONDecodeError as e:
-            # Repair dene
-            print(f"     JSON parse hatası: {e}")
-            print(f"    Repair deneniyor...")
-            repaired = _repair_json(output)
-            try:
-                data = json.loads(repaired)
-                sections = data.get('segmentation', {}).get('sections', [])
-                chunk_results.append({
-                    'chunk_start': chunk_start,
-                    'sections': sections
-                })
-                print(f"    {len(sections)} bölüm çıkarıldı (repair ile)")
-            except json.JSONDecodeError as e2:
-                print(f"    Chunk {i} repair ile de parse edilemedi: {e2}")
-                print(f"    Retry ile tekrar deneniyor...")
-                
-                # Retry ile tekrar dene
-                time.sleep(2)
-                try:
-                    retry_prompt = prompt + "\n\nCRITICAL: Output MUST be valid JSON. All strings must be properly escaped. No markdown, ONLY valid JSON."
-                    resp2 = model.generate_content(retry_prompt)
-                    output2 = _extract_text(resp2).strip()
-                    
-                    # Model çıktısını temizle
-                    output2 = clean_model_output(output2)
-                    
-                    # Markdown temizleme
-                    if "```json" in output2:
-                        start = output2.find("```json") + 7
-                        end = output2.find("```", start)
-                        if end != -1:
-                            output2 = output2[start:end].strip()
-                    elif "```" in output2:
-                        start = output2.find("```") + 3
-                        end = output2.find("```", start)
-                        if end != -1:
-                            output2 = output2[start:end].strip()
-                    
-                    try:
-                        data = json.loads(output2)
-                        sections = data.get('segmentation', {}).get('sections', [])
-                        chunk_results.append({
-                            'chunk_start': chunk_start,
-                            'sections': sections
-                        })
-                        print(f"   {len(sections)} bölüm çıkarıldı (retry ile)")
-                    except:
-                        # Son çare: repair ile tekrar dene
-                        repaired2 = _repair_json(output2)
-                        try:
-                            data = json.loads(repaired2)
-                            sections = data.get('segmentation', {}).get('sections', [])
-                            chunk_results.append({
-                                'chunk_start': chunk_start,
-                                'sections': sections
-                            })
-                            print(f"    {len(sections)} bölüm çıkarıldı (retry + repair ile)")
-                        except:
-                            print(f"    Chunk {i} tamamen başarısız, atlanıyor...")
-                            print(f"     Bu chunk'daki bölümler eksik kalacak!")
-                except Exception as retry_error:
-                    print(f"    Retry hatası: {retry_error}")
-                    print(f"    Chunk {i} atlanıyor - bu chunk'daki bölümler eksik kalacak!")
-        
-        print()
+            output = await _generate_async(model, prompt, validate=_chunk_sections)
+            break
+        except Exception as e:
+            if _is_rate_limit(e):
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(await get_rate_limiter().backoff_async(attempt))
+                    continue
+                else:
+                    raise RuntimeError(f"Rate limit hatası (chunk {i})")
+            else:
+                raise
+    
+    if not output:
+        logs.append(f"  Chunk {i} boş yanıt döndü, atlanıyor...")
+        return None, logs
     
+    chunk_result = _chunk_result(output, i, chunk_start, chunk_text, logs)
+    if chunk_result is not None:
+        return chunk_result, logs
+    
+    await asyncio.sleep(2)
+    try:
+        output2 = await _generate_async(model, prompt + JSON_RETRY_INSTRUCTION, validate=_chunk_sections)
+        return _chunk_result(output2, i, chunk_start, chunk_text, logs, retried=True), logs
+    except Exception as retry_error:
+        logs.append(f"    Retry hatası: {retry_error}")
+        logs.append(f"    Chunk {i} atlanıyor - bu chunk'daki bölümler eksik kalacak!")
+    return None, logs
+
+
+def _finish_chunked(chunk_results: list, text: str) -> str:
+    """Chunk sonuçlarını birleştir, doğrula ve JSON string döndür"""
     # Sonuçları birleştir
     print(" Chunk sonuçları birleştiriliyor...")
     merged = merge_segmentations(chunk_results, text)
@@ -636,9 +954,107 @@ def segment_text_chunked(text: str, api_key: str = None) -> str:
     return json.dumps(merged, ensure_ascii=False, indent=2)
 
 
+def segment_text_chunked(
+    text: str,
+    api_key: str = None,
+    max_concurrency: int = None,
+    heading_offsets: list = None
+) -> str:
+    """Uzun metinleri chunk'lara bölerek işle
+    
+    Chunk'lar en fazla max_concurrency (varsayılan SEGMENT_CONCURRENCY ortam
+    değişkeni, o da yoksa DEFAULT_CONCURRENCY) istekle paralel gönderilir;
+    sonuçlar chunk sırasıyla birleştirilir. heading_offsets verilirse
+    "headings" stratejisinde chunk sınırları bu başlıklara göre konur
+    (bkz. split_chunks).
+    """
+    # Chunk'lara böl
+    chunks = split_chunks(text, heading_offsets=heading_offsets)
+    
+    if len(chunks) == 1:
+        # Tek chunk, normal segmentasyon
+        return segment_text(text, api_key=api_key)
+    
+    model = _segmentation_model(api_key)
+    max_concurrency = max(1, min(max_concurrency or chunk_concurrency(), len(chunks)))
+    print(f" Metin {len(chunks)} chunk'a bölündü (her chunk ~{MAX_CHUNK_SIZE:,} karakter, {max_concurrency} paralel)")
+    print()
+    
+    chunk_results = []
+    
+    # Chunk'ları paralel gönder, sonuçları sırayla topla
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [
+            executor.submit(_segment_chunk, model, i, chunk_start, chunk_text)
+            for i, (chunk_start, chunk_end, chunk_text) in enumerate(chunks, 1)
+        ]
+        for i, ((chunk_start, chunk_end, _), future) in enumerate(zip(chunks, futures), 1):
+            print(f" Chunk {i}/{len(chunks)} işleniyor... (pozisyon {chunk_start:,}-{chunk_end:,})")
+            try:
+                chunk_result, logs = future.result()
+            except Exception:
+                for pending in futures:
+                    pending.cancel()
+                raise
+            for line in logs:
+                print(line)
+            if chunk_result is not None:
+                chunk_results.append(chunk_result)
+            print()
+    
+    return _finish_chunked(chunk_results, text)
+
+
+async def segment_text_chunked_async(
+    text: str,
+    api_key: str = None,
+    max_concurrency: int = None,
+    heading_offsets: list = None
+) -> str:
+    """
+    segment_text_chunked'ın asyncio sürümü.
+    
+    Chunk istekleri Gemini'nin async istemcisiyle tek event loop üzerinde
+    gönderilir (istek başına thread yok); aynı anda en fazla max_concurrency
+    chunk isteği uçuştadır. Birden fazla rapor aynı loop'ta
+    asyncio.gather ile işlenebilir.
+    """
+    chunks = split_chunks(text, heading_offsets=heading_offsets)
+    
+    if len(chunks) == 1:
+        return await segment_text_async(text, api_key=api_key)
+    
+    model = _segmentation_model(api_key)
+    max_concurrency = max(1, min(max_concurrency or chunk_concurrency(), len(chunks)))
+    print(f" Metin {len(chunks)} chunk'a bölündü (her chunk ~{MAX_CHUNK_SIZE:,} karakter, {max_concurrency} paralel)")
+    print()
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(i: int, chunk_start: int, chunk_text: str) -> tuple:
+        async with semaphore:
+            return await _segment_chunk_async(model, i, chunk_start, chunk_text)
+    
+    # gather sonuçları chunk sırasıyla döndürür
+    outcomes = await asyncio.gather(*(
+        run(i, chunk_start, chunk_text)
+        for i, (chunk_start, chunk_end, chunk_text) in enumerate(chunks, 1)
+    ))
+    
+    chunk_results = []
+    for i, ((chunk_start, chunk_end, _), (chunk_result, logs)) in enumerate(zip(chunks, outcomes), 1):
+        print(f" Chunk {i}/{len(chunks)} işlendi (pozisyon {chunk_start:,}-{chunk_end:,})")
+        for line in logs:
+            print(line)
+        if chunk_result is not None:
+            chunk_results.append(chunk_result)
+        print()
+    
+    return _finish_chunked(chunk_results, text)
+
+
 if __name__ == "__main__":
     # Test
     sample = "Introduction\nThis is a demo.\nMethodology\nWe did X.\nResults\n...\nConclusion\nDone." * 1000
     result = segment_text_chunked(sample)
     print(result[:500])
-
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+PDF extractor backend benchmark scripti.
+
+Kurulu tüm backend'leri (pdfplumber, PyPDF2, pypdfium2, PyMuPDF) bir PDF
+korpusu üzerinde çalıştırır; sayfa/saniye, peak RSS ve referans backend'e
+göre metin uzunluğu uyumunu ölçer. Sonuç data/processed/extraction_benchmark.json
+dosyasına yazılır ve pipeline bir sonraki çalışmada eşiği geçen en hızlı
+backend'i otomatik seçer.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from core.extraction.backends import (
+    BENCHMARK_FILE,
+    FIDELITY_THRESHOLD,
+    available_backends,
+    benchmark_backends,
+    get_backend,
+    save_benchmark
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="PDF extractor backend'lerini karşılaştır ve en hızlısını seç"
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=str(project_root / "data" / "sample_reports"),
+        help="PDF klasörü (varsayılan: data/sample_reports)"
+    )
+    parser.add_argument(
+        "--backends",
+        type=str,
+        default=None,
+        help="Virgülle ayrılmış backend listesi (varsayılan: kurulu olanların hepsi)"
+    )
+    parser.add_argument(
+        "--reference",
+        type=str,
+        default="pdfplumber",
+        help="Metin uyumu için referans backend (varsayılan: pdfplumber)"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Ölçülecek en fazla dosya sayısı"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=str(BENCHMARK_FILE),
+        help="Sonuç JSON dosyası"
+    )
+    args = parser.parse_args()
+    
+    corpus_dir = Path(args.corpus)
+    pdf_files = sorted(corpus_dir.glob("*.pdf"))
+    if args.limit:
+        pdf_files = pdf_files[:args.limit]
+    
+    if not pdf_files:
+        print(f" PDF dosyası bulunamadı: {corpus_dir}")
+        sys.exit(1)
+    
+    backend_names = args.backends.split(",") if args.backends else None
+    
+    print("=" * 70)
+    print("PDF BACKEND BENCHMARK")
+    print("=" * 70)
+    print(f" Korpus: {corpus_dir} ({len(pdf_files)} dosya)")
+    print(f" Kurulu backend'ler: {', '.join(b.name for b in available_backends())}")
+    print()
+    
+    benchmark = benchmark_backends(pdf_files, backend_names, reference=args.reference)
+    output_path = save_benchmark(benchmark, Path(args.output))
+    
+    print(f"{'backend':<12} {'sayfa/sn':>10} {'peak RSS':>10} {'ort. uyum':>10} {'min uyum':>10}")
+    for name, stats in sorted(benchmark["summary"].items(), key=lambda item: -item[1]["pages_per_sec"]):
+        peak_rss = f"{stats['peak_rss_mb']:>8.0f}MB" if stats['peak_rss_mb'] is not None else f"{'-':>10}"
+        print(
+            f"{name:<12} {stats['pages_per_sec']:>10.1f} {peak_rss} "
+            f"{stats['mean_agreement']:>10.3f} {stats['min_agreement']:>10.3f}"
+        )
+    print()
+    print(f" Referans: {benchmark['reference']}, eşik: {FIDELITY_THRESHOLD}")
+    if Path(args.output) == BENCHMARK_FILE:
+        print(f" Seçilen backend: {get_backend().name}")
+    print(f" Sonuçlar kaydedildi: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
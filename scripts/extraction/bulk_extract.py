@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Toplu metin çıkarma scripti.
+
+Bir klasördeki tüm PDF/DOCX dosyalarını worker pool ile paralel çıkarır:
+    data/processed/texts/<id>.txt          - çıkarılmış metin
+    data/processed/texts/<id>.pages.json   - sayfa indeksi (PDF)
+    data/processed/texts/<id>.headings.json - başlık indeksi (PDF: yazı tipi, DOCX: stil)
+    data/processed/texts/manifest.json     - hash, sayfa, karakter, süre, backend, hata
+
+Manifest'te hash'i başarıyla kayıtlı olan dosyalar atlanır. Çıkarma
+extraction cache üzerinden yapıldığı için, sonradan çalışan scoring
+scriptleri (extract_text) aynı dosyaları yeniden çözmez; böylece çıkarma
+süresi öğrenci döngüsündeki LLM gecikmesiyle sıralı kalmaz.
+
+PDF sayfaları izole worker'da, sayfa başına süre ve bellek sınırıyla
+çıkarılır (bkz. core/extraction/isolation.py); tek sayfada takılan bir
+dosya tüm batch'i durdurmaz.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict
+
+# Proje root'unu path'e ekle
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from core.extraction import extract_text_with_pages, extractor_id, file_sha256
+from core.extraction.page_index import save_page_index
+from core.extraction.heading_index import build_heading_index, docx_heading_index, save_heading_index
+
+SUPPORTED_SUFFIXES = {'.pdf', '.docx'}
+MANIFEST_NAME = "manifest.json"
+MANIFEST_SAVE_EVERY = 10  # Kaç dosyada bir manifest diske yazılsın
+
+
+def safe_text_id(path: Path) -> str:
+    """Dosya adından güvenli bir metin ID'si oluştur"""
+    safe_name = "".join(c if c.isalnum() or c == "_" else "_" for c in path.stem)
+    while "__" in safe_name:
+        safe_name = safe_name.replace("__", "_")
+    return safe_name.strip("_") or "report"
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Dict]:
+    """Manifest'i yükle: {sha256: kayıt}"""
+    if not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text(encoding='utf-8')).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest_path: Path, entries: Dict[str, Dict]) -> None:
+    """Manifest'i yarım yazılmış dosya bırakmadan kaydet"""
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    tmp_path.write_text(
+        json.dumps({
+            "updated": datetime.now().isoformat(),
+            "total_files": len(entries),
+            "files": entries
+        }, ensure_ascii=False, indent=2),
+        encoding='utf-8'
+    )
+    tmp_path.replace(manifest_path)
+
+
+def extract_one(file_path: str, content_hash: str, text_id: str, output_dir: str) -> Dict:
+    """
+    Worker: tek dosyayı çıkarır ve metni + sayfa indeksini yazar.
+
+    Hata durumunda exception fırlatmaz; hata manifest kaydına yazılır.
+    """
+    path = Path(file_path)
+    entry = {
+        "id": text_id,
+        "source": path.name,
+        "sha256": content_hash,
+        "pages": None,
+        "chars": None,
+        "seconds": None,
+        "backend": None,
+        "headings": None,
+        "error": None,
+        "extracted_at": datetime.now().isoformat()
+    }
+
+    started = time.perf_counter()
+    try:
+        entry["backend"] = extractor_id(path.suffix.lower())
+        text, page_starts = extract_text_with_pages(path, isolated=True)
+
+        text_path = Path(output_dir) / f"{text_id}.txt"
+        text_path.write_text(text, encoding='utf-8')
+        if path.suffix.lower() == '.pdf':
+            save_page_index(text_path, page_starts, len(text))
+            entry["pages"] = len(page_starts)
+        entry["chars"] = len(text)
+
+        # Başlık indeksi yardımcı çıktı: başarısız olması metni geçersiz kılmaz
+        try:
+            if path.suffix.lower() == '.pdf':
+                # Metinle aynı sayfa başına süre/bellek sınırıyla (takılan PDF batch'i durdurmasın)
+                headings = build_heading_index(path, text, page_starts, isolated=True)
+            else:
+                headings = docx_heading_index(path)
+            save_heading_index(text_path, headings)
+            entry["headings"] = len(headings)
+        except Exception as e:
+            print(f" {path.name}: başlık indeksi oluşturulamadı ({e})")
+    except Exception as e:
+        entry["error"] = str(e)
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Klasördeki tüm PDF/DOCX dosyalarını paralel olarak metne çevir"
+    )
+    parser.add_argument(
+        "--input-dir",
+        type=str,
+        default=str(project_root / "data" / "ie_drive "),
+        help="PDF/DOCX klasörü (varsayılan: data/ie_drive)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=str(project_root / "data" / "processed" / "texts"),
+        help="Metin klasörü (varsayılan: data/processed/texts)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker sayısı (varsayılan: CPU sayısı)"
+    )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=None,
+        help="Sayfa başına süre sınırı, saniye (varsayılan: PDF_PAGE_TIMEOUT veya 60)"
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=None,
+        help="Çıkarma worker'ı bellek sınırı, MB (varsayılan: PDF_WORKER_MAX_RSS_MB veya 2048)"
+    )
+    parser.add_argument(
+        "--retry-errors",
+        action="store_true",
+        help="Manifest'te hatalı kayıtlı dosyaları tekrar dene"
+    )
+    args = parser.parse_args()
+
+    # Worker process'ler ortam değişkenlerini devralır
+    if args.page_timeout:
+        os.environ["PDF_PAGE_TIMEOUT"] = str(args.page_timeout)
+    if args.max_rss_mb:
+        os.environ["PDF_WORKER_MAX_RSS_MB"] = str(args.max_rss_mb)
+
+    input_dir = Path(args.input_dir)
+    output_dir = Path(args.output_dir)
+    if not input_dir.exists():
+        print(f" Klasör bulunamadı: {input_dir}")
+        sys.exit(1)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+
+    files = sorted(p for p in input_dir.rglob("*") if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES)
+
+    print("=" * 70)
+    print("TOPLU METİN ÇIKARMA")
+    print("=" * 70)
+    print(f" Klasör: {input_dir} ({len(files)} dosya)")
+    print()
+
+    # Hash'e göre atlanacakları belirle; aynı içerikli kopyalar bir kez çıkarılır
+    jobs = {}
+    used_ids = {entry.get("id") for entry in manifest.values()}
+    skipped = 0
+    for path in files:
+        content_hash = file_sha256(path)
+        existing = manifest.get(content_hash)
+        if existing and (not existing.get("error") or not args.retry_errors):
+            skipped += 1
+            continue
+        if content_hash in jobs:
+            skipped += 1
+            continue
+
+        text_id = existing.get("id") if existing else safe_text_id(path)
+        if not existing:
+            base_id, suffix_no = text_id, 2
+            while text_id in used_ids:
+                text_id = f"{base_id}_{suffix_no}"
+                suffix_no += 1
+            used_ids.add(text_id)
+        jobs[content_hash] = (path, text_id)
+
+    print(f" {skipped} dosya manifest'te kayıtlı, atlanıyor")
+    print(f" {len(jobs)} dosya çıkarılacak")
+    print()
+
+    started = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(extract_one, str(path), content_hash, text_id, str(output_dir))
+            for content_hash, (path, text_id) in jobs.items()
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            manifest[entry["sha256"]] = entry
+            if entry["error"]:
+                failed += 1
+                print(f" [{done}/{len(jobs)}] {entry['source']}: HATA - {entry['error']}")
+            else:
+                print(f" [{done}/{len(jobs)}] {entry['source']}: {entry['chars']:,} karakter, {entry['seconds']:.1f} sn")
+            if done % MANIFEST_SAVE_EVERY == 0:
+                save_manifest(manifest_path, manifest)
+
+    save_manifest(manifest_path, manifest)
+
+    print()
+    print("=" * 70)
+    print(f" Tamamlandı: {len(jobs) - failed} başarılı, {failed} hatalı, {skipped} atlandı")
+    print(f" Toplam süre: {time.perf_counter() - started:.1f} sn")
+    print(f" Manifest: {manifest_path}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
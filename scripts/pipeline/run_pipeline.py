@@ -21,7 +21,7 @@ from datetime import datetime
 from typing import Optional
 
 # Proje kökünü path'e ekle
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(PROJECT_ROOT))
 
 
@@ -45,20 +45,34 @@ def safe_report_id(name: str) -> str:
     return "report_000"
 
 
-def extract_text_from_pdf(pdf_path: Path) -> str:
-    """PDF'den metin çıkar (llm.tools.pdf_extractor'ı kullanarak)."""
-    from llm.tools.pdf_extractor import extract_text
+def triage_pdf(pdf_path: Path) -> dict:
+    """Pahalı adımlardan önce hızlı ön kontrol (core.extraction.triage)."""
+    from core.extraction import triage_document
 
-    return extract_text(str(pdf_path))
+    return triage_document(pdf_path)
 
 
-def save_text(report_id: str, text: str) -> Path:
-    """Metni `data/processed/texts/` klasörüne kaydet."""
+def extract_text_from_pdf(pdf_path: Path, ocr: bool = False) -> tuple[str, list[int]]:
+    """PDF'den metni ve sayfa başlangıç ofsetlerini çıkar (core.extraction).
+
+    ocr=True iken taranmış sayfalar OCR ile okunur (triage "ocr" yönlendirdiğinde).
+    """
+    from core.extraction import extract_text_with_pages
+
+    return extract_text_with_pages(pdf_path, ocr=ocr)
+
+
+def save_text(report_id: str, text: str, page_starts: Optional[list[int]] = None) -> Path:
+    """Metni (ve varsa sayfa indeksini) `data/processed/texts/` klasörüne kaydet."""
+    from core.extraction.page_index import save_page_index
+
     output_dir = PROJECT_ROOT / "data" / "processed" / "texts"
     output_dir.mkdir(parents=True, exist_ok=True)
 
     output_path = output_dir / f"{report_id}.txt"
     output_path.write_text(text, encoding="utf-8")
+    if page_starts:
+        save_page_index(output_path, page_starts, len(text))
     return output_path
 
 
@@ -179,12 +193,22 @@ def main() -> None:
 
     # 1) Metin çıkarımı
     extracted_text = None
+    page_starts = None
     saved_text_path = None
 
     if pdf_path:
+        triage = triage_pdf(pdf_path)
+        log(
+            f" Ön kontrol: {triage['route']} ({triage['page_count']} sayfa, "
+            f"{triage['size_bytes'] / 1024:.0f} KB, ~{triage['estimated_tokens']} token)"
+        )
+        if triage["route"] == "reject":
+            log(f" Rapor reddedildi: {'; '.join(triage['reasons'])}")
+            sys.exit(1)
+
         log(" PDF metin çıkarımı yapılıyor...")
         try:
-            extracted_text = extract_text_from_pdf(pdf_path)
+            extracted_text, page_starts = extract_text_from_pdf(pdf_path, ocr=triage["route"] == "ocr")
             log(f" Metin çıkarıldı: {len(extracted_text):,} karakter")
         except Exception as exc:
             log(f" Metin çıkarma hatası: {exc}")
@@ -193,7 +217,7 @@ def main() -> None:
         extracted_text = text_path.read_text(encoding="utf-8")
 
     # 2) Metni kaydet
-    saved_text_path = save_text(report_id, extracted_text)
+    saved_text_path = save_text(report_id, extracted_text, page_starts)
     log(f" Metin kaydedildi: {saved_text_path}")
 
     # 3) Anonimleştirme
@@ -9,21 +9,36 @@ import pandas as pd
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from tqdm import tqdm
 
 # Proje root'unu path'e ekle
 project_root = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(project_root))
 
-from scripts.scoring.common import extract_and_segment_pdf
+from scripts.scoring.common import (
+    AttemptIndex,
+    CRITERION_RUBRIC_IDS,
+    PIPELINE_PROFILES,
+    PROFILE_FRONT_MATTER,
+    PROFILE_FULL,
+    extract_and_segment_pdf,
+    pages_for_criteria,
+    segment_truncated
+)
 from core.scoring import (
     find_cover_segment,
     find_executive_summary_segment,
+    load_cover_prompt,
+    load_executive_prompt,
     score_cover_segment,
-    score_executive_summary
+    score_executive_summary,
+    scoring_fingerprint
 )
 from core.anonymization import Anonymizer
+from core.dedup import SubmissionIndex, content_sha256
+from core.llm import get_response_cache
+from core.extraction import extract_text_with_pages, triage_document
 
 
 def load_real_scores(excel_path: Path) -> pd.DataFrame:
@@ -38,20 +53,79 @@ def load_real_scores(excel_path: Path) -> pd.DataFrame:
     return df
 
 
-def find_student_file(student_id: str, ie_drive_dir: Path) -> Optional[Path]:
+def find_student_file(student_id: str, attempt_index: AttemptIndex) -> Optional[Path]:
+    """
+    Öğrenci ID'sine göre en son denemenin PDF/DOCX dosyasını bul.
+    
+    attempt_index klasör başına bir kez kurulur (bkz. AttemptIndex); eski
+    denemeler notlandırılmaz.
     """
-    Öğrenci ID'sine göre PDF/DOCX dosyasını bul.
+    return attempt_index.find(student_id)
+
+
+def find_duplicate_submission(
+    dedup_index: Optional[SubmissionIndex],
+    pdf_file: Path,
+    pages: Optional[range]
+) -> Tuple[Optional[Dict], Optional[List[Dict]]]:
     """
-    # Öğrenci ID'si ile başlayan dosyaları ara
-    pattern = f"*{student_id}*"
-    matches = list(ie_drive_dir.glob(pattern))
+    Daha önce notlandırılmış, neredeyse aynı gönderimi bulur.
     
-    # PDF veya DOCX dosyasını bul
-    for match in matches:
-        if match.suffix.lower() in ['.pdf', '.docx']:
-            return match
+    Returns:
+        (index kaydı, referans bölümleri) - bulunamazsa (None, None); kaydın
+        segmentasyon dosyası silinmişse bölümler None
+    """
+    if dedup_index is None:
+        return None, None
+    
+    # Extraction cache sayesinde extract_and_segment_pdf metni yeniden çözmez
+    text, _ = extract_text_with_pages(pdf_file, pages=pages, isolated=True)
+    match = dedup_index.find_duplicate(text, scope=list(pages) if pages is not None else None)
+    if match is None:
+        return None, None
     
-    return None
+    entry, similarity = match
+    entry = {**entry, "similarity": round(similarity, 3)}
+    print(f" Benzer gönderim bulundu: {entry['source_name']} ({entry['student_id']}, benzerlik {similarity:.2f})")
+    try:
+        reference = json.loads(Path(entry["segmentation_file"]).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return entry, None
+    return entry, reference.get("segmentation", {}).get("sections")
+
+
+def _same_segment(duplicate: Optional[Dict], criterion: str, content: str) -> bool:
+    """Benzer gönderimde bu kriterin segmenti aynı içerikle notlandırılmış mı?"""
+    if not duplicate:
+        return False
+    stored = duplicate.get("scores", {}).get(criterion)
+    return bool(stored) and stored.get("content_sha") == content_sha256(content)
+
+
+def _scoring_fingerprint(criterion: str) -> str:
+    """Kriterin puanlama prompt'u, modeli ve generation config'inin özeti"""
+    prompt_template = load_cover_prompt() if criterion == "cover" else load_executive_prompt()
+    return scoring_fingerprint(prompt_template)
+
+
+def _reused_score(duplicate: Optional[Dict], criterion: str, content: str, student_id: str) -> Optional[Dict]:
+    """
+    Aynı öğrencinin önceki denemesinde aynı içerikle notlandırılmış segmentin skoru.
+    
+    Skor yalnızca aynı öğrencinin denemeleri arasında ve aynı puanlama
+    ayarlarıyla (prompt, model, generation config; bkz. _scoring_fingerprint)
+    üretildiyse yeniden kullanılır. Başka bir öğrencinin gönderimiyle aynı
+    segment yeniden notlandırılır ve sonuçta "identical_segments" ile
+    işaretlenir (bkz. score_student_report).
+    """
+    if not duplicate or duplicate.get("student_id") != student_id:
+        return None
+    if not _same_segment(duplicate, criterion, content):
+        return None
+    stored = duplicate["scores"][criterion]
+    if stored.get("fingerprint") != _scoring_fingerprint(criterion):
+        return None
+    return stored.get("result")
 
 
 def score_student_report(
@@ -59,11 +133,27 @@ def score_student_report(
     pdf_file: Path,
     api_key: str,
     score_cover: bool = False,
-    score_executive: bool = True
+    score_executive: bool = True,
+    profile: str = PROFILE_FULL,
+    dedup_index: Optional[SubmissionIndex] = None
 ) -> Dict:
     """
     Bir öğrencinin raporunu notlandır.
     
+    Varsayılan "full" profilde rapor tamamıyla işlenir. İsteğe bağlı
+    "front-matter" profilinde yalnızca kriterlerin ihtiyaç duyduğu ilk
+    sayfalar çıkarılıp segment edilir; istenen segment bu sayfalarda
+    bulunamazsa ya da son çıkarılan sayfada bitiyorsa (kesilmiş olabilir)
+    rapor bir kez de tamamıyla işlenir.
+    
+    dedup_index verilirse, neredeyse aynı bir gönderim daha önce
+    notlandırılmışsa onun segmentasyonu yeni metne hizalanır. Gönderim aynı
+    öğrencinin önceki denemesiyse içeriği ve puanlama ayarları (prompt,
+    model) değişmeyen segmentlerin skorları LLM çağrılmadan yeniden
+    kullanılır; başka bir öğrencininkiyse segmentler
+    yeniden notlandırılır ve aynı içerikliler "identical_segments" ile
+    işaretlenir.
+    
     Returns:
         {
             "student_id": str,
@@ -78,20 +168,81 @@ def score_student_report(
         "status": "error",
         "cover_score": None,
         "executive_score": None,
-        "error": None
+        "error": None,
+        "profile": profile
     }
     
     try:
+        # Şifreli, boş ya da çok büyük raporları çıkarma/LLM'den önce ele
+        triage = triage_document(pdf_file)
+        result["triage_route"] = triage["route"]
+        if triage["route"] == "reject":
+            result["error"] = f"Triage: {'; '.join(triage['reasons'])}"
+            return result
+        
         # PDF'yi işle ve segmentasyon yap
-        fixed_data, fixed_file, text = extract_and_segment_pdf(pdf_file)
+        criteria = [name for name, enabled in (("cover", score_cover), ("executive", score_executive)) if enabled]
+        required_criteria = [CRITERION_RUBRIC_IDS[name] for name in criteria]
+        pages = pages_for_criteria(criteria) if profile == PROFILE_FRONT_MATTER else None
+        duplicate, reference_sections = find_duplicate_submission(dedup_index, pdf_file, pages)
+        fixed_data, fixed_file, text = extract_and_segment_pdf(
+            pdf_file,
+            pages=pages,
+            isolated=True,
+            required_criteria=required_criteria,
+            reference_sections=reference_sections,
+            ocr=triage["route"] == "ocr"
+        )
+        
+        found = []
+        if score_cover:
+            found.append(find_cover_segment(fixed_data))
+        if score_executive:
+            found.append(find_executive_summary_segment(fixed_data))
+        if pages is not None and any(
+            not segment or segment_truncated(segment, fixed_data, text, pages)
+            for segment in found
+        ):
+            # Ön kısımda bulunamadı ya da son sayfada kesilmiş olabilir: tüm raporla tekrar dene
+            result["profile"] = PROFILE_FULL
+            pages = None
+            duplicate, reference_sections = find_duplicate_submission(dedup_index, pdf_file, pages)
+            fixed_data, fixed_file, text = extract_and_segment_pdf(
+                pdf_file,
+                isolated=True,
+                required_criteria=required_criteria,
+                reference_sections=reference_sections,
+                ocr=triage["route"] == "ocr"
+            )
+        
+        if duplicate:
+            result["duplicate_of"] = {
+                "student_id": duplicate["student_id"],
+                "source_name": duplicate["source_name"],
+                "similarity": duplicate["similarity"]
+            }
         
         scores = {}
+        score_records = {}  # Dedup indeksi için: kriter -> segment özeti + sonuç
+        reused = []
+        identical = []  # Başka öğrencinin gönderimiyle aynı içerikli segmentler (inceleme için)
         
         # Cover scoring
         if score_cover:
             cover_segment = find_cover_segment(fixed_data)
             if cover_segment:
-                cover_result = score_cover_segment(cover_segment, api_key)
+                cover_result = _reused_score(duplicate, "cover", cover_segment.get("content", ""), student_id)
+                if cover_result is not None:
+                    reused.append("cover")
+                else:
+                    if _same_segment(duplicate, "cover", cover_segment.get("content", "")):
+                        identical.append("cover")
+                    cover_result = score_cover_segment(cover_segment, api_key)
+                score_records["cover"] = {
+                    "content_sha": content_sha256(cover_segment.get("content", "")),
+                    "fingerprint": _scoring_fingerprint("cover"),
+                    "result": cover_result
+                }
                 scores["cover"] = {
                     "score_0_10": cover_result.get("score", 0.0),
                     "score_scaled_0_10": cover_result.get("score", 0.0),  # Cover zaten 0-10
@@ -112,7 +263,18 @@ def score_student_report(
                 executive_segment_anon = executive_segment.copy()
                 executive_segment_anon["content"] = anonymized_content
                 
-                executive_result = score_executive_summary(executive_segment_anon, api_key)
+                executive_result = _reused_score(duplicate, "executive", original_content, student_id)
+                if executive_result is not None:
+                    reused.append("executive")
+                else:
+                    if _same_segment(duplicate, "executive", original_content):
+                        identical.append("executive")
+                    executive_result = score_executive_summary(executive_segment_anon, api_key)
+                score_records["executive"] = {
+                    "content_sha": content_sha256(original_content),
+                    "fingerprint": _scoring_fingerprint("executive"),
+                    "result": executive_result
+                }
                 # Executive Summary maksimum 6 puan (0-6 arası)
                 # Kriter ortalamasını kullan (LLM'in döndürdüğü score değil)
                 criteria = executive_result.get("criteria", {})
@@ -138,6 +300,24 @@ def score_student_report(
         result["status"] = "success"
         result["scores"] = scores
         result["segmentation_file"] = fixed_file.name
+        if reused:
+            result["reused_scores"] = reused
+        if identical:
+            # Başka öğrencinin gönderimiyle birebir aynı segment: skor kopyalanmaz,
+            # not veren kişinin incelemesi için işaretlenir
+            result["identical_segments"] = identical
+            print(f" {student_id}: {', '.join(identical)} segmenti {duplicate['student_id']} ile aynı (inceleme için işaretlendi)")
+        
+        if dedup_index is not None:
+            dedup_index.add(
+                text,
+                student_id=student_id,
+                source_name=pdf_file.name,
+                segmentation_file=fixed_file,
+                scores=score_records,
+                scope=list(pages) if pages is not None else None
+            )
+            dedup_index.save()
         
     except Exception as e:
         result["error"] = str(e)
@@ -213,6 +393,17 @@ def main():
         action="store_true",
         help="Cover'ı da notlandır"
     )
+    parser.add_argument(
+        "--profile",
+        choices=PIPELINE_PROFILES,
+        default=PROFILE_FULL,
+        help="full: tüm raporu işle (varsayılan), front-matter: yalnızca kriterlerin gerektirdiği ilk sayfalar"
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Neredeyse aynı gönderimlerin segmentasyon/skorlarını yeniden kullanma"
+    )
     parser.add_argument(
         "--skip-existing",
         action="store_true",
@@ -241,8 +432,11 @@ def main():
     print(f" Excel dosyası yüklendi: {len(real_scores_df)} öğrenci")
     print()
     
-    # ie_drive klasörü
+    # ie_drive klasörü: öğrenci -> en son deneme indeksi (bir kez taranır)
     ie_drive_dir = project_root / "data" / "ie_drive "
+    attempt_index = AttemptIndex(ie_drive_dir)
+    print(f" Gönderim indeksi: {attempt_index.summary()}")
+    print()
     
     # Öğrencileri seç
     students = real_scores_df
@@ -266,6 +460,11 @@ def main():
     results = existing_results.copy()
     existing_ids = {r["student_id"] for r in existing_results}
     
+    dedup_index = None if args.no_dedup else SubmissionIndex()
+    if dedup_index is not None:
+        print(f" Dedup indeksi: {len(dedup_index.entries)} notlandırılmış gönderim ({dedup_index.index_path})")
+        print()
+    
     # Her öğrenciyi notlandır
     for idx, row in tqdm(students.iterrows(), total=len(students), desc="Notlandırılıyor"):
         student_id = str(row.iloc[0])
@@ -275,7 +474,7 @@ def main():
             continue
         
         # PDF dosyasını bul
-        pdf_file = find_student_file(student_id, ie_drive_dir)
+        pdf_file = find_student_file(student_id, attempt_index)
         if not pdf_file:
             results.append({
                 "student_id": student_id,
@@ -290,7 +489,9 @@ def main():
             pdf_file=pdf_file,
             api_key=api_key,
             score_cover=args.score_cover,
-            score_executive=True
+            score_executive=True,
+            profile=args.profile,
+            dedup_index=dedup_index
         )
         
         results.append(result)
@@ -319,6 +520,11 @@ def main():
     print("SONUÇLAR KAYDEDİLDİ")
     print("=" * 80)
     print(f" Dosya: {results_file}")
+    cache_stats = get_response_cache().stats()
+    print(
+        f" LLM yanıt cache'i: {cache_stats['hits']} isabet, {cache_stats['misses']} istek "
+        f"({cache_stats['entries']} kayıt, {cache_stats['size_bytes'] / (1024 * 1024):.1f} MB)"
+    )
     print()
     
     # Gerçek notlarla karşılaştır
@@ -1,35 +1,168 @@
 """
 Ortak yardımcı fonksiyonlar - PDF işleme, segmentation, vb.
 """
+import re
 import sys
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Proje root'unu path'e ekle
 project_root = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(project_root))
 
 # Yeni core modüllerini kullan
-from core.extraction import extract_text_from_pdf, extract_text_from_docx
-from core.segmentation import segment_text_chunked, fix_segmentation
-
-# Backward compatibility için eski import'ları da destekle
-try:
-    from llm.tools.pdf_extractor import extract_text
-except ImportError:
-    # Eğer eski yapı yoksa, yeni yapıdan extract_text oluştur
-    def extract_text(file_path):
-        """Backward compatibility için extract_text fonksiyonu"""
-        from pathlib import Path
-        path = Path(file_path)
-        if path.suffix.lower() == '.pdf':
-            return extract_text_from_pdf(path)
-        elif path.suffix.lower() == '.docx':
-            return extract_text_from_docx(path)
-        else:
-            return path.read_text(encoding='utf-8')
+from core.segmentation import (
+    chunk_strategy,
+    segment_text_chunked,
+    fix_segmentation,
+    segment_from_outline,
+    segment_from_headings,
+    segment_from_reference
+)
+
+from core.extraction import extract_text_with_pages, iter_docx_headings, read_pdf_outline
+from core.extraction.page_index import annotate_sections_with_pages
+from core.extraction.boilerplate import estimate_tokens, remap_sections, strip_repeated_lines, to_clean_offset
+from core.extraction.heading_index import build_heading_index
+
+
+# Pipeline profilleri: "full" tüm raporu, "front-matter" yalnızca istenen
+# rubrik kriterlerinin ihtiyaç duyduğu ilk sayfaları çıkarır ve segment eder
+PROFILE_FULL = "full"
+PROFILE_FRONT_MATTER = "front-matter"
+PIPELINE_PROFILES = (PROFILE_FULL, PROFILE_FRONT_MATTER)
+
+# Rubrik kriteri -> bölümün arandığı ilk sayfa sayısı.
+# Kapak 1. sayfadadır; yönetici özeti kapak, içindekiler ve teşekkür
+# sayfalarından sonra gelir.
+FRONT_MATTER_PAGES = {
+    "cover": 1,
+    "executive": 8,
+}
+
+# Kriter -> rubrik ID'si (outline hızlı yolunun kapsaması gerekenler)
+CRITERION_RUBRIC_IDS = {
+    "cover": "B9",
+    "executive": "B1",
+}
+
+
+def pages_for_criteria(criteria: Iterable[str]) -> Optional[range]:
+    """
+    Ön kısım profilinde çıkarılacak sayfa aralığını döndürür.
+    
+    Args:
+        criteria: Notlandırılacak kriterler (örn. ["cover", "executive"])
+        
+    Returns:
+        range(0, N) veya ön kısımda olmayan bir kriter varsa None (tüm rapor)
+    """
+    criteria = list(criteria)
+    if not criteria or any(name not in FRONT_MATTER_PAGES for name in criteria):
+        return None
+    return range(0, max(FRONT_MATTER_PAGES[name] for name in criteria))
+
+
+def segment_truncated(segment: Optional[Dict], fixed_data: Dict, text: str, pages: Optional[range]) -> bool:
+    """
+    Ön kısım profilinde bulunan segment sayfa sınırında kesilmiş olabilir mi?
+    
+    Segment çıkarılan metnin sonunda ya da son çıkarılan sayfada bitiyorsa
+    ve rapor istenen sayfa sayısından uzunsa (son sayfa gerçekten sınır
+    ise) True döner; bu durumda segment tüm raporla yeniden çıkarılmalıdır.
+    """
+    if not segment or pages is None:
+        return False
+    page_starts = fixed_data.get('source_metadata', {}).get('page_starts') or []
+    if page_starts and len(page_starts) < len(pages):
+        # Rapor front-matter aralığından kısa: metnin tamamı zaten çıkarıldı
+        return False
+    end = segment.get('end_idx', 0)
+    if end >= len(text.rstrip()):
+        return True
+    return bool(page_starts) and end > page_starts[-1]
+
+
+# LMS dışa aktarım adı: Internship_Report_<user>_attempt_<YYYY_MM_DD_HH_MM_SS>_<yüklenen dosya adı>
+LMS_ATTEMPT_PATTERN = re.compile(
+    r"(?:^|_)(?P<user>[^_]+)_attempt_(?P<timestamp>\d{4}(?:_\d{2}){5})(?:_|$)"
+)
+
+SUBMISSION_SUFFIXES = ('.pdf', '.docx')
+
+
+def parse_attempt_name(filename: str) -> Optional[Tuple[str, str]]:
+    """
+    LMS dosya adından öğrenci kullanıcı adını ve deneme zamanını çıkarır.
+    
+    Returns:
+        (user, timestamp) - timestamp "YYYY_MM_DD_HH_MM_SS" (sabit genişlikte,
+        metin olarak karşılaştırılabilir); ad bu biçimde değilse None
+    """
+    match = LMS_ATTEMPT_PATTERN.search(Path(filename).stem)
+    if not match:
+        return None
+    return match.group("user"), match.group("timestamp")
+
+
+class AttemptIndex:
+    """
+    LMS dışa aktarım klasörünün öğrenci -> en son deneme indeksi.
+    
+    Klasör bir kez taranır; her öğrenci için yalnızca en son deneme tutulur,
+    eski denemeler hiç notlandırılmaz (LLM kotası harcanmaz). Aynı denemede
+    hem PDF hem DOCX varsa PDF seçilir.
+    """
+    
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.latest: Dict[str, Tuple[str, Path]] = {}  # user -> (timestamp, dosya)
+        self.unparsed: List[Path] = []  # LMS biçiminde olmayan dosyalar
+        self.superseded = 0
+        
+        files = sorted(
+            (p for p in self.directory.glob("*") if p.is_file() and p.suffix.lower() in SUBMISSION_SUFFIXES),
+            key=lambda p: SUBMISSION_SUFFIXES.index(p.suffix.lower())
+        )
+        for path in files:
+            parsed = parse_attempt_name(path.name)
+            if parsed is None:
+                self.unparsed.append(path)
+                continue
+            user, timestamp = parsed
+            current = self.latest.get(user)
+            if current is None or timestamp > current[0]:
+                if current is not None:
+                    self.superseded += 1
+                self.latest[user] = (timestamp, path)
+            else:
+                self.superseded += 1
+    
+    def find(self, student_id: str) -> Optional[Path]:
+        """
+        Öğrencinin en son deneme dosyasını döndürür.
+        
+        Kullanıcı adı birebir eşleşmezse, eski davranıştaki gibi adında
+        öğrenci ID'si geçen dosyaya bakılır (önce en son denemeler).
+        """
+        if student_id in self.latest:
+            return self.latest[student_id][1]
+        for _, path in self.latest.values():
+            if student_id in path.name:
+                return path
+        for path in self.unparsed:
+            if student_id in path.name:
+                return path
+        return None
+    
+    def summary(self) -> str:
+        """Tek satırlık özet (loglama için)"""
+        return (
+            f"{len(self.latest)} öğrenci (en son deneme), {self.superseded} eski deneme atlandı, "
+            f"{len(self.unparsed)} LMS biçiminde olmayan dosya"
+        )
 
 
 def get_safe_filename(path: Path) -> str:
@@ -70,26 +203,122 @@ def find_pdf_file(pdf_arg: Optional[str], default: str = "ömer_bilbil.pdf") ->
         return project_root / "data" / "sample_reports" / default
 
 
-def extract_and_segment_pdf(pdf_file: Path) -> tuple[Dict, Path, str]:
+def extract_and_segment_pdf(
+    pdf_file: Path,
+    pages: Optional[range] = None,
+    isolated: bool = False,
+    required_criteria: Optional[Iterable[str]] = None,
+    strip_boilerplate: bool = True,
+    reference_sections: Optional[List[Dict]] = None,
+    ocr: bool = False
+) -> tuple[Dict, Path, str]:
     """
     PDF'den metni çıkar, segmentasyon yap ve fix uygula.
     
     Args:
         pdf_file: PDF dosya yolu
+        pages: Yalnızca bu sayfaları işle (0'dan başlayan aralık, bkz.
+               pages_for_criteria); None ise tüm rapor
+        isolated: PDF sayfalarını sayfa başına süre/bellek sınırlı izole
+                  worker'da çıkar (batch'te takılan dosyalar için)
+        required_criteria: PDF outline'ı / DOCX başlık stilleri bu rubrik
+                           kriterlerini (örn. ["B1"]) kapsıyorsa LLM
+                           segmentasyonu atlanır; None ise B1-B9
+        strip_boilerplate: LLM'e gönderilmeden önce tekrar eden üst/alt
+                           bilgi ve sayfa numaraları çıkarılır (PDF); bölüm
+                           ofsetleri sonra ham metne geri çevrilir
+        reference_sections: Neredeyse aynı, daha önce segment edilmiş bir
+                            gönderimin bölümleri (bkz. core/dedup); yeni
+                            metne hizalanabilirse LLM segmentasyonu atlanır
+        ocr: Taranmış PDF sayfalarını OCR ile oku (triage "ocr" yönlendirdiğinde)
         
     Returns:
         (fixed_segmentation_data, fixed_file_path, original_text) tuple
     """
-    # 1. Metni çıkar
+    # 1. Metni çıkar (sayfa başlangıç ofsetleriyle birlikte)
     print(" Metin çıkarılıyor...")
-    text = extract_text(str(pdf_file))
-    print(f" Metin çıkarıldı: {len(text):,} karakter")
+    text, page_starts = extract_text_with_pages(pdf_file, pages=pages, isolated=isolated, ocr=ocr)
+    if pages is not None and pdf_file.suffix.lower() == '.pdf':
+        print(f" Metin çıkarıldı: {len(text):,} karakter (ilk {len(page_starts)} sayfa)")
+    else:
+        print(f" Metin çıkarıldı: {len(text):,} karakter")
     print()
     
-    # 2. Segmentasyon yap
-    print(" Segmentation yapılıyor...")
-    print()
-    result_json = segment_text_chunked(text)
+    # 2. Segmentasyon yap: önce referans gönderim / PDF outline / DOCX başlık
+    #    stilleri (hızlı yollar), kapsamıyorsa LLM
+    result_json = None
+    if reference_sections:
+        result_json = segment_from_reference(
+            reference_sections,
+            text,
+            required_criteria=required_criteria
+        )
+        source_label = "Benzer gönderimin segmentasyonu"
+    if not result_json and pdf_file.suffix.lower() == '.pdf':
+        result_json = segment_from_outline(
+            read_pdf_outline(pdf_file),
+            text,
+            page_starts,
+            required_criteria=required_criteria
+        )
+        source_label = "PDF outline"
+    elif not result_json and pdf_file.suffix.lower() == '.docx':
+        result_json = segment_from_headings(
+            iter_docx_headings(pdf_file),
+            text,
+            required_criteria=required_criteria
+        )
+        source_label = "DOCX başlık stilleri"
+    if result_json:
+        print(f" {source_label} rubrik bölümlerini kapsıyor, LLM segmentasyonu atlandı")
+        print()
+    else:
+        llm_text, offset_map, removed_lines = text, None, 0
+        if strip_boilerplate and pdf_file.suffix.lower() == '.pdf':
+            llm_text, offset_map, removed_lines = strip_repeated_lines(text, page_starts)
+        if removed_lines:
+            raw_tokens, clean_tokens = estimate_tokens(text), estimate_tokens(llm_text)
+            print(
+                f" Tekrar eden üst/alt bilgi temizlendi: {removed_lines} satır, "
+                f"~{raw_tokens:,} -> ~{clean_tokens:,} token "
+                f"(-%{100 * (raw_tokens - clean_tokens) / raw_tokens:.1f})"
+            )
+        heading_offsets = None
+        if chunk_strategy() == "headings" and pdf_file.suffix.lower() == '.pdf':
+            # Chunk sınırları için yazı tipi başlık indeksi (regex tahmini yerine)
+            try:
+                headings = build_heading_index(pdf_file, text, page_starts, pages=pages, isolated=isolated)
+                heading_offsets = [
+                    to_clean_offset(offset_map, heading["char_start"]) if removed_lines else heading["char_start"]
+                    for heading in headings
+                ]
+                print(f" Başlık indeksi: {len(heading_offsets)} başlık (chunk sınırları için)")
+            except Exception as e:
+                print(f" Başlık indeksi oluşturulamadı, başlıklar metinden tahmin edilecek ({e})")
+        print(" Segmentation yapılıyor...")
+        print()
+        result_json = segment_text_chunked(llm_text, heading_offsets=heading_offsets)
+        
+        if removed_lines:
+            # LLM ofsetleri temiz metne göre: ham metne (page_starts) geri çevir
+            seg_data = json.loads(result_json)
+            remap_sections(
+                seg_data.get('segmentation', {}).get('sections', []),
+                offset_map,
+                text,
+                len(llm_text)
+            )
+            seg_data.setdefault('source_metadata', {}).update({
+                "total_length": len(text),
+                "boilerplate": {
+                    "removed_lines": removed_lines,
+                    "raw_chars": len(text),
+                    "clean_chars": len(llm_text),
+                    "raw_tokens_est": raw_tokens,
+                    "clean_tokens_est": clean_tokens
+                }
+            })
+            result_json = json.dumps(seg_data, ensure_ascii=False, indent=2)
     
     # Segmentasyon JSON'unu parse et
     seg_data = json.loads(result_json)
@@ -119,6 +348,16 @@ def extract_and_segment_pdf(pdf_file: Path) -> tuple[Dict, Path, str]:
     print()
     fixed_data = fix_segmentation(seg_file, text)
     
+    # Sayfa indeksi: start_idx/end_idx -> sayfa numarası (DOCX'te sayfa yok)
+    if pdf_file.suffix.lower() == '.pdf':
+        fixed_data.setdefault('source_metadata', {})['page_starts'] = page_starts
+        if pages is not None:
+            fixed_data['source_metadata']['extracted_pages'] = [pages.start, pages.start + len(page_starts)]
+        annotate_sections_with_pages(
+            fixed_data.get('segmentation', {}).get('sections', []),
+            page_starts
+        )
+    
     # Fixed dosyayı kaydet
     fixed_file = seg_file.with_suffix('.fixed.json')
     fixed_file.write_text(
@@ -163,7 +402,9 @@ def save_score_result(
             "section_name": segment.get("section_name", ""),
             "content": segment.get("content", ""),
             "level": segment.get("level", 1),
-            "parent_id": segment.get("parent_id")
+            "parent_id": segment.get("parent_id"),
+            "start_page": segment.get("start_page"),
+            "end_page": segment.get("end_page")
         },
         "score": {
             "total_score": score_result.get("score", 0.0),
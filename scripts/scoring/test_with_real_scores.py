@@ -14,7 +14,7 @@ from typing import Dict, List, Optional
 project_root = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(project_root))
 
-from scripts.scoring.common import find_pdf_file, extract_and_segment_pdf
+from scripts.scoring.common import AttemptIndex, find_pdf_file, extract_and_segment_pdf
 from core.scoring import (
     find_executive_summary_segment,
     score_executive_summary
@@ -37,27 +37,18 @@ def load_real_scores(excel_path: Path) -> pd.DataFrame:
     return df
 
 
-def find_student_pdf(student_id: str, ie_drive_dir: Path) -> Optional[Path]:
+def find_student_pdf(student_id: str, attempt_index: AttemptIndex) -> Optional[Path]:
     """
-    Öğrenci ID'sine göre PDF dosyasını bul.
+    Öğrenci ID'sine göre en son denemenin PDF/DOCX dosyasını bul.
     
     Args:
         student_id: Öğrenci ID (örn: "akarir")
-        ie_drive_dir: ie_drive klasör yolu
+        attempt_index: ie_drive klasörünün deneme indeksi (bkz. AttemptIndex)
         
     Returns:
         PDF dosya yolu veya None
     """
-    # Öğrenci ID'si ile başlayan dosyaları ara
-    pattern = f"*{student_id}*"
-    matches = list(ie_drive_dir.glob(pattern))
-    
-    # PDF veya DOCX dosyasını bul
-    for match in matches:
-        if match.suffix.lower() in ['.pdf', '.docx']:
-            return match
-    
-    return None
+    return attempt_index.find(student_id)
 
 
 def test_executive_summary_scoring(
@@ -175,8 +166,9 @@ def main():
     print(f"   Sütunlar: {list(df.columns[:5])}...")
     print()
     
-    # ie_drive klasörü
+    # ie_drive klasörü: öğrenci -> en son deneme indeksi (bir kez taranır)
     ie_drive_dir = project_root / "data" / "ie_drive "
+    attempt_index = AttemptIndex(ie_drive_dir)
     
     # Test edilecek öğrencileri seç
     if args.student_id:
@@ -201,7 +193,7 @@ def main():
         print(f" {student_id}: Gerçek not = {real_score}/{max_score}")
         
         # PDF dosyasını bul
-        pdf_file = find_student_pdf(student_id, ie_drive_dir)
+        pdf_file = find_student_pdf(student_id, attempt_index)
         if not pdf_file:
             print(f"    PDF dosyası bulunamadı")
             results.append({
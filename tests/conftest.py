@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
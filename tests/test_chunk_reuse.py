@@ -0,0 +1,94 @@
+"""Düzeltilmiş raporda yalnızca değişen chunk'ın LLM'e gönderildiğini doğrular"""
+import json
+import random
+import threading
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("google.generativeai")
+
+from core.llm import rate_limiter, response_cache
+from core.segmentation import segmenter
+
+
+def _report(seed: int, paragraphs: int = 300) -> str:
+    """DOCX çıkarımı gibi tek satır sonuyla ayrılmış, uzunlukları değişen paragraflar"""
+    rng = random.Random(seed)
+    words = ["".join(rng.choice("abcdefghijklmnoprstuvyz") for _ in range(rng.randint(2, 9))) for _ in range(2000)]
+    return "\n".join(" ".join(rng.choices(words, k=rng.randint(10, 150))) for _ in range(paragraphs))
+
+
+class _CountingModel:
+    """Chunk'ı tek bölüm olarak döndüren ve çağrıları sayan sahte model"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str):
+        with self._lock:
+            self.calls += 1
+        chunk_text = prompt.split("TEXT_START\n", 1)[1].rsplit("\nTEXT_END", 1)[0]
+        section = {
+            "section_id": "s1",
+            "section_name": "Body",
+            "content": chunk_text,
+            "start_idx": 0,
+            "end_idx": len(chunk_text),
+            "level": 1,
+            "parent_id": None
+        }
+        return types.SimpleNamespace(text=json.dumps({"segmentation": {"sections": [section]}}))
+
+
+@pytest.fixture
+def counting_model(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.sqlite3"))
+    monkeypatch.setenv("RATE_LIMIT_DIR", str(tmp_path / "rate_limits"))
+    monkeypatch.setenv("GEMINI_RPM", "0")
+    monkeypatch.setenv("GEMINI_TPM", "0")
+    monkeypatch.setenv("SEGMENT_CHUNK_STRATEGY", "paragraph")
+    monkeypatch.setenv("SEGMENT_OUTPUT_MODE", "content")
+    monkeypatch.delenv("LLM_CACHE_DISABLED", raising=False)
+    monkeypatch.setattr(response_cache, "_cache", None)
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+
+    model = _CountingModel()
+    monkeypatch.setattr(segmenter, "_segmentation_model", lambda api_key=None: model)
+    return model
+
+
+def _edit_inside(text: str, chunks: list, index: int) -> str:
+    """index. chunk'ın yalnızca kendisine ait (overlap dışı) kısmının ortasına cümleler ekler"""
+    own_start, own_end = chunks[index - 1][1], chunks[index + 1][0]
+    position = text.index(" ", (own_start + own_end) // 2)
+    return text[:position] + " Eklenen bir cümle daha." * 10 + text[position:]
+
+
+def test_edited_paragraph_resends_only_its_chunk(counting_model):
+    text = _report(seed=2)
+    chunks = segmenter.split_text_into_chunks(text)
+    assert len(chunks) > 3
+
+    segmenter.segment_text_chunked(text)
+    assert counting_model.calls == len(chunks)
+
+    for index in range(1, len(chunks) - 1):
+        counting_model.calls = 0
+        segmenter.segment_text_chunked(_edit_inside(text, chunks, index))
+        assert counting_model.calls == 1, f"chunk {index} düzeltmesi"
+
+
+@pytest.mark.parametrize("seed", [1, 6, 9])
+def test_chunk_boundaries_resync_after_edit(seed):
+    # Düzeltme chunk'ın sonunu kaydırsa da sonraki kesme noktaları değişmemeli
+    text = _report(seed)
+    chunks = segmenter.split_text_into_chunks(text)
+    old_texts = {chunk_text for _, _, chunk_text in chunks}
+
+    for index in range(1, len(chunks) - 1):
+        edited_chunks = segmenter.split_text_into_chunks(_edit_inside(text, chunks, index))
+        changed = [chunk_text for _, _, chunk_text in edited_chunks if chunk_text not in old_texts]
+        assert len(changed) == 1, f"chunk {index} düzeltmesi"
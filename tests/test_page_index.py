@@ -0,0 +1,34 @@
+"""page_index ofset -> sayfa dönüşümü testleri"""
+from core.extraction.page_index import page_for_offset, page_range_for_span
+from core.extraction.pdf_extractor import PAGE_SEPARATOR, _join_units, _with_offsets
+
+
+def _layout(pages):
+    units = list(_with_offsets(pages, PAGE_SEPARATOR))
+    return _join_units(units, PAGE_SEPARATOR), [char_start for _, char_start, _, _ in units]
+
+
+def test_empty_middle_page_starts_at_previous_page_end():
+    text, page_starts = _layout(["abc", "", "def"])
+
+    assert text == "abc\n\ndef"
+    assert page_starts == [0, 3, 5]
+
+    assert page_for_offset(page_starts, 0) == 0
+    assert page_for_offset(page_starts, 2) == 0
+    # Önceki sayfanın bitişi ve ayraç boş sayfaya düşer
+    assert page_for_offset(page_starts, 3) == 1
+    assert page_for_offset(page_starts, 4) == 1
+    assert page_for_offset(page_starts, 5) == 2
+    assert page_for_offset(page_starts, len(text)) == 2
+
+    assert page_range_for_span(page_starts, 0, 3) == (0, 0)
+    assert page_range_for_span(page_starts, 5, 8) == (2, 2)
+
+
+def test_leading_empty_page_maps_to_first_text_page():
+    _, page_starts = _layout(["", "abc", "def"])
+
+    assert page_starts == [0, 0, 5]
+    assert page_for_offset(page_starts, 0) == 1
+    assert page_for_offset(page_starts, 5) == 2